@@ -21,6 +21,7 @@ from homeassistant.const import (
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
@@ -29,7 +30,11 @@ from homeassistant.setup import (
     async_setup_component,
 )
 from homeassistant.util.logging import async_activate_log_queue_handler
-from homeassistant.util.package import async_get_user_site, is_virtual_env
+from homeassistant.util.package import (
+    async_get_user_site,
+    is_installed,
+    is_virtual_env,
+)
 from homeassistant.util.yaml import clear_secret_cache
 
 if TYPE_CHECKING:
@@ -420,6 +425,81 @@ async def async_setup_multi_components(
         )
 
 
+async def _async_preload_integrations(
+    hass: core.HomeAssistant,
+    config: Dict[str, Any],
+    integration_cache: Dict[str, loader.Integration],
+) -> None:
+    """Import the integrations and the platforms in their config off the loop."""
+    platforms: Dict[str, Set[str]] = {}
+    for domain in integration_cache:
+        for platform_name, _ in config_per_platform(config, domain):
+            if isinstance(platform_name, str):
+                platforms.setdefault(platform_name, set()).add(domain)
+
+    integrations = dict(integration_cache)
+    for int_or_exc in await asyncio.gather(
+        *(
+            loader.async_get_integration(hass, platform_name)
+            for platform_name in platforms
+            if platform_name not in integrations
+        ),
+        return_exceptions=True,
+    ):
+        if isinstance(int_or_exc, loader.Integration):
+            integrations[int_or_exc.domain] = int_or_exc
+
+    if not hass.config.skip_pip:
+        # Integrations with missing requirements are imported when they
+        # are set up, once their requirements are installed
+        missing = await hass.async_add_executor_job(
+            _integrations_missing_requirements, integrations
+        )
+        if missing:
+            _LOGGER.debug("Not importing before installing requirements: %s", missing)
+        for domain in missing:
+            integrations.pop(domain)
+            platforms.pop(domain, None)
+
+    start = monotonic()
+    await loader.async_preload_integrations(hass, integrations.values(), platforms)
+    timings = loader.async_get_import_timings(hass)
+    _LOGGER.debug(
+        "Imported %s integrations in %.2fs, slowest: %s",
+        len(integrations),
+        monotonic() - start,
+        ", ".join(
+            f"{domain} ({timings[domain]:.2f}s)"
+            for domain in sorted(timings, key=timings.get, reverse=True)[:10]
+        ),
+    )
+
+
+def _integrations_missing_requirements(
+    integrations: Dict[str, loader.Integration]
+) -> Set[str]:
+    """Return the integrations that need requirements to be installed.
+
+    Integrations depending on them are included as they import them.
+
+    This method needs to run in an executor.
+    """
+    missing = {
+        domain
+        for domain, integration in integrations.items()
+        if not all(is_installed(req) for req in integration.requirements)
+    }
+    to_check = missing
+    while to_check:
+        to_check = {
+            domain
+            for domain, integration in integrations.items()
+            if domain not in missing and missing.intersection(integration.dependencies)
+        }
+        missing |= to_check
+    return missing
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: Dict[str, Any]
 ) -> None:
@@ -481,6 +561,10 @@ async def _async_set_up_integrations(
         _LOGGER.debug("Setting up debuggers: %s", debuggers)
         await async_setup_multi_components(hass, debuggers, config, setup_started)
 
+    # Import the integrations in executor threads so importing the large
+    # ones does not block the event loop while other integrations set up
+    await _async_preload_integrations(hass, config, integration_cache)
+
     # calculate what components to setup in what stage
     stage_1_domains = set()
 
@@ -1,6 +1,7 @@
 """Allow to set up simple automation rules via the config file."""
+import asyncio
 import logging
-from typing import Any, Awaitable, Callable, List, Optional, Set, cast
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, cast
 
 import voluptuous as vol
 
@@ -212,8 +213,8 @@ async def async_setup(hass, config):
     )
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Replace the changed automations with new ones from config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
@@ -237,9 +238,11 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         cond_func,
         action_script,
         initial_state,
+        config_fingerprint=None,
     ):
         """Initialize an automation entity."""
         self._id = automation_id
+        self.config_fingerprint = config_fingerprint
         self._name = name
         self._trigger_config = trigger_config
         self._async_detach_triggers = None
@@ -489,8 +492,15 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 async def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    Automations already set up with the same id, name and configuration
+    keep running. All other automations are removed and replaced.
+
     This method is a coroutine.
     """
+    existing: Dict[Tuple[Optional[str], str], List[AutomationEntity]] = {}
+    for entity in component.entities:
+        existing.setdefault((entity.unique_id, entity.name), []).append(entity)
+
     entities = []
 
     for config_key in extract_domain_configs(config, DOMAIN):
@@ -500,6 +510,22 @@ async def _async_process_config(hass, config, component):
             automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or f"{config_key} {list_no}"
 
+            # Templates are bound to hass once in use, so compare their
+            # representation which only holds the template source
+            config_fingerprint = repr(config_block)
+            candidates = existing.get((automation_id, name), [])
+            unchanged = next(
+                (
+                    ent
+                    for ent in candidates
+                    if ent.config_fingerprint == config_fingerprint
+                ),
+                None,
+            )
+            if unchanged is not None:
+                candidates.remove(unchanged)
+                continue
+
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
             action_script = Script(
@@ -528,10 +554,17 @@ async def _async_process_config(hass, config, component):
                 cond_func,
                 action_script,
                 initial_state,
+                config_fingerprint,
             )
 
             entities.append(entity)
 
+    removed = [entity for stale in existing.values() for entity in stale]
+    if removed:
+        await asyncio.gather(
+            *[component.async_remove_entity(entity.entity_id) for entity in removed]
+        )
+
     if entities:
         await component.async_add_entities(entities)
 
@@ -1,34 +1,48 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import timedelta
-from itertools import groupby
+from itertools import chain, groupby
 import json
 import logging
 import time
 from typing import Optional, cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import and_, bindparam, func
 from sqlalchemy.ext import baked
 import voluptuous as vol
 
-from homeassistant.components import recorder
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.components import recorder, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
+    Statistics,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    STATISTICS_PERIOD_HOURLY,
+    STATISTICS_PERIOD_SHORT_TERM,
+    period_start,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import Context, State, split_entity_id
+from homeassistant.core import Context, State, callback, split_entity_id
+from homeassistant.exceptions import Unauthorized
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -41,6 +55,12 @@ CONF_ORDER = "use_include_order"
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
+COMPACT_ENTITY_ID_KEY = "entity_id"
+COMPACT_STATE_DICTIONARY_KEY = "state_dictionary"
+COMPACT_STATES_KEY = "states"
+COMPACT_LAST_CHANGED_KEY = "last_changed"
+COMPACT_ATTRIBUTES_KEY = "attributes"
+
 # Not reusing from entityfilter because history does not support glob filtering
 _FILTER_SCHEMA_INNER = vol.Schema(
     {
@@ -81,12 +101,31 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    # Rows written before the shared attributes table
+    # keep their attributes in the states table
+    func.coalesce(StateAttributes.shared_attrs, States.attributes).label("attributes"),
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "history_bakery"
+HISTORY_FILTERS = "history_filters"
+
+# Number of rows fetched from the database at a time
+# and size of the chunks written when streaming
+STREAM_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 65536
+
+# The finest statistics resolution is used as long as
+# it returns at most this many buckets per entity
+MAX_STATISTICS_BUCKETS = 1000
+
+
+def _query_states(session):
+    """Query the state columns with their shared attributes joined in."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
 
 def get_significant_states(hass, *args, **kwargs):
@@ -115,10 +154,40 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
     )
 
+
+def _significant_states_query(
+    hass, session, start_time, end_time, entity_ids, filters, significant_changes_only
+):
+    """Return the query of the significant states sorted by entity_id."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -138,34 +207,86 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_json(
+def _stream_significant_states_json(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the JSON of the significant states in chunks.
+
+    The states are fetched from the database STREAM_PAGE_SIZE rows
+    at a time so only a page of states is kept in memory.
+    """
+    query = _significant_states_query(
         hass,
         session,
-        states,
         start_time,
+        end_time,
         entity_ids,
         filters,
-        include_start_time_state,
-        minimal_response,
-    )
+        significant_changes_only,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_PAGE_SIZE))
+
+    # The start time states are looked up before the
+    # query is iterated as they need the same session
+    initial_states = defaultdict(list)
+    if include_start_time_state:
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        ):
+            initial_states[state.entity_id].append(state)
+
+    encode = JSONEncoder(sort_keys=True, allow_nan=False).encode
+    chunk = []
+    chunk_size = 0
+    entity_separator = "["
+
+    def _entities():
+        """Yield the entity ids with their sorted states."""
+        for ent_id, group in groupby(query, lambda state: state.entity_id):
+            yield ent_id, _iter_entity_states(
+                initial_states.pop(ent_id, []),
+                group,
+                split_entity_id(ent_id)[0],
+                minimal_response,
+            )
+        # Entities without a change during the period
+        yield from initial_states.items()
+
+    for _, ent_states in _entities():
+        separator = entity_separator + "["
+        for state in ent_states:
+            part = separator + encode(state)
+            chunk.append(part)
+            chunk_size += len(part)
+            separator = ","
+            if chunk_size >= STREAM_CHUNK_SIZE:
+                yield "".join(chunk).encode("UTF-8")
+                chunk = []
+                chunk_size = 0
+        if separator == ",":
+            chunk.append("]")
+            entity_separator = ","
+
+    chunk.append("[]" if entity_separator == "[" else "]")
+    yield "".join(chunk).encode("UTF-8")
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -178,7 +299,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -199,13 +322,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -232,6 +355,64 @@ def get_last_state_changes(hass, number_of_states, entity_id):
         )
 
 
+def statistics_period(hass, start_time, end_time):
+    """Return the statistics period to use for a time range."""
+    if (
+        hass.data[recorder.DATA_INSTANCE].short_term_statistics
+        and (end_time - start_time).total_seconds() / STATISTICS_PERIOD_SHORT_TERM
+        <= MAX_STATISTICS_BUCKETS
+    ):
+        return STATISTICS_PERIOD_SHORT_TERM
+    return STATISTICS_PERIOD_HOURLY
+
+
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period=None
+):
+    """Return statistics of numeric sensors during UTC period start_time - end_time.
+
+    The statistics period is picked from the length of the time range
+    unless it is given.
+    """
+    if end_time is None:
+        end_time = dt_util.utcnow()
+    if period is None:
+        period = statistics_period(hass, start_time, end_time)
+
+    with session_scope(hass=hass) as session:
+        baked_query = hass.data[HISTORY_BAKERY](
+            lambda session: session.query(Statistics)
+        )
+
+        baked_query += lambda q: q.filter(
+            (Statistics.period == bindparam("period"))
+            & (Statistics.start >= bindparam("start_time"))
+            & (Statistics.start < bindparam("end_time"))
+        )
+
+        if entity_ids is not None:
+            baked_query += lambda q: q.filter(
+                Statistics.entity_id.in_(bindparam("entity_ids", expanding=True))
+            )
+
+        baked_query += lambda q: q.order_by(Statistics.entity_id, Statistics.start)
+
+        statistics = execute(
+            baked_query(session).params(
+                period=period,
+                start_time=period_start(start_time, period),
+                end_time=end_time,
+                entity_ids=entity_ids,
+            ),
+            to_native=True,
+        )
+
+    return {
+        entity_id: list(group)
+        for entity_id, group in groupby(statistics, lambda stat: stat["entity_id"])
+    }
+
+
 def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None):
     """Return the states at a specific point in time."""
     if run is None:
@@ -266,7 +447,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -309,9 +490,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -356,63 +535,185 @@ def _sorted_states_to_json(
     # Get the states at the start time
     timer_start = time.perf_counter()
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
         ):
-            state.last_changed = start_time
-            state.last_updated = start_time
             result[state.entity_id].append(state)
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
+    # Append all changes to it
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        result[ent_id] = list(
+            _iter_entity_states(
+                result[ent_id], group, split_entity_id(ent_id)[0], minimal_response
+            )
+        )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at the start time as synthetic first data points."""
+    run = recorder.run_information_from_instance(hass, start_time)
+    states = _get_states_with_session(
+        hass, session, start_time, entity_ids, run=run, filters=filters
+    )
+    for state in states:
+        state.last_changed = start_time
+        state.last_updated = start_time
+    return states
+
+
+def _iter_entity_states(initial_states, db_states, domain, minimal_response):
+    """Yield the states of a single entity sorted by last_updated.
+
+    With minimal response we only provide a native State for the
+    first and last response. All the states in-between only provide
+    the "state" and the "last_changed".
+    """
+    yield from initial_states
+
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        for db_state in db_states:
+            yield LazyState(db_state)
+        return
+
+    if initial_states:
+        prev_state = initial_states[-1]
+    else:
+        prev_state = LazyState(next(db_states))
+        yield prev_state
+
     # Called in a tight loop so cache the function
     # here
     _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Append all changes to it
-    for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
+    pending_state = None
+    for db_state in db_states:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        if pending_state is not None:
+            yield pending_state
+        pending_state = {
+            STATE_KEY: db_state.state,
+            LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                db_state.last_changed
+            ),
+        }
+        prev_state = db_state
 
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+    if pending_state is not None:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        yield LazyState(prev_state)
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+def get_compact_significant_states(hass, *args, **kwargs):
+    """Wrap _get_compact_significant_states with a sql session."""
+    with session_scope(hass=hass) as session:
+        return _get_compact_significant_states(hass, session, *args, **kwargs)
+
+
+def _get_compact_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+):
+    """Return the significant states in the compact columnar format.
+
+    Each entity has parallel lists of indexes into its state dictionary
+    and of last_changed epoch timestamps, together with the attributes
+    of its last state.
+    """
+    timer_start = time.perf_counter()
+
+    initial_states = defaultdict(list)
+    if include_start_time_state:
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        ):
+            initial_states[state.entity_id].append(state)
+
+    query = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+
+    result = {}
+    # Maintain the order of the requested entity ids
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            result[ent_id] = None
+
+    for ent_id, group in groupby(execute(query), lambda state: state.entity_id):
+        result[ent_id] = _compact_entity_states(
+            ent_id, initial_states.pop(ent_id, []), group
+        )
+    for ent_id, ent_states in initial_states.items():
+        result[ent_id] = _compact_entity_states(ent_id, ent_states, [])
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_compact_significant_states took %fs", elapsed)
+
+    # Filter out the entities without states
+    return [compact for compact in result.values() if compact is not None]
+
+
+def _compact_entity_states(entity_id, initial_states, db_states):
+    """Convert the states of a single entity to the compact format."""
+    state_dictionary = {}
+    states = []
+    last_changed = []
+    prev_state = None
+
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp = process_timestamp
+
+    for state in chain(initial_states, db_states):
+        last_state = state
+        # Attribute changes are not part of the compact
+        # format so we can filter out duplicate states
+        if prev_state is not None and state.state == prev_state.state:
+            continue
+        states.append(state_dictionary.setdefault(state.state, len(state_dictionary)))
+        last_changed.append(
+            round(_process_timestamp(state.last_changed).timestamp(), 3)
+        )
+        prev_state = state
+
+    if prev_state is None:
+        return None
+
+    if not isinstance(last_state, LazyState):
+        last_state = LazyState(last_state)
+
+    return {
+        COMPACT_ENTITY_ID_KEY: entity_id,
+        COMPACT_STATE_DICTIONARY_KEY: list(state_dictionary),
+        COMPACT_STATES_KEY: states,
+        COMPACT_LAST_CHANGED_KEY: last_changed,
+        COMPACT_ATTRIBUTES_KEY: last_state.attributes,
+    }
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -428,10 +729,13 @@ async def async_setup(hass, config):
     filters = sqlalchemy_filter_from_include_exclude_conf(conf)
 
     hass.data[HISTORY_BAKERY] = baked.bakery()
+    hass.data[HISTORY_FILTERS] = filters
 
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    websocket_api.async_register_command(hass, ws_get_history_during_period)
+    websocket_api.async_register_command(hass, ws_stream_history)
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -453,7 +757,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -494,6 +798,41 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
+        if "compact" in request.query:
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._compact_significant_states_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                ),
+            )
+
+        if "statistics" in request.query:
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._statistics_json, hass, start_time, end_time, entity_ids
+                ),
+            )
+
+        # The include order can only be applied to the complete result
+        if "stream" in request.query and not self.use_include_order:
+            return await self._stream_significant_states(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -554,6 +893,288 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    async def _stream_significant_states(
+        self,
+        request,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Stream the significant states as json while reading them."""
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        def _write_significant_states_json():
+            """Write the chunks from the executor as they are encoded."""
+            timer_start = time.perf_counter()
+
+            with session_scope(hass=hass) as session:
+                for chunk in _stream_significant_states_json(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                ):
+                    # Waiting for the write slows down reading
+                    # when the client does not keep up
+                    asyncio.run_coroutine_threadsafe(
+                        response.write(chunk), hass.loop
+                    ).result()
+
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                elapsed = time.perf_counter() - timer_start
+                _LOGGER.debug("Streamed states in %fs", elapsed)
+
+        await hass.async_add_executor_job(_write_significant_states_json)
+        await response.write_eof()
+        return response
+
+    def _compact_significant_states_json(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+    ):
+        """Fetch significant states from the database as compact json."""
+        result = get_compact_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            self.filters,
+            include_start_time_state,
+            significant_changes_only,
+        )
+
+        # Optionally reorder the result to respect the ordering given
+        # by any entities explicitly included in the configuration.
+        if self.use_include_order:
+            order = {
+                entity_id: idx
+                for idx, entity_id in enumerate(self.filters.included_entities)
+            }
+            result.sort(
+                key=lambda compact: order.get(
+                    compact[COMPACT_ENTITY_ID_KEY], len(order)
+                )
+            )
+
+        return self.json(result)
+
+    def _statistics_json(self, hass, start_time, end_time, entity_ids):
+        """Fetch statistics from the database as json."""
+        timer_start = time.perf_counter()
+
+        result = list(
+            statistics_during_period(hass, start_time, end_time, entity_ids).values()
+        )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug(
+                "Extracted %d statistics in %fs", sum(map(len, result)), elapsed
+            )
+
+        return self.json(result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/history_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+        vol.Optional("compact", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_get_history_during_period(hass, connection, msg):
+    """Handle history during period websocket command."""
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_INVALID_FORMAT, "Invalid start_time"
+        )
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    end_time = None
+    if "end_time" in msg:
+        end_time = dt_util.parse_datetime(msg["end_time"])
+        if end_time is None:
+            connection.send_error(
+                msg["id"], websocket_api.const.ERR_INVALID_FORMAT, "Invalid end_time"
+            )
+            return
+        end_time = dt_util.as_utc(end_time)
+
+    entity_ids = msg.get("entity_ids")
+    if entity_ids:
+        entity_ids = [entity_id.lower() for entity_id in entity_ids]
+
+    if start_time > dt_util.utcnow():
+        connection.send_result(msg["id"], [])
+        return
+
+    if msg["compact"]:
+        result = await hass.async_add_executor_job(
+            get_compact_significant_states,
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            hass.data[HISTORY_FILTERS],
+            msg["include_start_time_state"],
+            msg["significant_changes_only"],
+        )
+    else:
+        result = list(
+            (
+                await hass.async_add_executor_job(
+                    get_significant_states,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    hass.data[HISTORY_FILTERS],
+                    msg["include_start_time_state"],
+                    msg["significant_changes_only"],
+                    msg["minimal_response"],
+                )
+            ).values()
+        )
+
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Required("start_time"): str,
+        vol.Required("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream_history(hass, connection, msg):
+    """Handle history stream websocket command.
+
+    The history of the entities is sent once, after that only the
+    state changes are sent as they happen without querying the database.
+    """
+    msg_id = msg["id"]
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(
+            msg_id, websocket_api.const.ERR_INVALID_FORMAT, "Invalid start_time"
+        )
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    entity_ids = [entity_id.lower() for entity_id in msg["entity_ids"]]
+    for entity_id in entity_ids:
+        if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+            raise Unauthorized(entity_id=entity_id, permission=POLICY_READ)
+
+    significant_changes_only = msg["significant_changes_only"]
+    minimal_response = msg["minimal_response"]
+    # State changes are held back until the history has been sent
+    pending_events = []
+
+    @callback
+    def _send_state_changes(events):
+        """Send the significant state changes to the websocket."""
+        states = defaultdict(list)
+        for event in events:
+            new_state = event.data["new_state"]
+            if new_state is None:
+                continue
+            if (
+                significant_changes_only
+                and new_state.last_changed != new_state.last_updated
+                and new_state.domain not in SIGNIFICANT_DOMAINS
+            ):
+                continue
+            if (
+                minimal_response
+                and new_state.domain not in NEED_ATTRIBUTE_DOMAINS
+                and new_state.last_changed != new_state.last_updated
+            ):
+                continue
+            states[new_state.entity_id].append(new_state)
+        if states:
+            connection.send_message(
+                websocket_api.event_message(msg_id, {"states": states})
+            )
+
+    @callback
+    def _forward_state_change(event):
+        """Forward a state change or hold it back."""
+        if pending_events is not None:
+            pending_events.append(event)
+            return
+        _send_state_changes([event])
+
+    connection.subscriptions[msg_id] = async_track_state_change_event(
+        hass, entity_ids, _forward_state_change
+    )
+    connection.send_result(msg_id)
+
+    # The most recent state changes may not have been
+    # committed by the recorder yet, the current states
+    # are used as the end of the history instead
+    end_time = dt_util.utcnow()
+    current_states = {
+        entity_id: state
+        for entity_id, state in (
+            (entity_id, hass.states.get(entity_id)) for entity_id in entity_ids
+        )
+        if state is not None
+    }
+
+    history = await hass.async_add_executor_job(
+        get_significant_states,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        hass.data[HISTORY_FILTERS],
+        msg["include_start_time_state"],
+        significant_changes_only,
+        minimal_response,
+    )
+
+    for entity_id, state in current_states.items():
+        ent_history = history.get(entity_id)
+        if ent_history and ent_history[-1].last_updated >= state.last_updated:
+            continue
+        if start_time <= state.last_updated:
+            history.setdefault(entity_id, []).append(state)
+
+    connection.send_message(websocket_api.event_message(msg_id, {"states": history}))
+
+    events = pending_events
+    pending_events = None
+    _send_state_changes(events)
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
     """Build a sql filter from config."""
@@ -8,7 +8,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import SOURCE_IMPORT
 from homeassistant.const import CONF_NAME, CONF_PORT
-from homeassistant.core import callback, split_entity_id
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_EXCLUDE_DOMAINS,
@@ -333,11 +333,6 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
 def _get_entities_matching_domains(hass, domains):
     """List entities in the given domains."""
-    included_domains = set(domains)
-    entity_ids = [
-        state.entity_id
-        for state in hass.states.all()
-        if (split_entity_id(state.entity_id))[0] in included_domains
-    ]
+    entity_ids = hass.states.entity_ids(set(domains))
     entity_ids.sort()
     return entity_ids
@@ -1,9 +1,12 @@
 """Event parser and human readable log generator."""
+import asyncio
 from datetime import timedelta
 from itertools import groupby
 import json
 import logging
 
+from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 import sqlalchemy
 from sqlalchemy.orm import aliased
 import voluptuous as vol
@@ -13,6 +16,7 @@ from homeassistant.components.history import sqlalchemy_filter_from_include_excl
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -24,6 +28,7 @@ from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NAME,
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_LOGBOOK_ENTRY,
@@ -43,6 +48,7 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
@@ -58,8 +64,12 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+# Size in characters of the chunks written to a streamed response
+STREAM_CHUNK_SIZE = 65536
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
+ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
 
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
@@ -198,21 +208,46 @@ class LogbookView(HomeAssistantView):
 
         hass = request.app["hass"]
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        def write(chunk):
+            """Write a chunk of the response from the executor."""
+            asyncio.run_coroutine_threadsafe(
+                response.write(chunk.encode("utf-8")), hass.loop
+            ).result()
+
+        def stream_events():
+            """Fetch events and stream them as JSON."""
+            encode = JSONEncoder(sort_keys=True, allow_nan=False).encode
+            chunk = ["["]
+            size = 1
+            with session_scope(hass=hass) as session:
+                for entry in _humanify_events(
                     hass,
-                    self.config,
+                    session,
                     start_day,
                     end_day,
                     entity_id,
                     self.filters,
                     self.entities_filter,
-                )
-            )
-
-        return await hass.async_add_executor_job(json_events)
+                ):
+                    if size > 1:
+                        chunk.append(", ")
+                    encoded = encode(entry)
+                    chunk.append(encoded)
+                    size += len(encoded) + 2
+                    if size >= STREAM_CHUNK_SIZE:
+                        write("".join(chunk))
+                        chunk = []
+                        size = 2
+            chunk.append("]")
+            write("".join(chunk))
+
+        await hass.async_add_executor_job(stream_events)
+        await response.write_eof()
+        return response
 
 
 def humanify(hass, events, entity_attr_cache):
@@ -341,90 +376,171 @@ def _get_events(
     hass, config, start_day, end_day, entity_id=None, filters=None, entities_filter=None
 ):
     """Get events for a period of time."""
+    with session_scope(hass=hass) as session:
+        return list(
+            _humanify_events(
+                hass, session, start_day, end_day, entity_id, filters, entities_filter
+            )
+        )
+
+
+def _humanify_events(
+    hass,
+    session,
+    start_day,
+    end_day,
+    entity_id=None,
+    filters=None,
+    entities_filter=None,
+):
+    """Yield the humanified events for a period of time."""
     entity_attr_cache = EntityAttributeCache(hass)
+    # Decoded attributes shared by all rows with the same attributes
+    attributes_cache = {}
+
+    if entity_id is not None:
+        entity_ids = [entity_id.lower()]
+        entities_filter = generate_filter([], entity_ids, [], [])
+        apply_sql_entities_filter = False
+    else:
+        entity_ids = None
+        apply_sql_entities_filter = True
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(1000):
-            event = LazyEventPartialState(row)
-            if _keep_event(hass, event, entities_filter):
+            event = LazyEventPartialState(row, attributes_cache)
+            # State changes of the requested entity are already
+            # filtered in sql and never need their data decoded
+            if (
+                entity_ids is not None and event.event_type == EVENT_STATE_CHANGED
+            ) or _keep_event(hass, event, entities_filter):
                 yield event
 
-    with session_scope(hass=hass) as session:
-        if entity_id is not None:
-            entity_ids = [entity_id.lower()]
-            entities_filter = generate_filter([], entity_ids, [], [])
-            apply_sql_entities_filter = False
-        else:
-            entity_ids = None
-            apply_sql_entities_filter = True
-
-        old_state = aliased(States, name="old_state")
-
-        query = (
-            session.query(
-                Events.event_type,
-                Events.event_data,
-                Events.time_fired,
-                Events.context_user_id,
-                States.state,
-                States.entity_id,
-                States.domain,
-                States.attributes,
-            )
-            .order_by(Events.time_fired)
-            .outerjoin(States, (Events.event_id == States.event_id))
-            .outerjoin(old_state, (States.old_state_id == old_state.state_id))
-            # The below filter, removes state change events that do not have
-            # and old_state, new_state, or the old and
-            # new state.
-            #
-            .filter(
-                (Events.event_type != EVENT_STATE_CHANGED)
-                | (
-                    (States.state_id.isnot(None))
-                    & (old_state.state_id.isnot(None))
-                    & (States.state.isnot(None))
-                    & (States.state != old_state.state)
-                )
-            )
-            #
-            # Prefilter out continuous domains that have
-            # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
-            #
-            .filter(
-                (Events.event_type != EVENT_STATE_CHANGED)
-                | sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS))
-                | sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON))
-            )
-            .filter(
-                Events.event_type.in_(ALL_EVENT_TYPES + list(hass.data.get(DOMAIN, {})))
+    old_state = aliased(States, name="old_state")
+    # Rows written before the shared attributes table
+    # keep their attributes in the states table
+    attributes = sqlalchemy.func.coalesce(
+        StateAttributes.shared_attrs, States.attributes
+    )
+
+    # Events recorded before schema version 11 have
+    # their state changes joined in from the states table
+    events_query = (
+        session.query(
+            Events.event_type,
+            Events.event_data,
+            Events.time_fired,
+            Events.context_user_id,
+            States.state,
+            States.entity_id,
+            States.domain,
+            States.attributes_id,
+            attributes.label("attributes"),
+        )
+        .outerjoin(States, (Events.event_id == States.event_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id),
+        )
+        .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        # The below filter, removes state change events that do not have
+        # and old_state, new_state, or the old and
+        # new state.
+        #
+        .filter(
+            (Events.event_type != EVENT_STATE_CHANGED)
+            | (
+                (States.state_id.isnot(None))
+                & (old_state.state_id.isnot(None))
+                & (States.state.isnot(None))
+                & (States.state != old_state.state)
             )
-            .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
         )
+        #
+        # Prefilter out continuous domains that have
+        # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
+        #
+        .filter(
+            (Events.event_type != EVENT_STATE_CHANGED)
+            | sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS))
+            | sqlalchemy.not_(attributes.contains(UNIT_OF_MEASUREMENT_JSON))
+        )
+        .filter(
+            Events.event_type.in_(ALL_EVENT_TYPES + list(hass.data.get(DOMAIN, {})))
+        )
+        .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
+    )
 
-        if entity_ids:
-            query = query.filter(
-                (
-                    (States.last_updated == States.last_changed)
-                    & States.entity_id.in_(entity_ids)
+    if entity_ids:
+        # Only decode the data of other events that could
+        # be about the requested entity
+        events_query = events_query.filter(
+            (
+                (States.last_updated == States.last_changed)
+                & States.entity_id.in_(entity_ids)
+            )
+            | (
+                States.state_id.is_(None)
+                & sqlalchemy.or_(
+                    *(
+                        Events.event_data.contains(
+                            ENTITY_ID_JSON_TEMPLATE.format(entity_id)
+                        )
+                        for entity_id in entity_ids
+                    )
                 )
-                | (States.state_id.is_(None))
             )
-        else:
-            query = query.filter(
-                (States.last_updated == States.last_changed)
-                | (States.state_id.is_(None))
+        )
+    else:
+        events_query = events_query.filter(
+            (States.last_updated == States.last_changed) | (States.state_id.is_(None))
+        )
+
+    if apply_sql_entities_filter and filters:
+        entity_filter = filters.entity_filter()
+        if entity_filter is not None:
+            events_query = events_query.filter(
+                entity_filter | (Events.event_type != EVENT_STATE_CHANGED)
             )
 
-        if apply_sql_entities_filter and filters:
-            entity_filter = filters.entity_filter()
-            if entity_filter is not None:
-                query = query.filter(
-                    entity_filter | (Events.event_type != EVENT_STATE_CHANGED)
-                )
+    # State changes recorded since schema version 11
+    # are stored without an events row
+    states_query = (
+        session.query(
+            sqlalchemy.literal(EVENT_STATE_CHANGED),
+            sqlalchemy.literal(EMPTY_JSON_OBJECT),
+            States.last_updated,
+            States.context_user_id,
+            States.state,
+            States.entity_id,
+            States.domain,
+            States.attributes_id,
+            attributes.label("attributes"),
+        )
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id),
+        )
+        .join(old_state, (States.old_state_id == old_state.state_id))
+        .filter(States.event_id.is_(None))
+        .filter(States.state.isnot(None) & (States.state != old_state.state))
+        .filter(
+            sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS))
+            | sqlalchemy.not_(attributes.contains(UNIT_OF_MEASUREMENT_JSON))
+        )
+        .filter(States.last_updated == States.last_changed)
+        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
+    )
+
+    if entity_ids:
+        states_query = states_query.filter(States.entity_id.in_(entity_ids))
+    elif apply_sql_entities_filter and filters:
+        entity_filter = filters.entity_filter()
+        if entity_filter is not None:
+            states_query = states_query.filter(entity_filter)
+
+    query = events_query.union_all(states_query).order_by(Events.time_fired)
 
-        return list(humanify(hass, yield_events(query), entity_attr_cache))
+    yield from humanify(hass, yield_events(query), entity_attr_cache)
 
 
 def _keep_event(hass, event, entities_filter):
@@ -544,6 +660,7 @@ class LazyEventPartialState:
 
     __slots__ = [
         "_row",
+        "_attributes_cache",
         "_event_data",
         "_time_fired",
         "_time_fired_isoformat",
@@ -554,9 +671,10 @@ class LazyEventPartialState:
         "domain",
     ]
 
-    def __init__(self, row):
+    def __init__(self, row, attributes_cache=None):
         """Init the lazy event."""
         self._row = row
+        self._attributes_cache = attributes_cache
         self._event_data = None
         self._time_fired = None
         self._time_fired_isoformat = None
@@ -580,6 +698,13 @@ class LazyEventPartialState:
                 or self._row.attributes == EMPTY_JSON_OBJECT
             ):
                 self._attributes = {}
+            elif self._attributes_cache is not None and self._row.attributes_id:
+                attributes_id = self._row.attributes_id
+                if attributes_id not in self._attributes_cache:
+                    self._attributes_cache[attributes_id] = json.loads(
+                        self._row.attributes
+                    )
+                self._attributes = self._attributes_cache[attributes_id]
             else:
                 self._attributes = json.loads(self._row.attributes)
         return self._attributes
@@ -588,7 +713,7 @@ class LazyEventPartialState:
     def data(self):
         """Event data."""
         if not self._event_data:
-            if self._row.event_data == EMPTY_JSON_OBJECT:
+            if self._row.event_data in (None, EMPTY_JSON_OBJECT):
                 self._event_data = {}
             else:
                 self._event_data = json.loads(self._row.event_data)
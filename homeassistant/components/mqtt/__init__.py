@@ -1,14 +1,14 @@
 """Support for MQTT message handling."""
 import asyncio
+from collections import deque
 from functools import partial, wraps
 import inspect
-from itertools import groupby
 import json
 import logging
-from operator import attrgetter
 import os
 import ssl
-from typing import Any, Callable, List, Optional, Union
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
 
 import attr
 import certifi
@@ -128,6 +128,10 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 
 TIMEOUT_ACK = 1
 
+# Topics per SUBSCRIBE or UNSUBSCRIBE packet, keeps batches below the
+# maximum packet size of brokers
+MAX_SUBSCRIPTIONS_PER_CALL = 500
+
 
 def validate_device_has_at_least_one_identifier(value: ConfigType) -> ConfigType:
     """Validate that a device info entry has at least one identifying value."""
@@ -471,6 +475,7 @@ async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_mqtt_inbound_info)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -609,6 +614,115 @@ class Subscription:
     encoding: str = attr.ib(default="utf-8")
 
 
+class _TopicNode:
+    """Level of a topic filter in the subscription trie."""
+
+    __slots__ = ["children", "subscriptions"]
+
+    def __init__(self) -> None:
+        """Initialize an empty level."""
+        self.children: Dict[str, "_TopicNode"] = {}
+        self.subscriptions: List[Subscription] = []
+
+
+class SubscriptionIndex:
+    """Index of subscriptions to find the ones matching a topic.
+
+    Subscriptions without wildcards are looked up by their topic, the
+    others are kept in a trie of topic levels. Matching a topic only
+    visits the levels that can match instead of every subscription.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._exact: Dict[str, List[Subscription]] = {}
+        self._wildcards = _TopicNode()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription to the index."""
+        topic = subscription.topic
+        if "+" not in topic and "#" not in topic:
+            self._exact.setdefault(topic, []).append(subscription)
+            return
+
+        node = self._wildcards
+        for level in topic.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.subscriptions.append(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription from the index."""
+        topic = subscription.topic
+        if "+" not in topic and "#" not in topic:
+            subscriptions = self._exact[topic]
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self._exact[topic]
+            return
+
+        path = [self._wildcards]
+        levels = topic.split("/")
+        for level in levels:
+            path.append(path[-1].children[level])
+        path[-1].subscriptions.remove(subscription)
+
+        # Prune the levels no subscription uses anymore
+        for level, parent, node in zip(
+            reversed(levels), reversed(path[:-1]), reversed(path[1:])
+        ):
+            if node.subscriptions or node.children:
+                break
+            del parent.children[level]
+
+    def has_topic(self, topic: str) -> bool:
+        """Return if there is a subscription on the topic filter."""
+        if "+" not in topic and "#" not in topic:
+            return topic in self._exact
+
+        node = self._wildcards
+        for level in topic.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                return False
+            node = child
+        return bool(node.subscriptions)
+
+    def match(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions matching a topic."""
+        matches = list(self._exact.get(topic, ()))
+        if not self._wildcards.children:
+            return matches
+
+        levels = topic.split("/")
+        num_levels = len(levels)
+        # Wildcards don't match the first level of topics starting with $
+        normal = not topic.startswith("$")
+        stack = [(self._wildcards, 0)]
+        while stack:
+            node, idx = stack.pop()
+            children = node.children
+            if idx == num_levels:
+                matches.extend(node.subscriptions)
+            else:
+                child = children.get(levels[idx])
+                if child is not None:
+                    stack.append((child, idx + 1))
+                if normal or idx:
+                    child = children.get("+")
+                    if child is not None:
+                        stack.append((child, idx + 1))
+            if normal or idx:
+                # A multi-level wildcard also matches its parent level
+                child = children.get("#")
+                if child is not None:
+                    matches.extend(child.subscriptions)
+
+        return matches
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -622,9 +736,18 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._subscription_index = SubscriptionIndex()
         self.connected = False
         self._mqttc: mqtt.Client = None
         self._paho_lock = asyncio.Lock()
+        # Subscription changes not sent to the broker yet
+        self._pending_subscriptions: Dict[str, int] = {}
+        self._pending_unsubscribes: Set[str] = set()
+        self._subscriptions_task: Optional[asyncio.Task] = None
+        # Messages received by the paho thread, with the time of receipt
+        self._inbound: Deque[Tuple[Any, float]] = deque()
+        self._inbound_scheduled = False
+        self._inbound_statistics = debug_info.inbound_statistics(hass)
 
         self._pending_operations = {}
 
@@ -797,10 +920,11 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._subscription_index.add(subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
-            await self._async_perform_subscription(topic, qos)
+            await self._async_queue_subscriptions([(topic, qos)])
 
         @callback
         def async_remove() -> None:
@@ -808,41 +932,86 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._subscription_index.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if self._subscription_index.has_topic(topic):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    @callback
+    def _async_queue_subscriptions(
+        self, subscriptions: List[Tuple[str, int]]
+    ) -> asyncio.Task:
+        """Queue topics to subscribe to with the next batch.
 
-        This method is a coroutine.
+        Returns the task sending the batch.
         """
-        async with self._paho_lock:
-            result: int = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.unsubscribe, topic
+        pending = self._pending_subscriptions
+        for topic, qos in subscriptions:
+            self._pending_unsubscribes.discard(topic)
+            pending[topic] = max(qos, pending.get(topic, 0))
+        return self._async_schedule_subscriptions()
+
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> asyncio.Task:
+        """Queue a topic to unsubscribe from with the next batch.
+
+        Returns the task sending the batch.
+        """
+        self._pending_subscriptions.pop(topic, None)
+        self._pending_unsubscribes.add(topic)
+        return self._async_schedule_subscriptions()
+
+    @callback
+    def _async_schedule_subscriptions(self) -> asyncio.Task:
+        """Schedule sending the pending subscription changes."""
+        if self._subscriptions_task is None:
+            self._subscriptions_task = self.hass.async_create_task(
+                self._async_perform_subscriptions()
             )
-            _LOGGER.debug("Unsubscribing from %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+        return self._subscriptions_task
 
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
+    async def _async_perform_subscriptions(self) -> None:
+        """Send the pending subscription changes as a single batch.
+
+        Changes queued while a batch is waiting for the lock or the broker
+        are merged into the next batch. A batch sends UNSUBSCRIBE and
+        SUBSCRIBE packets of at most MAX_SUBSCRIPTIONS_PER_CALL topics.
+        """
+        mids = []
         async with self._paho_lock:
-            result: int = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
-            )
-            _LOGGER.debug("Subscribing to %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+            self._subscriptions_task = None
+            unsubscribes = list(self._pending_unsubscribes)
+            subscriptions = list(self._pending_subscriptions.items())
+            self._pending_unsubscribes = set()
+            self._pending_subscriptions = {}
+
+            for start in range(0, len(unsubscribes), MAX_SUBSCRIPTIONS_PER_CALL):
+                topics = unsubscribes[start : start + MAX_SUBSCRIPTIONS_PER_CALL]
+                result: int = None
+                result, mid = await self.hass.async_add_executor_job(
+                    self._mqttc.unsubscribe, topics
+                )
+                _LOGGER.debug("Unsubscribing from %s, mid: %s", topics, mid)
+                _raise_on_error(result)
+                mids.append(mid)
+
+            for start in range(0, len(subscriptions), MAX_SUBSCRIPTIONS_PER_CALL):
+                chunk = subscriptions[start : start + MAX_SUBSCRIPTIONS_PER_CALL]
+                result, mid = await self.hass.async_add_executor_job(
+                    self._mqttc.subscribe, chunk
+                )
+                _LOGGER.debug("Subscribing to %s, mid: %s", chunk, mid)
+                _raise_on_error(result)
+                mids.append(mid)
+
+        await asyncio.gather(*(self._wait_for_mid(mid) for mid in mids))
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -869,12 +1038,15 @@ class MQTT:
             result_code,
         )
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        # Re-subscribe to all topics with a single batch, the batch only
+        # subscribes once for each topic with the highest requested qos.
+        self.hass.add_job(
+            self._async_queue_subscriptions,
+            [
+                (subscription.topic, subscription.qos)
+                for subscription in self.subscriptions
+            ],
+        )
 
         if (
             CONF_BIRTH_MESSAGE in self.conf
@@ -891,8 +1063,34 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are buffered and handled in batches, a burst of messages
+        only wakes up the event loop once.
+        """
+        self._inbound.append((msg, time.monotonic()))
+        if not self._inbound_scheduled:
+            self._inbound_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._mqtt_handle_messages)
+
+    @callback
+    def _mqtt_handle_messages(self) -> None:
+        """Handle the buffered messages."""
+        # Messages buffered from now on need a new wakeup
+        self._inbound_scheduled = False
+        inbound = self._inbound
+        messages = 0
+        latency = max_latency = 0.0
+        while inbound:
+            msg, received = inbound.popleft()
+            msg_latency = time.monotonic() - received
+            latency += msg_latency
+            max_latency = max(max_latency, msg_latency)
+            messages += 1
+            self._mqtt_handle_message(msg)
+
+        if messages:
+            self._inbound_statistics.add_batch(messages, latency, max_latency)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -903,16 +1101,20 @@ class MQTT:
             msg.payload,
         )
         timestamp = dt_util.utcnow()
+        # Payloads decoded for this message, by encoding
+        decoded: Dict[str, Optional[str]] = {}
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
+        for subscription in self._subscription_index.match(msg.topic):
             payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
+            encoding = subscription.encoding
+            if encoding is not None:
+                if encoding not in decoded:
+                    try:
+                        decoded[encoding] = msg.payload.decode(encoding)
+                    except (AttributeError, UnicodeDecodeError):
+                        decoded[encoding] = None
+                decoded_payload = decoded[encoding]
+                if decoded_payload is None:
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s (for %s)",
                         msg.payload,
@@ -921,6 +1123,7 @@ class MQTT:
                         subscription.callback,
                     )
                     continue
+                payload = decoded_payload
 
             self.hass.async_run_job(
                 subscription.callback,
@@ -977,20 +1180,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -1325,6 +1514,13 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@callback
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/debug_info/inbound"})
+def websocket_mqtt_inbound_info(hass, connection, msg):
+    """Get MQTT debug info for the inbound messages."""
+    connection.send_result(msg["id"], debug_info.info_for_inbound_messages(hass))
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
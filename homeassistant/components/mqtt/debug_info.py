@@ -2,6 +2,7 @@
 from collections import deque
 from functools import wraps
 import logging
+import time
 from typing import Any
 
 from homeassistant.helpers.typing import HomeAssistantType
@@ -12,8 +13,67 @@ from .models import MessageCallbackType
 _LOGGER = logging.getLogger(__name__)
 
 DATA_MQTT_DEBUG_INFO = "mqtt_debug_info"
+DATA_MQTT_INBOUND_STATISTICS = "mqtt_inbound_statistics"
 STORED_MESSAGES = 10
 
+# Seconds over which the message rate and latency are averaged
+STATISTICS_WINDOW = 10
+
+
+class InboundStatistics:
+    """Counters of the inbound message pipeline."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.messages = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.messages_per_second = 0.0
+        self.dispatch_latency = 0.0
+        self.max_dispatch_latency = 0.0
+        self._window_start = time.monotonic()
+        self._window_messages = 0
+        self._window_latency = 0.0
+
+    def add_batch(self, messages: int, latency: float, max_latency: float) -> None:
+        """Count a batch of dispatched messages.
+
+        latency is the sum of the time the messages spent in the queue.
+        """
+        self.messages += messages
+        self.queue_depth = messages
+        self.max_queue_depth = max(self.max_queue_depth, messages)
+        self.max_dispatch_latency = max(self.max_dispatch_latency, max_latency)
+        self._window_messages += messages
+        self._window_latency += latency
+
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < STATISTICS_WINDOW:
+            return
+
+        self.messages_per_second = self._window_messages / elapsed
+        self.dispatch_latency = self._window_latency / self._window_messages
+        self._window_start = now
+        self._window_messages = 0
+        self._window_latency = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the counters."""
+        return {
+            "messages": self.messages,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "messages_per_second": self.messages_per_second,
+            "dispatch_latency": self.dispatch_latency,
+            "max_dispatch_latency": self.max_dispatch_latency,
+        }
+
+
+def inbound_statistics(hass: HomeAssistantType) -> InboundStatistics:
+    """Return the counters of the inbound message pipeline."""
+    return hass.data.setdefault(DATA_MQTT_INBOUND_STATISTICS, InboundStatistics())
+
 
 def log_messages(hass: HomeAssistantType, entity_id: str) -> MessageCallbackType:
     """Wrap an MQTT message callback to support message logging."""
@@ -117,6 +177,11 @@ def remove_trigger_discovery_data(hass, discovery_hash):
     hass.data[DATA_MQTT_DEBUG_INFO]["triggers"][discovery_hash]["discovery_data"] = None
 
 
+def info_for_inbound_messages(hass):
+    """Get debug info for the inbound message pipeline."""
+    return inbound_statistics(hass).as_dict()
+
+
 async def info_for_device(hass, device_id):
     """Get debug info for a device."""
     mqtt_info = {"entities": [], "triggers": []}
@@ -4,14 +4,13 @@ import json
 import voluptuous as vol
 
 from homeassistant.components.mqtt import valid_publish_topic
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     convert_include_exclude_filter,
 )
-from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.json import JSONEncoder
 
 CONF_BASE_TOPIC = "base_topic"
@@ -45,13 +44,16 @@ async def async_setup(hass, config):
         base_topic = f"{base_topic}/"
 
     @callback
-    def _state_publisher(entity_id, old_state, new_state):
-        if new_state is None:
-            return
-
-        if not publish_filter(entity_id):
-            return
+    def _event_filter(event):
+        """Filter the state changes that are not published."""
+        return event.data.get("new_state") is not None and publish_filter(
+            event.data["entity_id"]
+        )
 
+    @callback
+    def _state_publisher(event):
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
         payload = new_state.state
 
         mybase = f"{base_topic}{entity_id.replace('.', '/')}/"
@@ -72,5 +74,7 @@ async def async_setup(hass, config):
                 encoded_val = json.dumps(val, cls=JSONEncoder)
                 hass.components.mqtt.async_publish(mybase + key, encoded_val, 1, True)
 
-    async_track_state_change(hass, MATCH_ALL, _state_publisher)
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, _state_publisher, event_filter=_event_filter
+    )
     return True
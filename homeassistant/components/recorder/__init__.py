@@ -1,6 +1,6 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime
 import logging
@@ -36,7 +36,12 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
+from .statistics import (
+    STATISTICS_PERIOD_HOURLY,
+    STATISTICS_PERIOD_SHORT_TERM,
+    StatisticsCompiler,
+)
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -57,8 +62,13 @@ DEFAULT_URL = "sqlite:///{hass_config_path}"
 DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_STATISTICS_KEEP_DAYS = 365
 KEEPALIVE_TIME = 30
 
+EXPIRE_AFTER_COMMITS = 120
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -67,6 +77,9 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_MAX_BATCH_SIZE = "max_batch_size"
+CONF_SHORT_TERM_STATISTICS = "short_term_statistics"
+CONF_STATISTICS_KEEP_DAYS = "statistics_keep_days"
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -93,6 +106,13 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_COMMIT_INTERVAL, default=1): vol.All(
                         vol.Coerce(int), vol.Range(min=0)
                     ),
+                    vol.Optional(
+                        CONF_MAX_BATCH_SIZE, default=DEFAULT_MAX_BATCH_SIZE
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Optional(CONF_SHORT_TERM_STATISTICS, default=False): cv.boolean,
+                    vol.Optional(
+                        CONF_STATISTICS_KEEP_DAYS, default=DEFAULT_STATISTICS_KEEP_DAYS
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -154,6 +174,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    max_batch_size = conf[CONF_MAX_BATCH_SIZE]
+    short_term_statistics = conf[CONF_SHORT_TERM_STATISTICS]
+    statistics_keep_days = conf[CONF_STATISTICS_KEEP_DAYS]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
 
@@ -167,6 +190,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         auto_purge=auto_purge,
         keep_days=keep_days,
         commit_interval=commit_interval,
+        max_batch_size=max_batch_size,
+        short_term_statistics=short_term_statistics,
+        statistics_keep_days=statistics_keep_days,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
@@ -199,6 +225,9 @@ class Recorder(threading.Thread):
         auto_purge: bool,
         keep_days: int,
         commit_interval: int,
+        max_batch_size: int,
+        short_term_statistics: bool,
+        statistics_keep_days: int,
         uri: str,
         db_max_retries: int,
         db_retry_wait: int,
@@ -212,6 +241,9 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
+        self.short_term_statistics = short_term_statistics
+        self.statistics_keep_days = statistics_keep_days
         self.queue: Any = queue.SimpleQueue()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -226,7 +258,16 @@ class Recorder(threading.Thread):
 
         self._timechanges_seen = 0
         self._keepalive_count = 0
-        self._old_state_ids = {}
+        self._old_states = {}
+        self._pending_expunge = []
+        self._pending_count = 0
+        self._pending_state_attributes = {}
+        self._state_attributes_ids = OrderedDict()
+        self._commits_without_expire = 0
+        statistics_periods = [STATISTICS_PERIOD_HOURLY]
+        if short_term_statistics:
+            statistics_periods.append(STATISTICS_PERIOD_SHORT_TERM)
+        self._statistics = StatisticsCompiler(statistics_periods, self.recording_start)
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -234,7 +275,9 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
-        self.hass.bus.async_listen(MATCH_ALL, self.event_listener)
+        self.hass.bus.async_listen(
+            MATCH_ALL, self.event_listener, event_filter=self._async_event_filter
+        )
 
     def do_adhoc_purge(self, **kwargs):
         """Trigger an adhoc purge retaining keep_days worth of data."""
@@ -330,10 +373,15 @@ class Recorder(threading.Thread):
                 async_purge, hour=4, minute=12, second=0
             )
 
-        self.event_session = self.get_session()
+        self._open_event_session()
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
+        #
+        # Events and states are only added to the session here,
+        # states are linked to their previous state through a
+        # relationship so the ids are resolved when the whole batch is
+        # flushed at commit time instead of with a round-trip per row.
         while True:
             event = self.queue.get()
             if event is None:
@@ -341,7 +389,11 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
-                # Schedule a new purge task if this one didn't finish
+                # Pending states may reference shared attributes
+                # the purge would otherwise consider unused
+                self._commit_event_session_or_retry()
+                # Schedule a new purge task behind the pending events
+                # if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
                 continue
@@ -350,46 +402,36 @@ class Recorder(threading.Thread):
                 if self._keepalive_count >= KEEPALIVE_TIME:
                     self._keepalive_count = 0
                     self._send_keep_alive()
+                self._statistics.compile_finished(self.event_session, event.time_fired)
                 if self.commit_interval:
                     self._timechanges_seen += 1
                     if self._timechanges_seen >= self.commit_interval:
                         self._timechanges_seen = 0
                         self._commit_event_session_or_retry()
                 continue
-            if event.event_type in self.exclude_t:
-                continue
-
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
-                    continue
 
-            try:
-                dbevent = Events.from_event(event)
-                if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent.event_data = "{}"
-                self.event_session.add(dbevent)
-                self.event_session.flush()
-            except (TypeError, ValueError):
-                _LOGGER.warning("Event is not JSON serializable: %s", event)
-            except Exception as err:  # pylint: disable=broad-except
-                # Must catch the exception to prevent the loop from collapsing
-                _LOGGER.exception("Error adding event: %s", err)
-
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
+            if event.event_type == EVENT_STATE_CHANGED:
+                # State changes are stored as a single states row
+                # which carries the context of the event itself
                 try:
                     dbstate = States.from_event(event)
                     has_new_state = event.data.get("new_state")
-                    dbstate.old_state_id = self._old_state_ids.get(dbstate.entity_id)
+                    old_state = self._old_states.get(dbstate.entity_id)
+                    self._link_state_attributes(dbstate, old_state, event)
+                    self._old_states.pop(dbstate.entity_id, None)
+                    if old_state is not None:
+                        if old_state.state_id:
+                            dbstate.old_state_id = old_state.state_id
+                        else:
+                            dbstate.old_state = old_state
                     if not has_new_state:
                         dbstate.state = None
-                    dbstate.event_id = dbevent.event_id
                     self.event_session.add(dbstate)
-                    self.event_session.flush()
+                    self._pending_count += 1
                     if has_new_state:
-                        self._old_state_ids[dbstate.entity_id] = dbstate.state_id
-                    elif dbstate.entity_id in self._old_state_ids:
-                        del self._old_state_ids[dbstate.entity_id]
+                        self._old_states[dbstate.entity_id] = dbstate
+                        self._pending_expunge.append(dbstate)
+                        self._statistics.add_state(self.event_session, has_new_state)
                 except (TypeError, ValueError):
                     _LOGGER.warning(
                         "State is not JSON serializable: %s",
@@ -398,12 +440,104 @@ class Recorder(threading.Thread):
                 except Exception as err:  # pylint: disable=broad-except
                     # Must catch the exception to prevent the loop from collapsing
                     _LOGGER.exception("Error adding state change: %s", err)
+            else:
+                try:
+                    dbevent = Events.from_event(event)
+                    self.event_session.add(dbevent)
+                    self._pending_count += 1
+                except (TypeError, ValueError):
+                    _LOGGER.warning("Event is not JSON serializable: %s", event)
+                except Exception as err:  # pylint: disable=broad-except
+                    # Must catch the exception to prevent the loop from collapsing
+                    _LOGGER.exception("Error adding event: %s", err)
 
             # If they do not have a commit interval
-            # than we commit right away
-            if not self.commit_interval:
+            # than we commit right away, otherwise we
+            # commit once the batch is full
+            if not self.commit_interval or self._pending_count >= self.max_batch_size:
                 self._commit_event_session_or_retry()
 
+    def _link_state_attributes(self, dbstate, old_dbstate, event):
+        """Link a state to its shared attributes row.
+
+        Attributes that did not change since the previously recorded
+        state, or that are in the cache of recently used attributes,
+        are linked without inserting a new row.
+        """
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (
+            old_dbstate is not None
+            and old_state is not None
+            and new_state is not None
+            and old_state.attributes == new_state.attributes
+        ):
+            if old_dbstate.attributes_id:
+                dbstate.attributes_id = old_dbstate.attributes_id
+                return
+            if old_dbstate.state_attributes is not None:
+                dbstate.state_attributes = old_dbstate.state_attributes
+                return
+
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+
+        pending = self._pending_state_attributes.get(shared_attrs)
+        if pending is not None:
+            dbstate.state_attributes = pending
+            return
+
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is None:
+            attributes_id = self._find_shared_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+            dbstate.attributes_id = attributes_id
+            return
+
+        dbstate_attributes = StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+
+    def cached_attributes_ids(self):
+        """Return the ids of shared attributes new states may be linked to.
+
+        These are the attributes of the last recorded state of each entity
+        and the recently used attributes, the purge must keep them even
+        if the states referencing them were removed.
+        """
+        attributes_ids = set(self._state_attributes_ids.values())
+        attributes_ids.update(
+            old_state.attributes_id
+            for old_state in self._old_states.values()
+            if old_state.attributes_id is not None
+        )
+        return attributes_ids
+
+    def _find_shared_attributes_id(self, shared_attrs):
+        """Find the id of already stored shared attributes."""
+        # Do not flush the pending batch just to run the lookup
+        with self.event_session.no_autoflush:
+            row = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(
+                    StateAttributes.hash
+                    == StateAttributes.hash_shared_attrs(shared_attrs)
+                )
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            )
+        return row[0] if row else None
+
+    def _cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of shared attributes, evicting the oldest ones."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        self._state_attributes_ids.move_to_end(shared_attrs)
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -466,20 +600,70 @@ class Recorder(threading.Thread):
             # Must catch the exception to prevent the loop from collapsing
             _LOGGER.exception("Error while closing event session: %s", err)
 
+        self._old_states = {}
+        self._pending_expunge = []
+        self._pending_count = 0
+        self._pending_state_attributes = {}
+        self._state_attributes_ids.clear()
+
         try:
-            self.event_session = self.get_session()
+            self._open_event_session()
         except Exception as err:  # pylint: disable=broad-except
             # Must catch the exception to prevent the loop from collapsing
             _LOGGER.exception("Error while creating new event session: %s", err)
 
+    def _open_event_session(self):
+        """Open the event session."""
+        self.event_session = self.get_session()
+        # The states kept in _old_states are linked to the next
+        # state of the same entity so they must not be expired
+        self.event_session.expire_on_commit = False
+
     def _commit_event_session(self):
+        self._commits_without_expire += 1
+
         try:
+            if self._pending_expunge:
+                self.event_session.flush()
+                for dbstate in self._pending_expunge:
+                    # Expunge the state so its not expired
+                    # until we use it later for dbstate.old_state
+                    if dbstate in self.event_session:
+                        self.event_session.expunge(dbstate)
+                self._pending_expunge = []
             self.event_session.commit()
+            self._pending_count = 0
+            for (
+                shared_attrs,
+                dbstate_attributes,
+            ) in self._pending_state_attributes.items():
+                if dbstate_attributes.attributes_id is not None:
+                    self._cache_state_attributes_id(
+                        shared_attrs, dbstate_attributes.attributes_id
+                    )
+            self._pending_state_attributes = {}
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
             raise
 
+        if self._commits_without_expire == EXPIRE_AFTER_COMMITS:
+            self._commits_without_expire = 0
+            self.event_session.expire_all()
+
+    @callback
+    def _async_event_filter(self, event):
+        """Filter events that are not recorded before they are queued."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            # Drives the keepalive and commit interval
+            return True
+
+        if event.event_type in self.exclude_t:
+            return False
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        return entity_id is None or self.entity_filter(entity_id)
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
@@ -585,6 +769,9 @@ class Recorder(threading.Thread):
     def _close_run(self):
         """Save end time for current run."""
         if self.event_session is not None:
+            # Keep the statistics of the unfinished periods,
+            # they are continued on the next start
+            self._statistics.compile_all(self.event_session)
             self.run_info.end = dt_util.utcnow()
             self.event_session.add(self.run_info)
             self._commit_event_session_or_retry()
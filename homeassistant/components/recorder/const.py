@@ -3,3 +3,6 @@
 DATA_INSTANCE = "recorder_instance"
 SQLITE_URL_PREFIX = "sqlite://"
 DOMAIN = "recorder"
+
+# The maximum number of rows deleted in a single purge transaction
+MAX_ROWS_TO_PURGE = 1000
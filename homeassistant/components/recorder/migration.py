@@ -277,6 +277,29 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "states", "ix_states_entity_id")
         _create_index(engine, "events", "ix_events_event_type_time_fired")
         _drop_index(engine, "events", "ix_events_event_type")
+    elif new_version == 10:
+        # The state_attributes table is created by create_all,
+        # existing rows keep their attributes in the states table
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 11:
+        # State changes no longer write an events row, the context
+        # is stored with the state instead. The context_id and
+        # context_user_id columns are already there on databases
+        # that were created before schema version 9.
+        _add_columns(
+            engine,
+            "states",
+            [
+                "context_id CHARACTER(36)",
+                "context_user_id CHARACTER(36)",
+                "context_parent_id CHARACTER(36)",
+            ],
+        )
+        _create_index(engine, "states", "ix_states_context_id")
+    elif new_version == 12:
+        # The statistics table and its indexes are created by create_all
+        pass
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
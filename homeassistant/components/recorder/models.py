@@ -1,11 +1,14 @@
 """Models for SQLAlchemy."""
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -14,6 +17,7 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
@@ -24,7 +28,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 9
+SCHEMA_VERSION = 12
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,10 +36,21 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATISTICS = "statistics"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 
-ALL_TABLES = [TABLE_EVENTS, TABLE_STATES, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
+ALL_TABLES = [
+    TABLE_EVENTS,
+    TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATISTICS,
+    TABLE_RECORDER_RUNS,
+    TABLE_SCHEMA_CHANGES,
+]
+
+EMPTY_JSON_OBJECT = "{}"
 
 
 class Events(Base):  # type: ignore
@@ -106,6 +121,18 @@ class States(Base):  # type: ignore
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
     old_state_id = Column(Integer)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
+    context_id = Column(String(36), index=True)
+    context_user_id = Column(String(36))
+    context_parent_id = Column(String(36))
+    state_attributes = relationship("StateAttributes", lazy="joined")
+    old_state = relationship(
+        "States",
+        remote_side=[state_id],
+        primaryjoin="foreign(States.old_state_id) == States.state_id",
+    )
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -119,36 +146,58 @@ class States(Base):  # type: ignore
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
+        # The attributes are stored in the state_attributes table
+        dbstate = States(
+            entity_id=entity_id,
+            attributes=None,
+            context_id=event.context.id,
+            context_user_id=event.context.user_id,
+            context_parent_id=event.context.parent_id,
+        )
 
         # State got deleted
         if state is None:
             dbstate.state = ""
             dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
         return dbstate
 
+    @property
+    def shared_attributes(self):
+        """Return the attributes JSON of the state.
+
+        Rows written before schema version 10 keep their
+        attributes in the states table itself.
+        """
+        if self.attributes is not None:
+            return self.attributes
+        if self.state_attributes is not None:
+            return self.state_attributes.shared_attrs
+        return EMPTY_JSON_OBJECT
+
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(self.shared_attributes),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
-                # Join the events table on event_id to get the context instead
-                # as it will always be there for state_changed events
-                context=Context(id=None),
+                # Rows written before schema version 11 have their
+                # context in the events table joined on event_id
+                context=Context(
+                    id=self.context_id,
+                    user_id=self.context_user_id,
+                    parent_id=self.context_parent_id,
+                ),
                 validate_entity_id=validate_entity_id,
             )
         except ValueError:
@@ -157,6 +206,78 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attribute change history, shared between states."""
+
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event):
+        """Create the shared attributes JSON from a state_changed event."""
+        state = event.data.get("new_state")
+        # State got deleted
+        if state is None:
+            return EMPTY_JSON_OBJECT
+        return json.dumps(dict(state.attributes), cls=JSONEncoder)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up shared attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+    def to_native(self, validate_entity_id=True):
+        """Convert to an HA state attributes dict."""
+        try:
+            return json.loads(self.shared_attrs)
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to state attributes: %s", self)
+            return {}
+
+
+class Statistics(Base):  # type: ignore
+    """Downsampled statistics of a numeric sensor over a period."""
+
+    __tablename__ = TABLE_STATISTICS
+    id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    period = Column(Integer)
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    sum = Column(Float)
+    count = Column(Integer)
+
+    __table_args__ = (
+        Index("ix_statistics_entity_id_period_start", "entity_id", "period", "start"),
+        Index("ix_statistics_period_start", "period", "start"),
+    )
+
+    def to_native(self, validate_entity_id=True):
+        """Convert to a statistics dict."""
+        return {
+            "entity_id": self.entity_id,
+            "start": process_timestamp(self.start),
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "sum": self.sum,
+        }
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
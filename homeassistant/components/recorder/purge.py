@@ -3,12 +3,14 @@ from datetime import timedelta
 import logging
 import time
 
+from sqlalchemy import exists
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .const import MAX_ROWS_TO_PURGE
+from .models import Events, RecorderRuns, StateAttributes, States, Statistics
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,50 +18,48 @@ _LOGGER = logging.getLogger(__name__)
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Cleans up at most MAX_ROWS_TO_PURGE rows per call and returns
+    False if there is more left to purge.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before, states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before, events[0].time_fired + timedelta(hours=1),
-                )
-
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
-
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
+            # Only one bounded batch of rows is deleted per call, the
+            # recorder queues a new purge task behind any pending events
+            # so live writes are never blocked for longer than one batch.
+            #
+            # States are purged before events since legacy states
+            # reference the event they were recorded with.
+            state_ids, attributes_ids = _select_state_ids_to_purge(
+                session, purge_before
             )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            if state_ids:
+                _purge_state_ids(session, state_ids)
+                # Shared attributes can only be removed once
+                # no remaining state references them
+                _purge_unused_attributes_ids(instance, session, attributes_ids)
+                return False
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
+            event_ids = _select_event_ids_to_purge(session, purge_before)
+            if event_ids:
+                _purge_event_ids(session, event_ids)
+                return False
+
+            # Statistics are kept independently of the states
+            statistics_ids = _select_statistics_ids_to_purge(
+                session,
+                dt_util.utcnow() - timedelta(days=instance.statistics_keep_days),
             )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            if statistics_ids:
+                _purge_statistics_ids(session, statistics_ids)
+                return False
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
+            # Shared attributes which were kept for the recorder
+            # when their last state was purged
+            attributes_ids = _select_unused_attributes_ids(instance, session)
+            if _purge_unused_attributes_ids(instance, session, attributes_ids):
                 return False
 
             # Recorder runs is small, no need to batch run it
@@ -78,7 +78,9 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -98,3 +100,128 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _select_state_ids_to_purge(session, purge_before):
+    """Return a batch of state ids to purge and the attributes ids they use."""
+    states = (
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.last_updated < purge_before)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    _LOGGER.debug("Selected %s state ids to remove", len(states))
+    return (
+        [state.state_id for state in states],
+        {state.attributes_id for state in states if state.attributes_id is not None},
+    )
+
+
+def _select_event_ids_to_purge(session, purge_before):
+    """Return a batch of event ids to purge using the time_fired index."""
+    events = (
+        session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    _LOGGER.debug("Selected %s event ids to remove", len(events))
+    return [event.event_id for event in events]
+
+
+def _select_statistics_ids_to_purge(session, purge_before):
+    """Return a batch of statistics ids to purge."""
+    statistics = (
+        session.query(Statistics.id)
+        .filter(Statistics.start < purge_before)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    _LOGGER.debug("Selected %s statistics ids to remove", len(statistics))
+    return [statistic.id for statistic in statistics]
+
+
+def _select_unused_attributes_ids(instance, session):
+    """Return a batch of attributes ids no state references.
+
+    Attributes the recorder may link to its next states are skipped,
+    batches made only of those are paged over by primary key.
+    """
+    cached_attributes_ids = instance.cached_attributes_ids()
+    attributes_ids = set()
+    last_attributes_id = 0
+    while not attributes_ids:
+        state_attributes = (
+            session.query(StateAttributes.attributes_id)
+            .filter(StateAttributes.attributes_id > last_attributes_id)
+            .filter(
+                ~exists().where(States.attributes_id == StateAttributes.attributes_id)
+            )
+            .order_by(StateAttributes.attributes_id)
+            .limit(MAX_ROWS_TO_PURGE)
+            .all()
+        )
+        if not state_attributes:
+            break
+        attributes_ids = {
+            row.attributes_id for row in state_attributes
+        } - cached_attributes_ids
+        last_attributes_id = state_attributes[-1].attributes_id
+    _LOGGER.debug("Selected %s unused attributes ids", len(attributes_ids))
+    return attributes_ids
+
+
+def _purge_state_ids(session, state_ids):
+    """Delete states by their primary key."""
+    deleted_rows = (
+        session.query(States)
+        .filter(States.state_id.in_(state_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states, purge not completed yet", deleted_rows)
+
+
+def _purge_event_ids(session, event_ids):
+    """Delete events by their primary key."""
+    deleted_rows = (
+        session.query(Events)
+        .filter(Events.event_id.in_(event_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events, purge not completed yet", deleted_rows)
+
+
+def _purge_statistics_ids(session, statistics_ids):
+    """Delete statistics by their primary key."""
+    deleted_rows = (
+        session.query(Statistics)
+        .filter(Statistics.id.in_(statistics_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s statistics, purge not completed yet", deleted_rows)
+
+
+def _purge_unused_attributes_ids(instance, session, attributes_ids):
+    """Delete the shared attributes of attributes_ids no state uses anymore.
+
+    Attributes the recorder may link to its next states are kept.
+    Returns True if any shared attributes were deleted.
+    """
+    attributes_ids = attributes_ids - instance.cached_attributes_ids()
+    if not attributes_ids:
+        return False
+    attributes_ids.difference_update(
+        state.attributes_id
+        for state in session.query(States.attributes_id)
+        .filter(States.attributes_id.in_(attributes_ids))
+        .distinct()
+    )
+    if not attributes_ids:
+        return False
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+    return True
@@ -0,0 +1,171 @@
+"""Compile downsampled statistics of numeric sensors."""
+from datetime import datetime, timedelta
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import State
+
+from .models import Statistics
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_PERIOD_SHORT_TERM = 300
+STATISTICS_PERIOD_HOURLY = 3600
+
+STATISTICS_DOMAINS = ("sensor",)
+
+
+def state_to_statistic_value(state: Optional[State]) -> Optional[float]:
+    """Return the numeric value of a state or None if it has no statistics."""
+    if (
+        state is None
+        or state.domain not in STATISTICS_DOMAINS
+        or ATTR_UNIT_OF_MEASUREMENT not in state.attributes
+    ):
+        return None
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+    if not math.isfinite(value):
+        return None
+    return value
+
+
+def period_start(timestamp: datetime, period: int) -> datetime:
+    """Return the start of the period the timestamp falls in."""
+    start = timestamp.replace(minute=0, second=0, microsecond=0)
+    if period == STATISTICS_PERIOD_HOURLY:
+        return start
+    return start + timedelta(
+        seconds=(timestamp.minute * 60 + timestamp.second) // period * period
+    )
+
+
+class _StatisticsBucket:
+    """Aggregate of the values of one entity within one period."""
+
+    __slots__ = ["start", "end", "min", "max", "sum", "count", "statistics_id"]
+
+    def __init__(self, start: datetime, period: int) -> None:
+        """Initialize an empty bucket."""
+        self.start = start
+        self.end = start + timedelta(seconds=period)
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self.count = 0
+        self.statistics_id: Optional[int] = None
+
+    def add(self, value: float) -> None:
+        """Add a value to the bucket."""
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sum += value
+        self.count += 1
+
+
+class StatisticsCompiler:
+    """Compile statistics incrementally as states are recorded.
+
+    Only the buckets of the current periods are kept in memory, a row
+    is written for each bucket once its period has ended. Buckets still
+    open at shutdown are written as well and continued after a restart.
+    """
+
+    def __init__(self, periods: List[int], recording_start: datetime) -> None:
+        """Initialize the compiler."""
+        self.periods = periods
+        self.recording_start = recording_start
+        self._buckets: Dict[Tuple[str, int], _StatisticsBucket] = {}
+        self._next_end: Optional[datetime] = None
+
+    def add_state(self, session, state: Optional[State]) -> None:
+        """Add a recorded state to the statistics of its entity."""
+        value = state_to_statistic_value(state)
+        if value is None:
+            return
+        assert state is not None
+
+        for period in self.periods:
+            key = (state.entity_id, period)
+            start = period_start(state.last_updated, period)
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.start != start:
+                self._write_bucket(session, state.entity_id, period, bucket)
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[key] = self._new_bucket(
+                    session, state.entity_id, period, start
+                )
+                if self._next_end is None or bucket.end < self._next_end:
+                    self._next_end = bucket.end
+            bucket.add(value)
+
+    def compile_finished(self, session, now: datetime) -> None:
+        """Write the buckets whose period ended before now."""
+        if self._next_end is None or now < self._next_end:
+            return
+
+        self._next_end = None
+        for (entity_id, period), bucket in list(self._buckets.items()):
+            if bucket.end <= now:
+                self._write_bucket(session, entity_id, period, bucket)
+                del self._buckets[(entity_id, period)]
+            elif self._next_end is None or bucket.end < self._next_end:
+                self._next_end = bucket.end
+
+    def compile_all(self, session) -> None:
+        """Write all buckets, including the ones of unfinished periods."""
+        for (entity_id, period), bucket in self._buckets.items():
+            self._write_bucket(session, entity_id, period, bucket)
+        self._buckets = {}
+        self._next_end = None
+
+    def _new_bucket(
+        self, session, entity_id: str, period: int, start: datetime
+    ) -> _StatisticsBucket:
+        """Create a bucket, continuing the one written before a restart."""
+        bucket = _StatisticsBucket(start, period)
+        if start >= self.recording_start:
+            return bucket
+
+        with session.no_autoflush:
+            row = (
+                session.query(Statistics)
+                .filter(Statistics.entity_id == entity_id)
+                .filter(Statistics.period == period)
+                .filter(Statistics.start == start)
+                .first()
+            )
+        if row is not None:
+            bucket.min = row.min
+            bucket.max = row.max
+            bucket.sum = row.sum
+            bucket.count = row.count
+            bucket.statistics_id = row.id
+        return bucket
+
+    @staticmethod
+    def _write_bucket(
+        session, entity_id: str, period: int, bucket: _StatisticsBucket
+    ) -> None:
+        """Add the row of a bucket to the session."""
+        values = {
+            "mean": bucket.sum / bucket.count,
+            "min": bucket.min,
+            "max": bucket.max,
+            "sum": bucket.sum,
+            "count": bucket.count,
+        }
+        if bucket.statistics_id is not None:
+            session.query(Statistics).filter(
+                Statistics.id == bucket.statistics_id
+            ).update(values, synchronize_session=False)
+            return
+
+        session.add(
+            Statistics(entity_id=entity_id, period=period, start=bucket.start, **values)
+        )
@@ -9,7 +9,11 @@ from homeassistant.core import EVENT_HOMEASSISTANT_START, CoreState, callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.event import Event, async_track_template_result
+from homeassistant.helpers.event import (
+    ALL_STATES_RATE_LIMIT,
+    Event,
+    async_track_template_result,
+)
 from homeassistant.helpers.template import Template, result_as_boolean
 
 _LOGGER = logging.getLogger(__name__)
@@ -113,8 +117,13 @@ class _TemplateAttribute:
     @callback
     def async_template_startup(self) -> None:
         """Call from containing entity when added to hass."""
+        # Templates of entities that depend on all states, like a count
+        # of the states, are rendered at most once per ALL_STATES_RATE_LIMIT
         result_info = async_track_template_result(
-            self._entity.hass, self.template, self._handle_result
+            self._entity.hass,
+            self.template,
+            self._handle_result,
+            all_states_rate_limit=ALL_STATES_RATE_LIMIT,
         )
 
         self.async_update = result_info.async_refresh
@@ -36,3 +36,20 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(iden, event):
+    """Return an event message with the event only serialized once.
+
+    The encoded event is cached on the event and shared by all
+    subscriptions, only the id is spliced in per subscription.
+    """
+    # pylint: disable=protected-access
+    if event._json is None:
+        try:
+            event._json = const.JSON_DUMP(event)
+        except (ValueError, TypeError):
+            # Let the writer report the unserializable data
+            return event_message(iden, event)
+
+    return f'{{"id": {iden}, "type": "event", "event": {event._json}}}'
@@ -6,7 +6,18 @@ import os
 import re
 import shutil
 from types import ModuleType
-from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import voluptuous as vol
 from voluptuous.humanize import humanize_error
@@ -56,7 +67,10 @@ from homeassistant.requirements import (
 )
 from homeassistant.util.package import is_docker_env
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
-from homeassistant.util.yaml import SECRET_YAML, load_yaml
+from homeassistant.util.yaml import SECRET_YAML, YamlCache, load_yaml, use_cache
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,6 +81,10 @@ YAML_CONFIG_FILE = "configuration.yaml"
 VERSION_FILE = ".HA_VERSION"
 CONFIG_DIR_NAME = ".homeassistant"
 DATA_CUSTOMIZE = "hass_customize"
+DATA_YAML_CACHE = "yaml_cache"
+YAML_CACHE_STORAGE_KEY = "core.yaml_cache"
+YAML_CACHE_STORAGE_VERSION = 1
+YAML_CACHE_SAVE_DELAY = 10
 
 GROUP_CONFIG_PATH = "groups.yaml"
 AUTOMATION_CONFIG_PATH = "automations.yaml"
@@ -305,23 +323,63 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
     This function allow a component inside the asyncio loop to reload its
     configuration by itself. Include package merge.
     """
+    store, yaml_cache = await _async_get_yaml_cache(hass)
     # Not using async_add_executor_job because this is an internal method.
     config = await hass.loop.run_in_executor(
-        None, load_yaml_config_file, hass.config.path(YAML_CONFIG_FILE)
+        None, load_yaml_config_file, hass.config.path(YAML_CONFIG_FILE), yaml_cache
     )
+    hits, misses, dirty = yaml_cache.pop_stats()
+    _LOGGER.debug(
+        "Loaded YAML configuration, %d files from cache and %d parsed", hits, misses
+    )
+    if dirty:
+        store.async_delay_save(yaml_cache.as_dict, YAML_CACHE_SAVE_DELAY)
     core_config = config.get(CONF_CORE, {})
     await merge_packages_config(hass, config, core_config.get(CONF_PACKAGES, {}))
     return config
 
 
-def load_yaml_config_file(config_path: str) -> Dict[Any, Any]:
+async def _async_get_yaml_cache(hass: HomeAssistant) -> Tuple["Store", YamlCache]:
+    """Return the store and the cache of parsed YAML files."""
+    if DATA_YAML_CACHE in hass.data:
+        return cast(Tuple["Store", YamlCache], hass.data[DATA_YAML_CACHE])
+
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import Store
+
+    store = Store(
+        hass, YAML_CACHE_STORAGE_VERSION, YAML_CACHE_STORAGE_KEY, private=True
+    )
+    try:
+        data = await store.async_load()
+    except HomeAssistantError as err:
+        _LOGGER.debug("Unable to load the YAML cache: %s", err)
+        data = None
+
+    yaml_cache = YamlCache(cast(Dict, data)["entries"] if data else None)
+    return cast(
+        Tuple["Store", YamlCache],
+        hass.data.setdefault(DATA_YAML_CACHE, (store, yaml_cache)),
+    )
+
+
+def load_yaml_config_file(
+    config_path: str, yaml_cache: Optional[YamlCache] = None
+) -> Dict[Any, Any]:
     """Parse a YAML configuration file.
 
+    When a cache is passed, unchanged files are taken from it.
+
     Raises FileNotFoundError or HomeAssistantError.
 
     This method needs to run in an executor.
     """
-    conf_dict = load_yaml(config_path)
+    if yaml_cache is None:
+        conf_dict = load_yaml(config_path)
+    else:
+        with use_cache(yaml_cache) as loaded_files:
+            conf_dict = load_yaml(config_path)
+        yaml_cache.prune(loaded_files)
 
     if not isinstance(conf_dict, dict):
         msg = (
@@ -104,6 +104,7 @@ class DeviceRegistry:
     devices: Dict[str, DeviceEntry]
     deleted_devices: Dict[str, DeletedDeviceEntry]
     _devices_index: Dict[str, Dict[str, Dict[str, str]]]
+    _area_index: Dict[str, Dict[str, None]]
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -162,6 +163,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices[device.id] = device
+            _add_device_to_area_index(self._area_index, device)
 
         _add_device_to_index(devices_index, device)
 
@@ -173,6 +175,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices.pop(device.id)
+            _remove_device_from_area_index(self._area_index, device)
 
         _remove_device_from_index(devices_index, device)
 
@@ -184,18 +187,24 @@ class DeviceRegistry:
         _remove_device_from_index(devices_index, old_device)
         _add_device_to_index(devices_index, new_device)
 
+        if old_device.area_id != new_device.area_id:
+            _remove_device_from_area_index(self._area_index, old_device)
+            _add_device_to_area_index(self._area_index, new_device)
+
     def _clear_index(self):
         """Clear the index."""
         self._devices_index = {
             REGISTERED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
             DELETED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
         }
+        self._area_index = {}
 
     def _rebuild_index(self):
         """Create the index after loading devices."""
         self._clear_index()
         for device in self.devices.values():
             _add_device_to_index(self._devices_index[REGISTERED_DEVICE], device)
+            _add_device_to_area_index(self._area_index, device)
         for device in self.deleted_devices.values():
             _add_device_to_index(self._devices_index[DELETED_DEVICE], device)
 
@@ -516,9 +525,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for dev_id in list(self._area_index.get(area_id, ())):
+            self._async_update_device(dev_id, area_id=None)
 
 
 @singleton(DATA_REGISTRY)
@@ -532,7 +540,9 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    # pylint: disable=protected-access
+    device_ids = registry._area_index.get(area_id, ())
+    return [registry.devices[device_id] for device_id in device_ids]
 
 
 @callback
@@ -649,3 +659,19 @@ def _remove_device_from_index(
     for connection in device.connections:
         if connection in devices_index[IDX_CONNECTIONS]:
             del devices_index[IDX_CONNECTIONS][connection]
+
+
+def _add_device_to_area_index(area_index: dict, device: DeviceEntry) -> None:
+    """Add a device to the area index."""
+    if device.area_id is not None:
+        area_index.setdefault(device.area_id, {})[device.id] = None
+
+
+def _remove_device_from_area_index(area_index: dict, device: DeviceEntry) -> None:
+    """Remove a device from the area index."""
+    if device.area_id is None:
+        return
+    device_ids = area_index[device.area_id]
+    del device_ids[device.id]
+    if not device_ids:
+        del area_index[device.area_id]
@@ -125,6 +125,9 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        # Entity IDs by device ID and by config entry ID
+        self._device_index: Dict[str, Dict[str, None]] = {}
+        self._config_entry_index: Dict[str, Dict[str, None]] = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
@@ -387,9 +390,8 @@ class EntityRegistry:
         if not changes:
             return old
 
-        self._remove_index(old)
         new = attr.evolve(old, **changes)
-        self._register_entry(new)
+        self._update_entry(old, new)
 
         self.async_schedule_save()
 
@@ -477,19 +479,30 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in list(self._config_entry_index.get(config_entry, ())):
             self.async_remove(entity_id)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
         self._add_index(entry)
 
+    def _update_entry(self, old: RegistryEntry, new: RegistryEntry) -> None:
+        """Replace an entry, only reindexing what changed."""
+        self.entities[new.entity_id] = new
+        del self._index[(old.domain, old.platform, old.unique_id)]
+        self._index[(new.domain, new.platform, new.unique_id)] = new.entity_id
+        for index, old_key, new_key in (
+            (self._device_index, old.device_id, new.device_id),
+            (self._config_entry_index, old.config_entry_id, new.config_entry_id),
+        ):
+            if old_key != new_key or old.entity_id != new.entity_id:
+                _remove_from_index(index, old_key, old.entity_id)
+                _add_to_index(index, new_key, new.entity_id)
+
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        _add_to_index(self._device_index, entry.device_id, entry.entity_id)
+        _add_to_index(self._config_entry_index, entry.config_entry_id, entry.entity_id)
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -497,9 +510,15 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        _remove_from_index(self._device_index, entry.device_id, entry.entity_id)
+        _remove_from_index(
+            self._config_entry_index, entry.config_entry_id, entry.entity_id
+        )
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._device_index = {}
+        self._config_entry_index = {}
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -517,9 +536,9 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    # pylint: disable=protected-access
+    entity_ids = registry._device_index.get(device_id, ())
+    return [registry.entities[entity_id] for entity_id in entity_ids]
 
 
 @callback
@@ -527,11 +546,9 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    # pylint: disable=protected-access
+    entity_ids = registry._config_entry_index.get(config_entry_id, ())
+    return [registry.entities[entity_id] for entity_id in entity_ids]
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
@@ -612,11 +629,28 @@ async def async_migrate_entries(
     """Migrator of unique IDs."""
     ent_reg = await async_get_registry(hass)
 
-    for entry in ent_reg.entities.values():
-        if entry.config_entry_id != config_entry_id:
-            continue
-
+    for entry in async_entries_for_config_entry(ent_reg, config_entry_id):
         updates = entry_callback(entry)
 
         if updates is not None:
             ent_reg.async_update_entity(entry.entity_id, **updates)
+
+
+def _add_to_index(
+    index: Dict[str, Dict[str, None]], key: Optional[str], entity_id: str
+) -> None:
+    """Add an entity ID to a secondary index."""
+    if key is not None:
+        index.setdefault(key, {})[entity_id] = None
+
+
+def _remove_from_index(
+    index: Dict[str, Dict[str, None]], key: Optional[str], entity_id: str
+) -> None:
+    """Remove an entity ID from a secondary index."""
+    if key is None:
+        return
+    entity_ids = index[key]
+    del entity_ids[entity_id]
+    if not entity_ids:
+        del index[key]
@@ -20,6 +20,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
+    HassJob,
     HomeAssistant,
     State,
     callback,
@@ -108,6 +109,8 @@ def async_track_state_change(
     else:
         entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
 
+    job = HassJob(action)
+
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
@@ -126,8 +129,8 @@ def async_track_state_change(
             if not match_to_state(new_state):
                 return
 
-        hass.async_run_job(
-            action,
+        hass.async_run_hass_job(
+            job,
             event.data.get("entity_id"),
             event.data.get("old_state"),
             event.data.get("new_state"),
@@ -180,9 +183,9 @@ def async_track_state_change_event(
             if entity_id not in entity_callbacks:
                 return
 
-            for action in entity_callbacks[entity_id][:]:
+            for job in entity_callbacks[entity_id][:]:
                 try:
-                    hass.async_run_job(action, event)
+                    hass.async_run_hass_job(job, event)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception(
                         "Error while processing state changed for %s", entity_id
@@ -197,8 +200,10 @@ def async_track_state_change_event(
 
     entity_ids = [entity_id.lower() for entity_id in entity_ids]
 
+    job = HassJob(action)
+
     for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(action)
+        entity_callbacks.setdefault(entity_id, []).append(job)
 
     @callback
     def remove_listener() -> None:
@@ -208,7 +213,7 @@ def async_track_state_change_event(
             TRACK_STATE_CHANGE_CALLBACKS,
             TRACK_STATE_CHANGE_LISTENER,
             entity_ids,
-            action,
+            job,
         )
 
     return remove_listener
@@ -220,14 +225,14 @@ def _async_remove_indexed_listeners(
     data_key: str,
     listener_key: str,
     storage_keys: Iterable[str],
-    action: Callable[[Event], Any],
+    job: HassJob,
 ) -> None:
     """Remove a listener."""
 
     callbacks = hass.data[data_key]
 
     for storage_key in storage_keys:
-        callbacks[storage_key].remove(action)
+        callbacks[storage_key].remove(job)
         if len(callbacks[storage_key]) == 0:
             del callbacks[storage_key]
 
@@ -259,9 +264,9 @@ def async_track_entity_registry_updated_event(
             if entity_id not in entity_callbacks:
                 return
 
-            for action in entity_callbacks[entity_id][:]:
+            for job in entity_callbacks[entity_id][:]:
                 try:
-                    hass.async_run_job(action, event)
+                    hass.async_run_hass_job(job, event)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception(
                         "Error while processing entity registry update for %s",
@@ -277,8 +282,10 @@ def async_track_entity_registry_updated_event(
 
     entity_ids = [entity_id.lower() for entity_id in entity_ids]
 
+    job = HassJob(action)
+
     for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(action)
+        entity_callbacks.setdefault(entity_id, []).append(job)
 
     @callback
     def remove_listener() -> None:
@@ -288,7 +295,7 @@ def async_track_entity_registry_updated_event(
             TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS,
             TRACK_ENTITY_REGISTRY_UPDATED_LISTENER,
             entity_ids,
-            action,
+            job,
         )
 
     return remove_listener
@@ -317,9 +324,9 @@ def async_track_state_added_domain(
             if domain not in domain_callbacks:
                 return
 
-            for action in domain_callbacks[domain][:]:
+            for job in domain_callbacks[domain][:]:
                 try:
-                    hass.async_run_job(action, event)
+                    hass.async_run_hass_job(job, event)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception(
                         "Error while processing state added for %s", domain
@@ -334,8 +341,10 @@ def async_track_state_added_domain(
 
     domains = [domains.lower() for domains in domains]
 
+    job = HassJob(action)
+
     for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(action)
+        domain_callbacks.setdefault(domain, []).append(job)
 
     @callback
     def remove_listener() -> None:
@@ -345,7 +354,7 @@ def async_track_state_added_domain(
             TRACK_STATE_ADDED_DOMAIN_CALLBACKS,
             TRACK_STATE_ADDED_DOMAIN_LISTENER,
             domains,
-            action,
+            job,
         )
 
     return remove_listener
@@ -395,6 +404,7 @@ def async_track_template(
     Callable to unregister the listener.
 
     """
+    job = HassJob(action)
 
     @callback
     def state_changed_listener(
@@ -415,8 +425,8 @@ def async_track_template(
         if result_as_boolean(last_result) or not result_as_boolean(result):
             return
 
-        hass.async_run_job(
-            action,
+        hass.async_run_hass_job(
+            job,
             event.data.get("entity_id"),
             event.data.get("old_state"),
             event.data.get("new_state"),
@@ -434,6 +444,9 @@ track_template = threaded_listener_factory(async_track_template)
 
 _UNCHANGED = object()
 
+# Suggested rate limit for templates that have to listen to all state changes
+ALL_STATES_RATE_LIMIT = timedelta(seconds=1)
+
 
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
@@ -444,13 +457,22 @@ class _TrackTemplateResultInfo:
         template: Template,
         action: Callable,
         variables: Optional[TemplateVarsType],
+        rate_limit: Optional[timedelta] = None,
+        all_states_rate_limit: Optional[timedelta] = None,
     ):
         """Handle removal / refresh of tracker init."""
         self.hass = hass
         self._template = template
         self._template.hass = hass
-        self._action = action
+        self._job = HassJob(action)
         self._variables = variables
+        self._rate_limit = rate_limit
+        self._all_states_rate_limit = all_states_rate_limit
+        self._last_rate_limited_render: Optional[float] = None
+        self._pending_event: Optional[Event] = None
+        self._pending_refresh: Optional[asyncio.TimerHandle] = None
+        self.render_count = 0
+        self.coalesced_count = 0
         self._last_result: Optional[Union[str, TemplateError]] = None
         self._all_listener: Optional[Callable] = None
         self._domains_listener: Optional[Callable] = None
@@ -460,6 +482,7 @@ class _TrackTemplateResultInfo:
 
     def async_setup(self) -> None:
         """Activation of template tracking."""
+        self.render_count += 1
         self._info = self._template.async_render_to_info(self._variables)
         if self._info.exception:
             _LOGGER.error(
@@ -586,9 +609,19 @@ class _TrackTemplateResultInfo:
             EVENT_STATE_CHANGED, self._refresh
         )
 
+    @callback
+    def _cancel_pending_refresh(self) -> None:
+        """Drop the render of a state change coalesced by the rate limit."""
+        self._pending_event = None
+        if self._pending_refresh is None:
+            return
+        self._pending_refresh.cancel()
+        self._pending_refresh = None
+
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
+        self._cancel_pending_refresh()
         self._cancel_all_listener()
         self._cancel_domains_listener()
         self._cancel_entities_listener()
@@ -598,10 +631,58 @@ class _TrackTemplateResultInfo:
         """Force recalculate the template."""
         if variables is not _UNCHANGED:
             self._variables = variables
-        self._refresh(None)
+        self._cancel_pending_refresh()
+        self._render(None)
+
+    @property
+    def _active_rate_limit(self) -> Optional[timedelta]:
+        if self._rate_limit is not None:
+            return self._rate_limit
+        if self._all_listener is not None:
+            return self._all_states_rate_limit
+        return None
+
+    @callback
+    def _refresh(self, event: Event) -> None:
+        """Render for an event, coalescing events inside the rate limit."""
+        rate_limit = self._active_rate_limit
+        if rate_limit is None:
+            self._last_rate_limited_render = None
+            self._render(event)
+            return
+
+        if self._pending_refresh is not None:
+            # A render is already scheduled, it will use the latest event
+            self._pending_event = event
+            self.coalesced_count += 1
+            return
+
+        now = self.hass.loop.time()
+        if self._last_rate_limited_render is not None:
+            next_render = self._last_rate_limited_render + rate_limit.total_seconds()
+            if now < next_render:
+                self._pending_event = event
+                self.coalesced_count += 1
+                self._pending_refresh = self.hass.loop.call_at(
+                    next_render, self._refresh_pending
+                )
+                return
+
+        self._last_rate_limited_render = now
+        self._render(event)
 
     @callback
-    def _refresh(self, event: Optional[Event]) -> None:
+    def _refresh_pending(self) -> None:
+        """Render the latest event coalesced by the rate limit."""
+        event = self._pending_event
+        self._pending_event = None
+        self._pending_refresh = None
+        self._last_rate_limited_render = self.hass.loop.time()
+        self._render(event)
+
+    @callback
+    def _render(self, event: Optional[Event]) -> None:
+        self.render_count += 1
         self._info = self._template.async_render_to_info(self._variables)
         self._update_listeners()
         self._last_info = self._info
@@ -620,8 +701,8 @@ class _TrackTemplateResultInfo:
         ):
             return
 
-        self.hass.async_run_job(
-            self._action, event, self._template, self._last_result, result
+        self.hass.async_run_hass_job(
+            self._job, event, self._template, self._last_result, result
         )
         self._last_result = result
 
@@ -654,6 +735,8 @@ def async_track_template_result(
     template: Template,
     action: TrackTemplateResultListener,
     variables: Optional[TemplateVarsType] = None,
+    rate_limit: Optional[timedelta] = None,
+    all_states_rate_limit: Optional[timedelta] = None,
 ) -> _TrackTemplateResultInfo:
     """Add a listener that fires when a the result of a template changes.
 
@@ -669,6 +752,12 @@ def async_track_template_result(
     Once the template returns to a non-error condition the result is sent
     to the action as usual.
 
+    State changes arriving within the rate limit of the last render are
+    coalesced into a single render of the latest event at the end of the
+    interval. Without a rate limit every state change is rendered. The
+    tracker counts its renders in render_count and the coalesced state
+    changes in coalesced_count.
+
     Parameters
     ----------
     hass
@@ -679,13 +768,21 @@ def async_track_template_result(
         Callable to call with results.
     variables
         Variables to pass to the template.
+    rate_limit
+        Minimum interval between renders caused by state changes.
+    all_states_rate_limit
+        Minimum interval between renders caused by state changes while
+        the template has to listen to all state changes. Ignored when
+        rate_limit is passed.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = _TrackTemplateResultInfo(hass, template, action, variables)
+    tracker = _TrackTemplateResultInfo(
+        hass, template, action, variables, rate_limit, all_states_rate_limit
+    )
     tracker.async_setup()
     return tracker
 
@@ -707,6 +804,8 @@ def async_track_same_state(
     async_remove_state_for_cancel: Optional[CALLBACK_TYPE] = None
     async_remove_state_for_listener: Optional[CALLBACK_TYPE] = None
 
+    job = HassJob(action)
+
     @callback
     def clear_listener() -> None:
         """Clear all unsub listener."""
@@ -725,7 +824,7 @@ def async_track_same_state(
         nonlocal async_remove_state_for_listener
         async_remove_state_for_listener = None
         clear_listener()
-        hass.async_run_job(action)
+        hass.async_run_hass_job(job)
 
     @callback
     def state_for_cancel_listener(event: Event) -> None:
@@ -764,11 +863,12 @@ def async_track_point_in_time(
     hass: HomeAssistant, action: Callable[..., None], point_in_time: datetime
 ) -> CALLBACK_TYPE:
     """Add a listener that fires once after a specific point in time."""
+    job = HassJob(action)
 
     @callback
     def utc_converter(utc_now: datetime) -> None:
         """Convert passed in UTC now to local now."""
-        hass.async_run_job(action, dt_util.as_local(utc_now))
+        hass.async_run_hass_job(job, dt_util.as_local(utc_now))
 
     return async_track_point_in_utc_time(hass, utc_converter, point_in_time)
 
@@ -779,7 +879,9 @@ track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
-    hass: HomeAssistant, action: Callable[..., Any], point_in_time: datetime
+    hass: HomeAssistant,
+    action: Union[HassJob, Callable[..., Any]],
+    point_in_time: datetime,
 ) -> CALLBACK_TYPE:
     """Add a listener that fires once after a specific point in UTC time."""
     # Ensure point_in_time is UTC
@@ -787,8 +889,8 @@ def async_track_point_in_utc_time(
 
     cancel_callback = hass.loop.call_at(
         hass.loop.time() + point_in_time.timestamp() - time.time(),
-        hass.async_run_job,
-        action,
+        hass.async_run_hass_job,
+        action if isinstance(action, HassJob) else HassJob(action),
         utc_point_in_time,
     )
 
@@ -806,7 +908,7 @@ track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_tim
 @callback
 @bind_hass
 def async_call_later(
-    hass: HomeAssistant, delay: float, action: Callable[..., None]
+    hass: HomeAssistant, delay: float, action: Union[HassJob, Callable[..., None]]
 ) -> CALLBACK_TYPE:
     """Add a listener that is called in <delay>."""
     return async_track_point_in_utc_time(
@@ -826,6 +928,7 @@ def async_track_time_interval(
 ) -> CALLBACK_TYPE:
     """Add a listener that fires repetitively at every timedelta interval."""
     remove = None
+    job = HassJob(action)
 
     def next_interval() -> datetime:
         """Return the next interval."""
@@ -835,10 +938,13 @@ def async_track_time_interval(
     def interval_listener(now: datetime) -> None:
         """Handle elapsed intervals."""
         nonlocal remove
-        remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
-        hass.async_run_job(action, now)
+        remove = async_track_point_in_utc_time(
+            hass, interval_listener_job, next_interval()
+        )
+        hass.async_run_hass_job(job, now)
 
-    remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
+    interval_listener_job = HassJob(interval_listener)
+    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
 
     def remove_listener() -> None:
         """Remove interval listener."""
@@ -952,6 +1058,7 @@ def async_track_utc_time_change(
     local: bool = False,
 ) -> CALLBACK_TYPE:
     """Add a listener that will fire if time matches a pattern."""
+    job = HassJob(action)
     # We do not have to wrap the function with time pattern matching logic
     # if no pattern given
     if all(val is None for val in (hour, minute, second)):
@@ -959,7 +1066,7 @@ def async_track_utc_time_change(
         @callback
         def time_change_listener(event: Event) -> None:
             """Fire every time event that comes in."""
-            hass.async_run_job(action, event.data[ATTR_NOW])
+            hass.async_run_hass_job(job, event.data[ATTR_NOW])
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
@@ -989,7 +1096,7 @@ def async_track_utc_time_change(
         nonlocal next_time, cancel_callback
 
         now = pattern_utc_now()
-        hass.async_run_job(action, dt_util.as_local(now) if local else now)
+        hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
 
         calculate_next(now + timedelta(seconds=1))
 
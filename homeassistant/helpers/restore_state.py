@@ -1,8 +1,10 @@
 """Support for restoring entity states on startup."""
 import asyncio
 from datetime import datetime, timedelta
+import json
 import logging
-from typing import Any, Dict, List, Optional, Set, cast
+from time import monotonic
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import (
@@ -20,6 +22,7 @@ from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.singleton import singleton
 from homeassistant.helpers.storage import Store
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import SerializationError, write_json_data
 
 DATA_RESTORE_STATE_TASK = "restore_state_task"
 
@@ -58,6 +61,78 @@ class StoredState:
         return cls(State.from_dict(json_dict["state"]), last_seen)
 
 
+class StoredStateEncoder(JSONEncoder):
+    """JSONEncoder that supports stored states."""
+
+    def default(self, o: Any) -> Any:
+        """Convert stored states to their dict representation."""
+        if isinstance(o, StoredState):
+            return o.as_dict()
+        return super().default(o)
+
+
+class RestoreStateStore(Store):
+    """Store for stored states that only encodes states that changed.
+
+    The encoding of each state is kept and reused as long as the state
+    machine holds the same state object. Encoding and writing happen in
+    the executor as part of the Store write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        super().__init__(hass, STORAGE_VERSION, STORAGE_KEY, encoder=StoredStateEncoder)
+        self._encoded_states: Dict[str, Tuple[State, str]] = {}
+        self.dump_stats: Dict[str, Any] = {}
+
+    def _write_json(self, path: str, data: Dict) -> None:
+        """Encode the stored states, reusing the encoding of unchanged states."""
+        start = monotonic()
+        previous = self._encoded_states
+        encoded_states: Dict[str, Tuple[State, str]] = {}
+        items = []
+        encoded_count = 0
+
+        try:
+            for stored_state in data["data"]:
+                state = stored_state.state
+                encoded = previous.get(state.entity_id)
+                if encoded is None or encoded[0] is not state:
+                    encoded = (
+                        state,
+                        json.dumps(
+                            state.as_dict(), cls=JSONEncoder, separators=(",", ":")
+                        ),
+                    )
+                    encoded_count += 1
+                encoded_states[state.entity_id] = encoded
+                last_seen = json.dumps(stored_state.last_seen, cls=JSONEncoder)
+                items.append(f'{{"state":{encoded[1]},"last_seen":{last_seen}}}')
+        except TypeError as err:
+            raise SerializationError(f"Failed to serialize stored states: {err}")
+
+        # Keep the encoding of the states written only
+        self._encoded_states = encoded_states
+        key = json.dumps(data["key"])
+        write_json_data(
+            path,
+            f'{{"version":{data["version"]},"key":{key},"data":[{",".join(items)}]}}',
+            self._private,
+        )
+
+        self.dump_stats = {
+            "states": len(items),
+            "encoded": encoded_count,
+            "duration": monotonic() - start,
+        }
+        _LOGGER.debug(
+            "Dumped %d states, %d encoded, in %.3fs",
+            self.dump_stats["states"],
+            self.dump_stats["encoded"],
+            self.dump_stats["duration"],
+        )
+
+
 class RestoreStateData:
     """Helper class for managing the helper saved data."""
 
@@ -101,9 +176,7 @@ class RestoreStateData:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
-        self.store: Store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
-        )
+        self.store: RestoreStateStore = RestoreStateStore(hass)
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
 
@@ -149,16 +222,17 @@ class RestoreStateData:
 
         return stored_states
 
+    @property
+    def dump_stats(self) -> Dict[str, Any]:
+        """Return the number of states and the duration of the last dump."""
+        return self.store.dump_stats
+
     async def async_dump_states(self) -> None:
         """Save the current state machine to storage."""
         _LOGGER.debug("Dumping states")
         try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
-            )
+            # States are encoded by the store in the executor
+            await self.store.async_save(self.async_get_stored_states())
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
 
@@ -225,6 +225,10 @@ class Store:
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
+        self._write_json(path, data)
+
+    def _write_json(self, path: str, data: Dict) -> None:
+        """Encode the data and write it to path."""
         json_util.save_json(path, data, self._private, encoder=self._encoder)
 
     async def _async_migrate_func(self, old_version, old_data):
@@ -1,5 +1,6 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 import base64
+from collections import OrderedDict
 import collections.abc
 from datetime import datetime
 from functools import wraps
@@ -8,7 +9,8 @@ import logging
 import math
 import random
 import re
-from typing import Any, Iterable, List, Optional, Union
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -46,6 +48,8 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 
+COMPILED_CODE_CACHE_SIZE = 4096
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:(?:states\.|(?P<func>is_state|is_state_attr|state_attr|states|expand)\((?:[\ \'\"]?))(?P<entity_id>[\w]+\.[\w]+)|states\.(?P<domain_outer>[a-z]+)|states\[(?:[\'\"]?)(?P<domain_inner>[\w]+))|(?P<variable>[\w]+))",
@@ -54,6 +58,22 @@ _RE_GET_ENTITIES = re.compile(
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{")
 
+_RE_FAST_STATES = re.compile(
+    r"\A\s*\{\{\s*states\(\s*(?P<q>['\"])(?P<entity_id>[\w.]+)(?P=q)\s*\)\s*\}\}\s*\Z"
+)
+_RE_FAST_IS_STATE = re.compile(
+    r"\A\s*\{\{\s*is_state\(\s*(?P<q>['\"])(?P<entity_id>[\w.]+)(?P=q)\s*,"
+    r"\s*(?P<q2>['\"])(?P<state>[^'\"\\]*)(?P=q2)\s*\)\s*\}\}\s*\Z"
+)
+_RE_FAST_STATE_ATTR = re.compile(
+    r"\A\s*\{\{\s*state_attr\(\s*(?P<q>['\"])(?P<entity_id>[\w.]+)(?P=q)\s*,"
+    r"\s*(?P<q2>['\"])(?P<name>[^'\"\\]*)(?P=q2)\s*\)\s*\}\}\s*\Z"
+)
+_RE_FAST_VALUE = re.compile(
+    r"\A\s*\{\{\s*(?P<name>value|value_json)(?P<path>(?:\.[A-Za-z]\w*)*)\s*\}\}\s*\Z"
+)
+_NO_FAST_PATH = object()
+
 _RESERVED_NAMES = {"contextfunction", "evalcontextfunction", "environmentfunction"}
 
 _GROUP_DOMAIN_PREFIX = "group."
@@ -201,6 +221,123 @@ class RenderInfo:
             self.filter_lifecycle = self._filter_lifecycle
 
 
+class CompiledCodeCache:
+    """Bounded LRU cache of compiled template code shared by the process."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple[bool, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[bool, str]) -> Any:
+        """Return the cached code for key or None."""
+        with self._lock:
+            code = self._cache.get(key)
+            if code is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return code
+
+    def set(self, key: Tuple[bool, str], code: Any) -> None:
+        """Store the code for key, evicting the least recently used code."""
+        with self._lock:
+            self._cache[key] = code
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached code and reset the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """Return the cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+
+_COMPILED_CODE_CACHE = CompiledCodeCache(COMPILED_CODE_CACHE_SIZE)
+
+
+def compiled_code_cache_info() -> Dict[str, int]:
+    """Return the statistics of the compiled template code cache."""
+    return _COMPILED_CODE_CACHE.info()
+
+
+def _analyze_simple_template(template: str) -> Optional[Callable]:
+    """Return a renderer for templates that do not need Jinja.
+
+    Only a few template shapes are recognized. The renderer is called
+    with the hass instance and the render variables, and returns the
+    value Jinja would output or _NO_FAST_PATH to fall back to Jinja.
+    """
+    match = _RE_FAST_STATES.match(template)
+    if match:
+        entity_id = match.group("entity_id")
+
+        def render_states(hass, variables):
+            if "states" in variables:
+                return _NO_FAST_PATH
+            state = _get_state(hass, entity_id)
+            return STATE_UNKNOWN if state is None else state.state
+
+        return render_states
+
+    match = _RE_FAST_IS_STATE.match(template)
+    if match:
+        entity_id, state = match.group("entity_id", "state")
+
+        def render_is_state(hass, variables):
+            if "is_state" in variables:
+                return _NO_FAST_PATH
+            return is_state(hass, entity_id, state)
+
+        return render_is_state
+
+    match = _RE_FAST_STATE_ATTR.match(template)
+    if match:
+        entity_id, name = match.group("entity_id", "name")
+
+        def render_state_attr(hass, variables):
+            if "state_attr" in variables:
+                return _NO_FAST_PATH
+            return state_attr(hass, entity_id, name)
+
+        return render_state_attr
+
+    match = _RE_FAST_VALUE.match(template)
+    if match:
+        var_name = match.group("name")
+        path = match.group("path").split(".")[1:]
+        # Jinja looks up dict attributes before keys
+        if any(hasattr(dict, key) for key in path):
+            return None
+
+        def render_value(hass, variables):
+            value = variables.get(var_name, _NO_FAST_PATH)
+            for key in path:
+                if type(value) is not dict or key not in value:
+                    return _NO_FAST_PATH
+                value = value[key]
+            return value
+
+        return render_value
+
+    return None
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -212,6 +349,7 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._fast_render: Optional[Callable] = None
         self.hass = hass
 
     @property
@@ -259,6 +397,11 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        if self._fast_render is not None:
+            result = self._fast_render(self.hass, kwargs)
+            if result is not _NO_FAST_PATH:
+                return str(result).strip()
+
         try:
             return compiled.render(kwargs).strip()
         except jinja2.TemplateError as err:
@@ -317,6 +460,11 @@ class Template:
         except (ValueError, TypeError):
             pass
 
+        if self._fast_render is not None:
+            result = self._fast_render(self.hass, variables)
+            if result is not _NO_FAST_PATH:
+                return str(result).strip()
+
         try:
             return self._compiled.render(variables).strip()
         except jinja2.TemplateError as ex:
@@ -337,9 +485,14 @@ class Template:
 
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        # Templates with the same source share the bound jinja2 template
+        compiled = env.template_cache.get(self.template)
+        if compiled is None:
+            compiled = env.template_cache[self.template] = jinja2.Template.from_code(
+                env, self._compiled_code, env.globals, None
+            )
+        self._compiled = compiled
+        self._fast_render = _analyze_simple_template(self.template)
 
         return self._compiled
 
@@ -400,7 +553,7 @@ class AllStates:
     def __len__(self) -> int:
         """Return number of states."""
         self._collect_all()
-        return len(self._hass.states.async_entity_ids())
+        return self._hass.states.async_entity_ids_count()
 
     def __call__(self, entity_id):
         """Return the states."""
@@ -439,8 +592,7 @@ class DomainStates:
             sorted(
                 (
                     _wrap_state(self._hass, state)
-                    for state in self._hass.states.async_all()
-                    if state.domain == self._domain
+                    for state in self._hass.states.async_all(self._domain)
                 ),
                 key=lambda state: state.entity_id,
             )
@@ -449,7 +601,7 @@ class DomainStates:
     def __len__(self) -> int:
         """Return number of states."""
         self._collect_domain()
-        return len(self._hass.states.async_entity_ids(self._domain))
+        return self._hass.states.async_entity_ids_count(self._domain)
 
     def __repr__(self) -> str:
         """Representation of Domain States."""
@@ -1019,6 +1171,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         super().__init__()
         self.hass = hass
         self.template_cache = weakref.WeakValueDictionary()
+        # The hass functions add filters, so the compiled code differs
+        self._code_cache_key = hass is not None
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1116,10 +1270,12 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
+        key = (self._code_cache_key, source)
+        cached = _COMPILED_CODE_CACHE.get(key)
 
         if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = super().compile(source)
+            _COMPILED_CODE_CACHE.set(key, cached)
 
         return cached
 
@@ -11,12 +11,14 @@ import json
 import logging
 import pathlib
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -25,12 +27,15 @@ from typing import (
     cast,
 )
 
+from homeassistant.const import __version__
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.generated.ssdp import SSDP
 from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
 
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
 
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)  # pylint: disable=invalid-name
 
@@ -39,6 +44,11 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_IMPORT_TIMINGS = "integration_import_timings"
+DATA_MANIFEST_INDEX = "integration_manifest_index"
+MANIFEST_INDEX_STORAGE_KEY = "core.manifest_index"
+MANIFEST_INDEX_STORAGE_VERSION = 1
+MANIFEST_INDEX_SAVE_DELAY = 10
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -62,6 +72,93 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     }
 
 
+class ManifestIndex:
+    """Index of parsed manifests persisted between restarts.
+
+    Manifests of built-in integrations only change with the Home Assistant
+    version, so they are trusted without touching the disk unless running
+    a development version. Other manifests are used while the modification
+    time of their manifest.json is unchanged.
+    """
+
+    def __init__(self, store: "Store", data: Optional[Dict]) -> None:
+        """Initialize the index."""
+        self._store = store
+        self._trust_built_in = "dev" not in __version__
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if data is not None and data.get("ha_version") == __version__:
+            self._manifests = data["manifests"]
+
+    def get(self, manifest_path: pathlib.Path, built_in: bool) -> Optional[Dict]:
+        """Return a copy of the indexed manifest if it is still current."""
+        entry = self._manifests.get(str(manifest_path))
+        if entry is None:
+            return None
+
+        if not (built_in and self._trust_built_in):
+            try:
+                mtime = manifest_path.stat().st_mtime
+            except OSError:
+                return None
+            if mtime != entry["mtime"]:
+                return None
+
+        return dict(entry["manifest"])
+
+    def set(self, manifest_path: pathlib.Path, mtime: float, manifest: Dict) -> None:
+        """Index a manifest read from disk."""
+        self._manifests[str(manifest_path)] = {
+            "mtime": mtime,
+            "manifest": dict(manifest),
+        }
+        self._dirty = True
+
+    def async_schedule_save(self) -> None:
+        """Save the index if manifests were read from disk."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._store.async_delay_save(self._data_to_save, MANIFEST_INDEX_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict:
+        """Return the data of the index to store."""
+        # Copy as manifests are indexed from executor threads
+        return {"ha_version": __version__, "manifests": dict(self._manifests)}
+
+
+async def async_get_manifest_index(hass: "HomeAssistant") -> ManifestIndex:
+    """Return the manifest index, loading it with a single read."""
+    index_or_evt = hass.data.get(DATA_MANIFEST_INDEX)
+
+    if isinstance(index_or_evt, asyncio.Event):
+        await index_or_evt.wait()
+        index_or_evt = hass.data[DATA_MANIFEST_INDEX]
+
+    if index_or_evt is not None:
+        return cast(ManifestIndex, index_or_evt)
+
+    evt = hass.data[DATA_MANIFEST_INDEX] = asyncio.Event()
+
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import Store
+
+    store = Store(
+        hass, MANIFEST_INDEX_STORAGE_VERSION, MANIFEST_INDEX_STORAGE_KEY, private=True
+    )
+    try:
+        data = await store.async_load()
+    except HomeAssistantError as err:
+        _LOGGER.debug("Unable to load the manifest index: %s", err)
+        data = None
+
+    index = hass.data[DATA_MANIFEST_INDEX] = ManifestIndex(
+        store, cast(Optional[Dict], data)
+    )
+    evt.set()
+    return index
+
+
 async def _async_get_custom_components(
     hass: "HomeAssistant",
 ) -> Dict[str, "Integration"]:
@@ -87,14 +184,20 @@ async def _async_get_custom_components(
         get_sub_directories, custom_components.__path__
     )
 
+    manifest_index = await async_get_manifest_index(hass)
     integrations = await asyncio.gather(
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root,
+                hass,
+                custom_components,
+                comp.name,
+                manifest_index,
             )
             for comp in dirs
         )
     )
+    manifest_index.async_schedule_save()
 
     return {
         integration.domain: integration
@@ -200,16 +303,34 @@ class Integration:
 
     @classmethod
     def resolve_from_root(
-        cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
+        cls,
+        hass: "HomeAssistant",
+        root_module: ModuleType,
+        domain: str,
+        manifest_index: Optional[ManifestIndex] = None,
     ) -> "Optional[Integration]":
         """Resolve an integration from a root module."""
+        built_in = root_module.__name__ == PACKAGE_BUILTIN
         for base in root_module.__path__:  # type: ignore
             manifest_path = pathlib.Path(base) / domain / "manifest.json"
 
+            manifest = None
+            if manifest_index is not None:
+                manifest = manifest_index.get(manifest_path, built_in)
+
+            if manifest is not None:
+                return cls(
+                    hass,
+                    f"{root_module.__name__}.{domain}",
+                    manifest_path.parent,
+                    manifest,
+                )
+
             if not manifest_path.is_file():
                 continue
 
             try:
+                mtime = manifest_path.stat().st_mtime
                 manifest = json.loads(manifest_path.read_text())
             except ValueError as err:
                 _LOGGER.error(
@@ -217,6 +338,9 @@ class Integration:
                 )
                 continue
 
+            if manifest_index is not None:
+                manifest_index.set(manifest_path, mtime, manifest)
+
             return cls(
                 hass, f"{root_module.__name__}.{domain}", manifest_path.parent, manifest
             )
@@ -391,6 +515,25 @@ class Integration:
             )
         return cache[full_name]  # type: ignore
 
+    def preload(self, platform_names: Iterable[str] = ()) -> None:
+        """Import the component and platforms into the module cache.
+
+        Import errors are left for setup to report. This method is safe
+        to run in an executor thread.
+        """
+        start = timer()
+        try:
+            self.get_component()
+            for platform_name in platform_names:
+                self.get_platform(platform_name)
+        except ImportError as err:
+            _LOGGER.debug("Unable to preload %s: %s", self.domain, err)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Error preloading %s", self.domain, exc_info=True)
+        self.hass.data.setdefault(DATA_IMPORT_TIMINGS, {})[self.domain] = (
+            timer() - start
+        )
+
     def __repr__(self) -> str:
         """Text representation of class."""
         return f"<Integration {self.domain}: {self.pkg_path}>"
@@ -432,9 +575,11 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
+    manifest_index = await async_get_manifest_index(hass)
     integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
+        Integration.resolve_from_root, hass, components, domain, manifest_index
     )
+    manifest_index.async_schedule_save()
 
     if integration is not None:
         cache[domain] = integration
@@ -456,6 +601,47 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
     return integration
 
 
+async def async_preload_integrations(
+    hass: "HomeAssistant",
+    integrations: Iterable[Integration],
+    platforms: Optional[Dict[str, Set[str]]] = None,
+) -> None:
+    """Import integrations in executor threads, dependencies first.
+
+    platforms maps a domain to the names of the platforms to import with
+    the component. Integrations whose dependencies are imported run in
+    parallel.
+    """
+    platforms = platforms or {}
+    remaining = {itg.domain: itg for itg in integrations}
+
+    while remaining:
+        batch = [
+            itg
+            for itg in remaining.values()
+            # pylint: disable=protected-access
+            if not (itg._all_dependencies or set()) & remaining.keys()
+        ]
+        if not batch:
+            # Circular dependencies, import what is left at once
+            batch = list(remaining.values())
+
+        await asyncio.gather(
+            *(
+                hass.async_add_executor_job(itg.preload, platforms.get(itg.domain, ()))
+                for itg in batch
+            )
+        )
+
+        for itg in batch:
+            remaining.pop(itg.domain)
+
+
+def async_get_import_timings(hass: "HomeAssistant") -> Dict[str, float]:
+    """Return the seconds spent importing each preloaded integration."""
+    return dict(hass.data.get(DATA_IMPORT_TIMINGS, {}))
+
+
 class LoaderError(Exception):
     """Loader base error."""
 
@@ -3,15 +3,23 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
+import os
+import tempfile
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_LOGBOOK_ENTRY,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
@@ -85,6 +93,334 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_500_listeners(hass):
+    """Fire 10k events to 500 listeners."""
+    count = 0
+    events = 10 ** 4
+    listeners = 500
+    event_name = "benchmark_event"
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == events * listeners:
+            event.set()
+
+    for _ in range(listeners):
+        hass.bus.async_listen(event_name, listener)
+
+    start = timer()
+
+    for _ in range(events):
+        hass.bus.async_fire(event_name)
+
+    await event.wait()
+
+    runtime = timer() - start
+    print(f"{events / runtime:.0f} events/s")
+
+    return runtime
+
+
+@benchmark
+async def fire_events_filtered_listener(hass):
+    """Fire 100k events to a listener filtering out all but the last."""
+    events = 10 ** 5
+    event_name = "benchmark_event"
+    event = asyncio.Event()
+
+    @core.callback
+    def event_filter(evt):
+        """Only accept the last event."""
+        return evt.data.get("last", False)
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        event.set()
+
+    hass.bus.async_listen(event_name, listener, event_filter=event_filter)
+
+    start = timer()
+
+    for _ in range(events - 1):
+        hass.bus.async_fire(event_name)
+
+    hass.bus.async_fire(event_name, {"last": True})
+
+    await event.wait()
+
+    runtime = timer() - start
+    print(f"{events / runtime:.0f} events/s")
+
+    return runtime
+
+
+@benchmark
+async def state_machine_domain_filter(hass):
+    """Look up a small domain among 4,000 states 10k times."""
+    lookups = 10 ** 4
+
+    for idx in range(4000):
+        hass.states.async_set(f"sensor.benchmark_{idx}", "on")
+    for idx in range(10):
+        hass.states.async_set(f"light.benchmark_{idx}", "on")
+
+    start = timer()
+
+    for _ in range(lookups):
+        hass.states.async_all("light")
+        hass.states.async_entity_ids_count("light")
+
+    return timer() - start
+
+
+@benchmark
+async def template_compile(hass):
+    """Validate 10k templates sharing 100 sources."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    sources = [
+        f"{{{{ states('sensor.benchmark_{idx}') | float * 2 }}}}" for idx in range(100)
+    ]
+
+    start = timer()
+
+    for idx in range(10 ** 4):
+        template.Template(sources[idx % 100], hass).ensure_valid()
+
+    runtime = timer() - start
+    print(template.compiled_code_cache_info())
+
+    return runtime
+
+
+@benchmark
+async def template_render_fast_path(hass):
+    """Render a simple template 100k times with and without Jinja."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    renders = 10 ** 5
+    hass.states.async_set("sensor.benchmark", "on")
+    tpl = template.Template("{{ states('sensor.benchmark') }}", hass)
+    tpl.async_render()
+    # pylint: disable=protected-access
+    compiled = tpl._compiled
+
+    start = timer()
+    for _ in range(renders):
+        compiled.render({}).strip()
+    jinja_runtime = timer() - start
+    print(f"jinja: {renders / jinja_runtime:.0f} renders/s")
+
+    start = timer()
+    for _ in range(renders):
+        tpl.async_render()
+    runtime = timer() - start
+    print(f"fast path: {renders / runtime:.0f} renders/s")
+
+    return runtime
+
+
+@benchmark
+async def preload_integrations(hass):
+    """Import 100 integrations off the event loop like bootstrap does."""
+    # pylint: disable=import-outside-toplevel
+    import pkgutil
+
+    from homeassistant import components, loader
+
+    domains = sorted(
+        name for _, name, is_pkg in pkgutil.iter_modules(components.__path__) if is_pkg
+    )
+    integrations = []
+    for domain in domains:
+        integration = await loader.async_get_integration(hass, domain)
+        if integration.requirements:
+            continue
+        await integration.resolve_dependencies()
+        integrations.append(integration)
+        if len(integrations) == 100:
+            break
+
+    max_stall = 0.0
+    done = False
+
+    async def measure_stall():
+        """Measure how long the event loop is blocked."""
+        nonlocal max_stall
+        while not done:
+            before = timer()
+            await asyncio.sleep(0)
+            max_stall = max(max_stall, timer() - before)
+
+    stall_task = hass.async_create_task(measure_stall())
+
+    start = timer()
+    await loader.async_preload_integrations(hass, integrations)
+    runtime = timer() - start
+
+    done = True
+    await stall_task
+    timings = loader.async_get_import_timings(hass)
+    slowest = max(timings, key=timings.get)
+    print(f"Longest event loop stall: {max_stall * 1000:.1f}ms")
+    print(f"Slowest import: {slowest} {timings[slowest] * 1000:.1f}ms")
+
+    return runtime
+
+
+@benchmark
+async def yaml_config_cache(hass):
+    """Load a configuration of 100 included files with a warm YAML cache."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.util import yaml as yaml_util
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.mkdir(os.path.join(config_dir, "automations"))
+        for idx in range(100):
+            with open(
+                os.path.join(config_dir, "automations", f"{idx}.yaml"), "w"
+            ) as fil:
+                fil.write(
+                    "".join(
+                        f"- alias: automation_{idx}_{num}\n"
+                        "  trigger:\n"
+                        "    platform: state\n"
+                        f"    entity_id: sensor.sensor_{num}\n"
+                        "  action:\n"
+                        "    service: light.turn_on\n"
+                        "    data:\n"
+                        "      entity_id: light.kitchen\n"
+                        "      brightness: 255\n"
+                        for num in range(10)
+                    )
+                )
+        config_path = os.path.join(config_dir, "configuration.yaml")
+        with open(config_path, "w") as fil:
+            fil.write("automation: !include_dir_merge_list automations\n")
+
+        start = timer()
+        yaml_util.load_yaml(config_path)
+        parse_time = timer() - start
+
+        yaml_cache = yaml_util.YamlCache()
+        with yaml_util.use_cache(yaml_cache):
+            yaml_util.load_yaml(config_path)
+        # Reload like a restart does, with the cache read from storage
+        yaml_cache = yaml_util.YamlCache(json.loads(json.dumps(yaml_cache.entries)))
+
+        start = timer()
+        with yaml_util.use_cache(yaml_cache):
+            yaml_util.load_yaml(config_path)
+        runtime = timer() - start
+
+    print(f"Parsing without cache: {parse_time * 1000:.1f}ms")
+    return runtime
+
+
+@benchmark
+async def area_targeted_service_call(hass):
+    """Call light.turn_on 1000 times by area with 6000 registered entities."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from collections import OrderedDict
+
+    from homeassistant.helpers import device_registry, entity_registry, service
+
+    dev_reg = device_registry.DeviceRegistry(hass)
+    dev_reg.devices = OrderedDict()
+    dev_reg.deleted_devices = OrderedDict()
+    dev_reg._rebuild_index()
+    ent_reg = entity_registry.EntityRegistry(hass)
+    ent_reg.entities = OrderedDict()
+    ent_reg._rebuild_index()
+    hass.data[device_registry.DATA_REGISTRY] = dev_reg
+    hass.data[entity_registry.DATA_REGISTRY] = ent_reg
+
+    # 600 devices in 30 areas with 10 entities each
+    for device_num in range(600):
+        device = device_registry.DeviceEntry(area_id=f"area_{device_num % 30}")
+        dev_reg._add_device(device)
+        for entity_num in range(10):
+            ent_reg._register_entry(
+                entity_registry.RegistryEntry(
+                    entity_id=f"light.light_{device_num}_{entity_num}",
+                    unique_id=f"{device_num}_{entity_num}",
+                    platform="benchmark",
+                    device_id=device.id,
+                )
+            )
+
+    count = 0
+
+    async def turn_on(call):
+        """Handle the service call."""
+        nonlocal count
+        count += len(await service.async_extract_entity_ids(hass, call))
+
+    hass.services.async_register("light", "turn_on", turn_on)
+
+    start = timer()
+
+    for num in range(1000):
+        await hass.services.async_call(
+            "light", "turn_on", {"area_id": f"area_{num % 30}"}, blocking=True
+        )
+
+    runtime = timer() - start
+    assert count == 1000 * 200
+    return runtime
+
+
+@benchmark
+async def restore_state_dump(hass):
+    """Dump 5000 restorable states of which 10% changed since the last dump."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from homeassistant.helpers.restore_state import (
+        STORAGE_KEY,
+        STORAGE_VERSION,
+        RestoreStateStore,
+        StoredState,
+    )
+
+    store = RestoreStateStore(hass)
+    now = dt_util.utcnow()
+    attributes = {
+        "friendly_name": "Sensor",
+        "unit_of_measurement": "W",
+        "icon": "mdi:flash",
+    }
+    stored_states = [
+        StoredState(core.State(f"sensor.sensor_{idx}", "100", attributes), now)
+        for idx in range(5000)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, STORAGE_KEY)
+        data = {"version": STORAGE_VERSION, "key": STORAGE_KEY, "data": stored_states}
+        await hass.async_add_executor_job(store._write_json, path, data)
+        print(f"Full dump: {store.dump_stats['duration'] * 1000:.1f}ms")
+
+        for idx in range(0, 5000, 10):
+            stored_states[idx] = StoredState(
+                core.State(f"sensor.sensor_{idx}", "200", attributes), now
+            )
+
+        start = timer()
+        await hass.async_add_executor_job(store._write_json, path, data)
+        runtime = timer() - start
+
+    assert store.dump_stats["encoded"] == 500
+    return runtime
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -323,6 +659,494 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def websocket_event_fan_out(hass):
+    """Forward 10k state changes to websocket subscribers per number of clients."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api import messages
+
+    old_state = core.State("light.kitchen", "off", {"friendly_name": "Kitchen"})
+    new_state = core.State("light.kitchen", "on", {"friendly_name": "Kitchen"})
+    event_data = {
+        "entity_id": "light.kitchen",
+        "old_state": old_state,
+        "new_state": new_state,
+    }
+    count = 10 ** 4
+
+    runtime = 0
+    for clients in (1, 5, 15, 50):
+        events = [core.Event(EVENT_STATE_CHANGED, event_data) for _ in range(count)]
+        start = timer()
+        for event in events:
+            for iden in range(clients):
+                JSON_DUMP(messages.event_message(iden, event))
+        per_client = (timer() - start) / count
+
+        start = timer()
+        for event in events:
+            for iden in range(clients):
+                messages.cached_event_message(iden, event)
+        runtime = timer() - start
+        print(
+            f"{clients} clients: {per_client * 10 ** 6:.1f}us per event "
+            f"serialized per client, {runtime / count * 10 ** 6:.1f}us shared"
+        )
+
+    return runtime
+
+
+@benchmark
+async def mqtt_topic_matching(hass):
+    """Match 100k MQTT messages against up to 5000 subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt import Subscription, SubscriptionIndex
+
+    runtime = 0
+    for count in (100, 1000, 2000, 5000):
+        index = SubscriptionIndex()
+        for idx in range(count):
+            # Mix of zigbee2mqtt style exact topics and Tasmota style wildcards
+            if idx % 4:
+                topic = f"zigbee2mqtt/device_{idx}"
+            else:
+                topic = f"tasmota/device_{idx}/+/STATE"
+            index.add(Subscription(topic, None))
+
+        messages = 10 ** 5
+        start = timer()
+        for idx in range(messages):
+            index.match(f"zigbee2mqtt/device_{idx % count}")
+            index.match(f"tasmota/device_{idx % count}/tele/STATE")
+        runtime = timer() - start
+        print(f"{count} subscriptions: {2 * messages / runtime:.0f} messages/s")
+
+    return runtime
+
+
+@benchmark
+async def mqtt_subscribe_startup(hass):
+    """Subscribe 2000 MQTT entities against a broker with 5ms round-trips."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant import config_entries
+    from homeassistant.components import mqtt
+
+    round_trip = 0.005
+    topics = 2000
+
+    conf = mqtt.CONFIG_SCHEMA({mqtt.DOMAIN: {mqtt.CONF_BROKER: "localhost"}})[
+        mqtt.DOMAIN
+    ]
+    entry = config_entries.ConfigEntry(
+        1, mqtt.DOMAIN, "localhost", conf, "user", "local_push", {}
+    )
+    client = mqtt.MQTT(hass, entry, conf)
+
+    class StandInBroker:
+        """Acknowledge subscription packets after a network round-trip."""
+
+        def __init__(self):
+            """Initialize the broker."""
+            self.packets = 0
+
+        def _packet(self):
+            """Acknowledge a packet."""
+            self.packets += 1
+            mid = self.packets
+            hass.loop.call_soon_threadsafe(
+                hass.loop.call_later,
+                round_trip,
+                client._mqtt_on_callback,
+                None,
+                None,
+                mid,
+            )
+            return 0, mid
+
+        def subscribe(self, topic, qos=0):
+            """Subscribe to one or more topics."""
+            return self._packet()
+
+        def unsubscribe(self, topic):
+            """Unsubscribe from one or more topics."""
+            return self._packet()
+
+    broker = StandInBroker()
+    client._mqttc = broker
+    client.connected = True
+
+    @core.callback
+    def message_received(msg):
+        """Handle a message."""
+
+    start = timer()
+    await asyncio.gather(
+        *(
+            client.async_subscribe(
+                f"zigbee2mqtt/device_{idx}", message_received, idx % 2
+            )
+            for idx in range(topics)
+        )
+    )
+    runtime = timer() - start
+    print(
+        f"{topics} subscriptions in {broker.packets} packets, "
+        f"one round-trip per topic would take {topics * round_trip:.1f}s"
+    )
+
+    return runtime
+
+
+@benchmark
+async def recorder_write_states(hass):
+    """Write 100k state changes through the recorder into an in-memory SQLite."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=10,
+        commit_interval=1,
+        max_batch_size=recorder.DEFAULT_MAX_BATCH_SIZE,
+        short_term_statistics=False,
+        statistics_keep_days=365,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+    )
+    hass.data[recorder.DATA_INSTANCE] = instance
+    hass.state = core.CoreState.running
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    entity_ids = [f"sensor.power_{idx}" for idx in range(100)]
+    old_states = {entity_id: None for entity_id in entity_ids}
+
+    start = timer()
+
+    for idx in range(10 ** 5):
+        entity_id = entity_ids[idx % 100]
+        new_state = core.State(entity_id, str(idx), {"unit_of_measurement": "W"})
+        hass.bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": entity_id,
+                "old_state": old_states[entity_id],
+                "new_state": new_state,
+            },
+        )
+        old_states[entity_id] = new_state
+
+    await hass.async_block_till_done()
+    instance.queue.put(None)
+    await hass.async_add_executor_job(instance.join)
+
+    return timer() - start
+
+
+@benchmark
+async def recorder_purge(hass):
+    """Purge 2 million old states from a SQLite database while recording."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import purge
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=10,
+        commit_interval=1,
+        max_batch_size=recorder.DEFAULT_MAX_BATCH_SIZE,
+        short_term_statistics=False,
+        statistics_keep_days=365,
+        uri=f"sqlite:///{os.path.join(tmp_dir.name, 'benchmark.db')}",
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+    )
+    hass.data[recorder.DATA_INSTANCE] = instance
+    hass.state = core.CoreState.running
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    await hass.async_add_executor_job(
+        _insert_synthetic_states,
+        instance,
+        2 * 10 ** 6,
+        dt_util.utcnow() - timedelta(days=20),
+    )
+
+    # The recorder thread can't write while a purge batch runs
+    # so the longest batch is the longest write stall
+    purge_old_data = purge.purge_old_data
+    batch_runtimes = []
+    purge_done = asyncio.Event()
+
+    def _timed_purge_old_data(*args):
+        """Time a single purge batch."""
+        batch_start = timer()
+        finished = purge_old_data(*args)
+        batch_runtimes.append(timer() - batch_start)
+        if finished:
+            hass.loop.call_soon_threadsafe(purge_done.set)
+        return finished
+
+    purge.purge_old_data = _timed_purge_old_data
+
+    start = timer()
+
+    try:
+        instance.do_adhoc_purge()
+        idx = 0
+        while not purge_done.is_set():
+            hass.states.async_set(f"sensor.live_{idx % 100}", str(idx))
+            idx += 1
+            await asyncio.sleep(0.01)
+        runtime = timer() - start
+    finally:
+        purge.purge_old_data = purge_old_data
+
+    print(
+        f"Purged in {len(batch_runtimes)} batches, "
+        f"max write stall {max(batch_runtimes):.3f}s"
+    )
+
+    instance.queue.put(None)
+    await hass.async_add_executor_job(instance.join)
+    tmp_dir.cleanup()
+
+    return runtime
+
+
+@benchmark
+async def history_stream(hass):
+    """Stream the history of 500k states from a SQLite database."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from sqlalchemy.ext import baked
+
+    from homeassistant.components import history, recorder
+    from homeassistant.components.recorder.util import session_scope
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=10,
+        commit_interval=1,
+        max_batch_size=recorder.DEFAULT_MAX_BATCH_SIZE,
+        short_term_statistics=False,
+        statistics_keep_days=365,
+        uri=f"sqlite:///{os.path.join(tmp_dir.name, 'benchmark.db')}",
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+    )
+    hass.data[recorder.DATA_INSTANCE] = instance
+    hass.data[history.HISTORY_BAKERY] = baked.bakery()
+    hass.state = core.CoreState.running
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    start_time = dt_util.utcnow() - timedelta(days=7)
+    await hass.async_add_executor_job(
+        _insert_synthetic_states, instance, 5 * 10 ** 5, start_time
+    )
+
+    def _read_history(stream):
+        """Read the history, return the time to first byte and peak memory."""
+        tracemalloc.start()
+        first_byte = None
+        read_start = timer()
+        with session_scope(hass=hass) as session:
+            if stream:
+                for _ in history._stream_significant_states_json(
+                    hass, session, start_time
+                ):
+                    if first_byte is None:
+                        first_byte = timer() - read_start
+            else:
+                JSON_DUMP(
+                    list(
+                        history._get_significant_states(
+                            hass, session, start_time
+                        ).values()
+                    )
+                )
+                first_byte = timer() - read_start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return first_byte, peak
+
+    first_byte, peak = await hass.async_add_executor_job(_read_history, False)
+    print(f"Complete: first byte {first_byte:.3f}s, peak memory {peak >> 20}MiB")
+
+    start = timer()
+    first_byte, peak = await hass.async_add_executor_job(_read_history, True)
+    runtime = timer() - start
+    print(f"Streaming: first byte {first_byte:.3f}s, peak memory {peak >> 20}MiB")
+
+    instance.queue.put(None)
+    await hass.async_add_executor_job(instance.join)
+    tmp_dir.cleanup()
+
+    return runtime
+
+
+@benchmark
+async def logbook_query(hass):
+    """Query the logbook of a day with 500k light state changes."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import logbook, recorder
+    from homeassistant.components.recorder.models import (
+        Events,
+        StateAttributes,
+        States,
+    )
+    from homeassistant.components.recorder.util import session_scope
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=10,
+        commit_interval=1,
+        max_batch_size=recorder.DEFAULT_MAX_BATCH_SIZE,
+        short_term_statistics=False,
+        statistics_keep_days=365,
+        uri=f"sqlite:///{os.path.join(tmp_dir.name, 'benchmark.db')}",
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+    )
+    hass.data[recorder.DATA_INSTANCE] = instance
+    hass.data[logbook.DOMAIN] = {}
+    hass.state = core.CoreState.running
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    count = 5 * 10 ** 5
+    start_time = dt_util.utcnow() - timedelta(days=1)
+
+    def _insert_light_states():
+        """Insert alternating states of 100 lights sharing their attributes."""
+        instance.engine.execute(
+            StateAttributes.__table__.insert(),
+            [
+                {
+                    "attributes_id": idx + 1,
+                    "hash": idx,
+                    "shared_attrs": json.dumps(
+                        {"friendly_name": f"Light {idx}", "brightness": 255}
+                    ),
+                }
+                for idx in range(100)
+            ],
+        )
+        for chunk_start in range(0, count, 10 ** 5):
+            chunk = range(chunk_start, min(chunk_start + 10 ** 5, count))
+            instance.engine.execute(
+                States.__table__.insert(),
+                [
+                    {
+                        "state_id": idx + 1,
+                        "entity_id": f"light.light_{idx % 100}",
+                        "domain": "light",
+                        "state": "on" if idx // 100 % 2 else "off",
+                        "attributes_id": idx % 100 + 1,
+                        "old_state_id": idx - 99 if idx >= 100 else None,
+                        "last_changed": start_time + timedelta(seconds=idx / 6),
+                        "last_updated": start_time + timedelta(seconds=idx / 6),
+                        "created": start_time + timedelta(seconds=idx / 6),
+                    }
+                    for idx in chunk
+                ],
+            )
+            instance.engine.execute(
+                Events.__table__.insert(),
+                [
+                    {
+                        "event_type": EVENT_LOGBOOK_ENTRY,
+                        "event_data": json.dumps(
+                            {
+                                "name": "Light",
+                                "message": "was toggled",
+                                "entity_id": f"light.light_{idx % 100}",
+                            }
+                        ),
+                        "origin": "LOCAL",
+                        "time_fired": start_time + timedelta(seconds=idx / 6),
+                        "created": start_time + timedelta(seconds=idx / 6),
+                    }
+                    for idx in chunk[::100]
+                ],
+            )
+
+    await hass.async_add_executor_job(_insert_light_states)
+
+    def _query_logbook(entity_id=None):
+        """Humanify the logbook of the synthetic day."""
+        with session_scope(hass=hass) as session:
+            return sum(
+                1
+                for _ in logbook._humanify_events(
+                    hass,
+                    session,
+                    start_time,
+                    start_time + timedelta(days=1),
+                    entity_id,
+                )
+            )
+
+    start = timer()
+    entries = await hass.async_add_executor_job(_query_logbook)
+    runtime = timer() - start
+    print(f"All entities: {entries} entries in {runtime:.3f}s")
+
+    entity_start = timer()
+    entries = await hass.async_add_executor_job(_query_logbook, "light.light_0")
+    print(f"Single entity: {entries} entries in {timer() - entity_start:.3f}s")
+
+    instance.queue.put(None)
+    await hass.async_add_executor_job(instance.join)
+    tmp_dir.cleanup()
+
+    return runtime
+
+
+def _insert_synthetic_states(instance, count, start_time):
+    """Insert states of 100 sensors in chunks of 100k rows."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.models import States
+
+    for chunk_start in range(0, count, 10 ** 5):
+        instance.engine.execute(
+            States.__table__.insert(),
+            [
+                {
+                    "entity_id": f"sensor.power_{idx % 100}",
+                    "domain": "sensor",
+                    "state": str(idx),
+                    "attributes": "{}",
+                    "last_changed": start_time + timedelta(seconds=idx),
+                    "last_updated": start_time + timedelta(seconds=idx),
+                    "created": start_time + timedelta(seconds=idx),
+                }
+                for idx in range(chunk_start, min(chunk_start + 10 ** 5, count))
+            ],
+        )
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
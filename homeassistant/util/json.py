@@ -60,6 +60,14 @@ def save_json(
         _LOGGER.error(msg)
         raise SerializationError(msg)
 
+    write_json_data(filename, json_data, private)
+
+
+def write_json_data(filename: str, json_data: str, private: bool = False) -> None:
+    """Write already encoded JSON data to a file.
+
+    The data is written to a temporary file that replaces the file when done.
+    """
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
@@ -1,7 +1,7 @@
 """YAML utility functions."""
 from .const import _SECRET_NAMESPACE, SECRET_YAML
 from .dumper import dump, save_yaml
-from .loader import clear_secret_cache, load_yaml, secret_yaml
+from .loader import YamlCache, clear_secret_cache, load_yaml, secret_yaml, use_cache
 
 __all__ = [
     "SECRET_YAML",
@@ -11,4 +11,6 @@ __all__ = [
     "clear_secret_cache",
     "load_yaml",
     "secret_yaml",
+    "use_cache",
+    "YamlCache",
 ]
@@ -1,10 +1,24 @@
 """Custom loader."""
 from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
 import fnmatch
 import logging
 import os
 import sys
-from typing import Dict, Iterator, List, TypeVar, Union, overload
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import yaml
 
@@ -23,6 +37,11 @@ try:
 except ImportError:
     credstash = None
 
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    CSafeLoader = None
+
 
 # mypy: allow-untyped-calls, no-warn-return-any
 
@@ -31,6 +50,7 @@ DICT_T = TypeVar("DICT_T", bound=Dict)  # pylint: disable=invalid-name
 
 _LOGGER = logging.getLogger(__name__)
 __SECRET_CACHE: Dict[str, JSON_TYPE] = {}
+_TRACKING = threading.local()
 
 
 def clear_secret_cache() -> None:
@@ -52,13 +72,306 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+if CSafeLoader is not None:
+
+    class FastSafeLoader(CSafeLoader):  # type: ignore
+        """Loader class using libyaml.
+
+        The C parser does not expose the stream, it is kept for the
+        constructors. Line numbers are taken from the node marks.
+        """
+
+        def __init__(self, stream: Any) -> None:
+            """Initialize the loader."""
+            super().__init__(stream)
+            self.stream = stream
+            self.name = getattr(stream, "name", "<file>")
+
+
+else:
+    FastSafeLoader = SafeLineLoader  # type: ignore
+
+
+class YamlCache:
+    """Cache of parsed YAML files.
+
+    An entry stores the parsed content of a file together with what it was
+    built from: the modification time and size of every file read for it,
+    including included files, the listings of included directories and the
+    environment variables used. An entry is only used while all of those are
+    unchanged. Entries are JSON serializable and keep the file and line
+    references of the parsed objects. Secrets are stored by name only and
+    resolved each time a file is loaded.
+
+    The cache is shared by the executor threads loading the configuration.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict]] = None) -> None:
+        """Initialize the cache."""
+        self.entries: Dict[str, Dict] = dict(entries or {})
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, fname: str) -> Optional[Dict]:
+        """Return the entry of a file if it is still current."""
+        with self._lock:
+            entry = self.entries.get(fname)
+        # Checking the files is done without holding the lock
+        if entry is None or not _dependencies_unchanged(entry["dependencies"]):
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def set(self, fname: str, entry: Dict) -> None:
+        """Store the entry of a file."""
+        with self._lock:
+            self.entries[fname] = entry
+            self.dirty = True
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Remove the entries of files that are no longer loaded.
+
+        Called after loading the whole configuration, which is the only
+        load that knows which files are still used.
+        """
+        keep = set(keep)
+        with self._lock:
+            for fname in [fname for fname in self.entries if fname not in keep]:
+                del self.entries[fname]
+                self.dirty = True
+
+    def pop_stats(self) -> Tuple[int, int, bool]:
+        """Return and reset the hits, misses and if entries changed."""
+        with self._lock:
+            stats = (self.hits, self.misses, self.dirty)
+            self.hits = self.misses = 0
+            self.dirty = False
+        return stats
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a copy of the entries to persist."""
+        with self._lock:
+            return {"entries": dict(self.entries)}
+
+
+class _LoadFrame:
+    """Dependencies collected while loading a file."""
+
+    def __init__(self) -> None:
+        """Initialize the frame."""
+        self.files: Dict[str, Optional[List[int]]] = {}
+        self.dirs: Dict[Tuple[str, str], List[str]] = {}
+        self.env: Dict[str, Optional[str]] = {}
+
+    def merge(self, other: "_LoadFrame") -> None:
+        """Add the dependencies of a file loaded while loading this one."""
+        self.files.update(other.files)
+        self.dirs.update(other.dirs)
+        self.env.update(other.env)
+
+    def merge_dependencies(self, dependencies: Dict) -> None:
+        """Add the dependencies of a cache entry."""
+        self.files.update(dependencies["files"])
+        for directory, pattern, files in dependencies["dirs"]:
+            self.dirs[(directory, pattern)] = files
+        self.env.update(dependencies["env"])
+
+    def as_dependencies(self) -> Dict:
+        """Return the dependencies in the format of a cache entry."""
+        return {
+            "files": dict(self.files),
+            "dirs": [
+                [directory, pattern, files]
+                for (directory, pattern), files in self.dirs.items()
+            ],
+            "env": dict(self.env),
+        }
+
+
+class _UncacheableValue(Exception):
+    """A loaded value can not be stored in the cache."""
+
+
+class _SecretReference:
+    """A secret used by a file loaded with a cache."""
+
+    def __init__(self, secret_path: str, name: str) -> None:
+        """Initialize the reference."""
+        self.secret_path = secret_path
+        self.name = name
+
+
+def _file_signature(fname: str) -> Optional[List[int]]:
+    """Return the modification time and size of a file."""
+    try:
+        stat = os.stat(fname)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _dependencies_unchanged(dependencies: Dict) -> bool:
+    """Return if the dependencies of a cache entry are unchanged."""
+    for fname, signature in dependencies["files"].items():
+        if _file_signature(fname) != signature:
+            return False
+    for directory, pattern, files in dependencies["dirs"]:
+        if _list_files(directory, pattern) != files:
+            return False
+    for name, value in dependencies["env"].items():
+        if os.environ.get(name) != value:
+            return False
+    return True
+
+
+def _current_frame() -> Optional[_LoadFrame]:
+    """Return the frame of the file being loaded with a cache."""
+    frames: Optional[List[_LoadFrame]] = getattr(_TRACKING, "frames", None)
+    return frames[-1] if frames else None
+
+
+def _encode(obj: Any) -> Any:
+    """Encode a loaded object as JSON serializable data."""
+    if obj is None or type(obj) in (
+        str,
+        int,
+        float,
+        bool,
+    ):  # pylint: disable=unidiomatic-typecheck
+        return obj
+    node: Dict[str, Any]
+    if isinstance(obj, dict):
+        node = {"map": [[_encode(key), _encode(value)] for key, value in obj.items()]}
+    elif isinstance(obj, list):
+        node = {"seq": [_encode(value) for value in obj]}
+    elif isinstance(obj, str):
+        node = {"str": str(obj)}
+    elif isinstance(obj, datetime):
+        node = {"datetime": obj.isoformat()}
+    elif isinstance(obj, date):
+        node = {"date": obj.isoformat()}
+    elif isinstance(obj, _SecretReference):
+        return {"secret": obj.name, "path": obj.secret_path}
+    else:
+        raise _UncacheableValue(type(obj).__name__)
+    if hasattr(obj, "__config_file__"):
+        node["file"] = getattr(obj, "__config_file__")
+        node["line"] = getattr(obj, "__line__")
+    return node
+
+
+def _decode(node: Any) -> Any:
+    """Decode an object encoded by _encode."""
+    if not isinstance(node, dict):
+        return node
+    obj: Any
+    if "map" in node:
+        obj = OrderedDict((_decode(key), _decode(value)) for key, value in node["map"])
+    elif "seq" in node:
+        obj = [_decode(value) for value in node["seq"]]
+    elif "str" in node:
+        obj = NodeStrClass(node["str"])
+    elif "datetime" in node:
+        return datetime.fromisoformat(node["datetime"])
+    elif "secret" in node:
+        return _SecretReference(node["path"], node["secret"])
+    else:
+        return date.fromisoformat(node["date"])
+    if "file" in node:
+        if isinstance(obj, list):
+            obj = NodeListClass(obj)
+        setattr(obj, "__config_file__", node["file"])
+        setattr(obj, "__line__", node["line"])
+    return obj
+
+
+@contextmanager
+def use_cache(cache: YamlCache) -> Iterator[Iterable[str]]:
+    """Use a cache for the files loaded by this thread within the context.
+
+    Yields the files loaded within the context, including those taken
+    from the cache, for pruning the cache once the loads are done.
+    """
+    root = _LoadFrame()
+    _TRACKING.cache = cache
+    _TRACKING.frames = [root]
+    try:
+        yield root.files.keys()
+    finally:
+        _TRACKING.cache = None
+        _TRACKING.frames = None
+
+
 def load_yaml(fname: str) -> JSON_TYPE:
     """Load a YAML file."""
+    cache: Optional[YamlCache] = getattr(_TRACKING, "cache", None)
+    if cache is None:
+        return _load_yaml(fname)
+
+    frames: List[_LoadFrame] = _TRACKING.frames
+    result = _load_yaml_cached(cache, frames, fname)
+    if len(frames) > 1:
+        return result
+    # Secrets are resolved once the file and all the files it includes
+    # are loaded so their values never end up in the cache
+    return _resolve_secrets(result)
+
+
+def _load_yaml_cached(
+    cache: YamlCache, frames: List[_LoadFrame], fname: str
+) -> JSON_TYPE:
+    """Load a YAML file from the cache or parse and add it to the cache."""
+    entry = cache.get(fname)
+    if entry is not None:
+        frames[-1].merge_dependencies(entry["dependencies"])
+        return _decode(entry["data"])  # type: ignore
+
+    frame = _LoadFrame()
+    frame.files[fname] = signature = _file_signature(fname)
+    frames.append(frame)
+    try:
+        result = _load_yaml(fname)
+    finally:
+        frames.pop()
+        frames[-1].merge(frame)
+
+    # Files that can not be stat'ed are not cached
+    if signature is not None:
+        try:
+            data = _encode(result)
+        except (_UncacheableValue, RecursionError) as err:
+            _LOGGER.debug("Not caching %s: %s", fname, err)
+        else:
+            cache.set(fname, {"dependencies": frame.as_dependencies(), "data": data})
+    return result
+
+
+def _resolve_secrets(obj: Any) -> Any:
+    """Replace the secret references in a loaded object by their value."""
+    if isinstance(obj, _SecretReference):
+        return _resolve_secret(obj.secret_path, obj.name)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            obj[key] = _resolve_secrets(value)
+    elif isinstance(obj, list):
+        for index, value in enumerate(obj):
+            obj[index] = _resolve_secrets(value)
+    return obj
+
+
+def _load_yaml(fname: str) -> JSON_TYPE:
+    """Parse a YAML file."""
     try:
         with open(fname, encoding="utf-8") as conf_file:
             # If configuration file is empty YAML returns None
             # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+            return yaml.load(conf_file, Loader=FastSafeLoader) or OrderedDict()
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc)
@@ -120,14 +433,24 @@ def _is_file_valid(name: str) -> bool:
     return not name.startswith(".")
 
 
-def _find_files(directory: str, pattern: str) -> Iterator[str]:
-    """Recursively load files in a directory."""
+def _list_files(directory: str, pattern: str) -> List[str]:
+    """Recursively list the files in a directory matching a pattern."""
+    found = []
     for root, dirs, files in os.walk(directory, topdown=True):
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in sorted(files):
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
-                filename = os.path.join(root, basename)
-                yield filename
+                found.append(os.path.join(root, basename))
+    return found
+
+
+def _find_files(directory: str, pattern: str) -> Iterator[str]:
+    """Recursively load files in a directory."""
+    files = _list_files(directory, pattern)
+    frame = _current_frame()
+    if frame is not None:
+        frame.dirs[(directory, pattern)] = files
+    return iter(files)
 
 
 def _include_dir_named_yaml(
@@ -227,6 +550,9 @@ def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
 def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
     args = node.value.split()
+    frame = _current_frame()
+    if frame is not None:
+        frame.env[args[0]] = os.environ.get(args[0])
 
     # Check for a default value
     if len(args) > 1:
@@ -245,7 +571,8 @@ def _load_secret_yaml(secret_path: str) -> JSON_TYPE:
 
     _LOGGER.debug("Loading %s", secret_path)
     try:
-        secrets = load_yaml(secret_path)
+        # Secrets are never loaded through the cache
+        secrets = _load_yaml(secret_path)
         if not isinstance(secrets, dict):
             raise HomeAssistantError("Secrets is not a dictionary")
         if "logger" in secrets:
@@ -267,16 +594,21 @@ def _load_secret_yaml(secret_path: str) -> JSON_TYPE:
 def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load secrets and embed it into the configuration YAML."""
     secret_path = os.path.dirname(loader.name)
+    if _current_frame() is not None:
+        return _SecretReference(secret_path, node.value)
+    return _resolve_secret(secret_path, node.value)
+
+
+def _resolve_secret(secret_path: str, name: str) -> JSON_TYPE:
+    """Return a secret from secrets.yaml, keyring or credstash."""
     while True:
         secrets = _load_secret_yaml(secret_path)
 
-        if node.value in secrets:
+        if name in secrets:
             _LOGGER.debug(
-                "Secret %s retrieved from secrets.yaml in folder %s",
-                node.value,
-                secret_path,
+                "Secret %s retrieved from secrets.yaml in folder %s", name, secret_path,
             )
-            return secrets[node.value]
+            return secrets[name]
 
         if secret_path == os.path.dirname(sys.path[0]):
             break  # sys.path[0] set to config/deps folder by bootstrap
@@ -287,9 +619,9 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
 
     if keyring:
         # do some keyring stuff
-        pwd = keyring.get_password(_SECRET_NAMESPACE, node.value)
+        pwd = keyring.get_password(_SECRET_NAMESPACE, name)
         if pwd:
-            _LOGGER.debug("Secret %s retrieved from keyring", node.value)
+            _LOGGER.debug("Secret %s retrieved from keyring", name)
             return pwd
 
     global credstash  # pylint: disable=invalid-name, global-statement
@@ -297,9 +629,9 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
     if credstash:
         # pylint: disable=no-member
         try:
-            pwd = credstash.getSecret(node.value, table=_SECRET_NAMESPACE)
+            pwd = credstash.getSecret(name, table=_SECRET_NAMESPACE)
             if pwd:
-                _LOGGER.debug("Secret %s retrieved from credstash", node.value)
+                _LOGGER.debug("Secret %s retrieved from credstash", name)
                 return pwd
         except credstash.ItemNotFound:
             pass
@@ -307,21 +639,24 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
             # Catch if package installed and no config
             credstash = None
 
-    raise HomeAssistantError(f"Secret {node.value} not defined")
-
-
-yaml.SafeLoader.add_constructor("!include", _include_yaml)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
-)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
-)
-yaml.SafeLoader.add_constructor("!env_var", _env_var_yaml)
-yaml.SafeLoader.add_constructor("!secret", secret_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_list", _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_named", _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor(
-    "!include_dir_merge_named", _include_dir_merge_named_yaml
-)
+    raise HomeAssistantError(f"Secret {name} not defined")
+
+
+for _loader_class in (yaml.SafeLoader, FastSafeLoader):
+    _loader_class.add_constructor("!include", _include_yaml)
+    _loader_class.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
+    )
+    _loader_class.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
+    )
+    _loader_class.add_constructor("!env_var", _env_var_yaml)
+    _loader_class.add_constructor("!secret", secret_yaml)
+    _loader_class.add_constructor("!include_dir_list", _include_dir_list_yaml)
+    _loader_class.add_constructor(
+        "!include_dir_merge_list", _include_dir_merge_list_yaml
+    )
+    _loader_class.add_constructor("!include_dir_named", _include_dir_named_yaml)
+    _loader_class.add_constructor(
+        "!include_dir_merge_named", _include_dir_merge_named_yaml
+    )
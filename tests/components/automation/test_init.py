@@ -567,7 +567,9 @@ async def test_reload_config_handles_load_fails(hass, calls):
     assert len(calls) == 2
 
 
-@pytest.mark.parametrize("service", ["turn_off_stop", "turn_off_no_stop", "reload"])
+@pytest.mark.parametrize(
+    "service", ["turn_off_stop", "turn_off_no_stop", "reload", "reload_changed"]
+)
 async def test_automation_stops(hass, calls, service):
     """Test that turning off / reloading stops any running actions as appropriate."""
     entity_id = "automation.hello"
@@ -613,17 +615,77 @@ async def test_automation_stops(hass, calls, service):
             blocking=True,
         )
     else:
+        reload_config = config
+        if service == "reload_changed":
+            reload_config = {
+                automation.DOMAIN: {**config[automation.DOMAIN], "mode": "queued"}
+            }
         with patch(
             "homeassistant.config.load_yaml_config_file",
             autospec=True,
-            return_value=config,
+            return_value=reload_config,
         ):
             await common.async_reload(hass)
 
     hass.states.async_set(test_entity, "goodbye")
     await hass.async_block_till_done()
 
-    assert len(calls) == (1 if service == "turn_off_no_stop" else 0)
+    assert len(calls) == (1 if service in ("turn_off_no_stop", "reload") else 0)
+
+
+async def test_reload_keeps_unchanged_automations(hass, calls):
+    """Test reloading only replaces changed and removed automations."""
+    hello = {
+        "alias": "hello",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"service": "test.automation"},
+    }
+    bye = {
+        "alias": "bye",
+        "trigger": {"platform": "event", "event_type": "test_event2"},
+        "action": {"service": "test.automation"},
+    }
+    assert await async_setup_component(
+        hass, automation.DOMAIN, {automation.DOMAIN: [hello, bye]}
+    )
+    component = hass.data[automation.DOMAIN]
+    hello_entity = component.get_entity("automation.hello")
+    bye_entity = component.get_entity("automation.bye")
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={
+            automation.DOMAIN: [
+                hello,
+                {**bye, "trigger": {"platform": "event", "event_type": "test_event3"}},
+            ]
+        },
+    ):
+        await common.async_reload(hass)
+        await hass.async_block_till_done()
+
+    assert component.get_entity("automation.hello") is hello_entity
+    assert component.get_entity("automation.bye") is not bye_entity
+    listeners = hass.bus.async_listeners()
+    assert listeners.get("test_event") == 1
+    assert listeners.get("test_event2") is None
+    assert listeners.get("test_event3") == 1
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={automation.DOMAIN: [hello]},
+    ):
+        await common.async_reload(hass)
+        await hass.async_block_till_done()
+
+    assert component.get_entity("automation.hello") is hello_entity
+    assert hass.states.get("automation.bye") is None
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
 
 
 async def test_automation_restore_state(hass):
@@ -6,7 +6,9 @@ import json
 import unittest
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import Statistics, process_timestamp
+from homeassistant.components.recorder.statistics import STATISTICS_PERIOD_HOURLY
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -822,3 +824,229 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def test_fetch_period_api_with_statistics(hass, hass_client):
+    """Test the fetch period view for history with statistics."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    def _add_statistics():
+        with session_scope(hass=hass) as session:
+            for entity_id, hours in (("sensor.power", 0), ("sensor.other", 1)):
+                session.add(
+                    Statistics(
+                        entity_id=entity_id,
+                        period=STATISTICS_PERIOD_HOURLY,
+                        start=start - timedelta(hours=hours),
+                        mean=15.0,
+                        min=10.0,
+                        max=20.0,
+                        sum=30.0,
+                        count=2,
+                    )
+                )
+
+    await hass.async_add_executor_job(_add_statistics)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{(start - timedelta(days=1)).isoformat()}",
+        params={
+            "statistics": "",
+            "end_time": (start + timedelta(hours=1)).isoformat(),
+            "filter_entity_id": "sensor.power",
+        },
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert len(response_json) == 1
+    assert response_json[0] == [
+        {
+            "entity_id": "sensor.power",
+            "start": start.isoformat(),
+            "mean": 15.0,
+            "min": 10.0,
+            "max": 20.0,
+            "sum": 30.0,
+        }
+    ]
+
+
+async def test_fetch_period_api_with_stream(hass, hass_client):
+    """Test the fetch period view for history streams the same states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_add_executor_job(wait_recording_done, hass)
+    start = dt_util.utcnow()
+    for state in ("on", "off", "on"):
+        hass.states.async_set("light.kitchen", state)
+        hass.states.async_set("sensor.power", state, {"unit_of_measurement": "W"})
+    await hass.async_add_executor_job(wait_recording_done, hass)
+
+    client = await hass_client()
+    for params in ({}, {"minimal_response": ""}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params=params
+        )
+        assert response.status == 200
+        expected = await response.json()
+
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params={**params, "stream": ""},
+        )
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "application/json"
+        response_json = await response.json()
+
+        assert len(response_json) == 2
+        assert sorted(response_json, key=lambda states: states[0]["entity_id"]) == (
+            sorted(expected, key=lambda states: states[0]["entity_id"])
+        )
+
+
+async def test_fetch_period_api_with_stream_no_states(hass, hass_client):
+    """Test the fetch period view for history streams an empty list."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}",
+        params={"stream": "", "filter_entity_id": "light.kitchen"},
+    )
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_with_compact(hass, hass_client):
+    """Test the fetch period view for history with the compact format."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    for state in ("on", "off", "off", "on"):
+        hass.states.async_set("light.kitchen", state, {"brightness": state})
+    await hass.async_add_executor_job(wait_recording_done, hass)
+    last_changed = hass.states.get("light.kitchen").last_changed
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"compact": "", "filter_entity_id": "light.kitchen,light.other"},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+
+    assert len(response_json) == 1
+    compact = response_json[0]
+    assert compact["entity_id"] == "light.kitchen"
+    assert compact["state_dictionary"] == ["on", "off"]
+    assert compact["states"] == [0, 1, 0]
+    assert len(compact["last_changed"]) == 3
+    assert compact["last_changed"][-1] == round(last_changed.timestamp(), 3)
+    assert compact["attributes"] == {"brightness": "on"}
+
+
+async def test_history_during_period_websocket(hass, hass_ws_client):
+    """Test the history during period websocket command."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "W"})
+    await hass.async_add_executor_job(wait_recording_done, hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert [state["state"] for state in response["result"][0]] == ["10", "20"]
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "compact": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"][0]["state_dictionary"] == ["10", "20"]
+    assert response["result"][0]["states"] == [0, 1]
+
+    await client.send_json(
+        {"id": 3, "type": "history/history_during_period", "start_time": "invalid"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_history_stream_websocket(hass, hass_ws_client):
+    """Test the history stream websocket command sends live state changes."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    await hass.async_add_executor_job(wait_recording_done, hass)
+    # Not yet committed by the recorder
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "W"})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["type"] == "event"
+    assert [
+        state["state"] for state in response["event"]["states"]["sensor.power"]
+    ] == ["10", "20"]
+
+    with patch.object(
+        history, "get_significant_states", side_effect=AssertionError
+    ) as get_significant_states:
+        hass.states.async_set("sensor.power", "30", {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.other", "30", {"unit_of_measurement": "W"})
+        await hass.async_block_till_done()
+
+        response = await client.receive_json()
+        assert response["type"] == "event"
+        assert response["event"]["states"] == {
+            "sensor.power": [
+                json.loads(json.dumps(hass.states.get("sensor.power"), cls=JSONEncoder))
+            ]
+        }
+        assert not get_significant_states.called
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
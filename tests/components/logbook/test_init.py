@@ -12,7 +12,12 @@ import voluptuous as vol
 from homeassistant.components import logbook, recorder, sun
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    Events,
+    States,
+    process_timestamp_to_utc_isoformat,
+)
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -1837,6 +1842,105 @@ async def test_exclude_attribute_changes(hass, hass_client):
     assert response_json[2]["entity_id"] == "light.kitchen"
 
 
+async def test_state_changes_recorded_with_events(hass, hass_client):
+    """Test state changes recorded with an events row are still shown."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    now = dt_util.utcnow()
+
+    def _add_legacy_state_changes():
+        with session_scope(hass=hass) as session:
+            old_state = None
+            for idx, state in enumerate((STATE_OFF, STATE_ON)):
+                time_fired = now + timedelta(seconds=idx)
+                dbevent = Events(
+                    event_type=EVENT_STATE_CHANGED,
+                    event_data="{}",
+                    origin="LOCAL",
+                    time_fired=time_fired,
+                )
+                session.add(dbevent)
+                session.flush()
+                dbstate = States(
+                    entity_id="switch.legacy",
+                    domain="switch",
+                    state=state,
+                    attributes="{}",
+                    event_id=dbevent.event_id,
+                    last_changed=time_fired,
+                    last_updated=time_fired,
+                    old_state_id=old_state and old_state.state_id,
+                )
+                session.add(dbstate)
+                session.flush()
+                old_state = dbstate
+
+    await hass.async_add_executor_job(_add_legacy_state_changes)
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+
+    await hass.async_add_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+
+    # Today time 00:00:00
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}")
+    assert response.status == 200
+    response_json = await response.json()
+
+    assert len(response_json) == 2
+    assert {entry["entity_id"] for entry in response_json} == {
+        "switch.legacy",
+        "switch.test",
+    }
+    assert all(entry["message"] == "turned on" for entry in response_json)
+
+
+async def test_logbook_view_entity_with_entries(hass, hass_client):
+    """Test only entries about the requested entity are returned."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    hass.states.async_set("light.kitchen", STATE_OFF, {"brightness": 0})
+    hass.states.async_set("light.kitchen", STATE_ON, {"brightness": 100})
+    hass.states.async_set("light.hallway", STATE_OFF)
+    hass.states.async_set("light.hallway", STATE_ON)
+    logbook.async_log_entry(hass, "Kitchen", "was dimmed", entity_id="light.kitchen")
+    logbook.async_log_entry(hass, "Hallway", "was dimmed", entity_id="light.hallway")
+    await hass.async_block_till_done()
+
+    await hass.async_add_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+
+    # Today time 00:00:00
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}?entity=light.kitchen"
+    )
+    assert response.status == 200
+    response_json = await response.json()
+
+    assert len(response_json) == 2
+    assert response_json[0]["message"] == "turned on"
+    assert response_json[0]["entity_id"] == "light.kitchen"
+    assert response_json[1]["message"] == "was dimmed"
+    assert response_json[1]["entity_id"] == "light.kitchen"
+
+
 class MockLazyEventPartialState(ha.Event):
     """Minimal mock of a Lazy event."""
 
@@ -1,4 +1,5 @@
 """The tests for the MQTT component."""
+import asyncio
 from datetime import datetime, timedelta
 import json
 import ssl
@@ -561,6 +562,39 @@ async def test_subscribe_topic_sys_root_and_wildcard_subtree_topic(
     assert calls[0][0].payload == "test-payload"
 
 
+async def test_subscribe_topic_wildcard_not_matching_sys_root(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test wildcards at the root don't match $ root topics."""
+    await mqtt.async_subscribe(hass, "#", record_calls)
+    await mqtt.async_subscribe(hass, "+/some-topic", record_calls)
+
+    async_fire_mqtt_message(hass, "$test-topic/some-topic", "test-payload")
+
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+
+async def test_unsubscribe_one_of_wildcard_subscriptions(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test removing a wildcard subscription keeps others on the same topic."""
+    unsub_1 = await mqtt.async_subscribe(hass, "test-topic/+/on", record_calls)
+    unsub_2 = await mqtt.async_subscribe(hass, "test-topic/+/on", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic/bier/on", record_calls)
+
+    unsub_1()
+    async_fire_mqtt_message(hass, "test-topic/bier/on", "test-payload")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    unsub_2()
+    async_fire_mqtt_message(hass, "test-topic/bier/on", "test-payload")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+    assert calls[2][0].subscribed_topic == "test-topic/bier/on"
+
+
 async def test_subscribe_special_characters(hass, mqtt_mock, calls, record_calls):
     """Test the subscription to topics with special characters."""
     topic = "/test-topic/$(.)[^]{-}"
@@ -653,9 +687,9 @@ async def test_restore_all_active_subscriptions_on_reconnect(
     await hass.async_block_till_done()
 
     expected = [
-        call("test/state", 2),
-        call("test/state", 0),
-        call("test/state", 1),
+        call([("test/state", 2)]),
+        call([("test/state", 0)]),
+        call([("test/state", 1)]),
     ]
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
@@ -667,10 +701,84 @@ async def test_restore_all_active_subscriptions_on_reconnect(
     mqtt_mock._mqtt_on_connect(None, None, None, 0)
     await hass.async_block_till_done()
 
-    expected.append(call("test/state", 1))
+    expected.append(call([("test/state", 1)]))
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
 
+async def test_batch_subscriptions(hass, mqtt_client_mock, mqtt_mock):
+    """Test concurrent subscriptions are sent to the broker in one batch."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/state", None),
+        mqtt.async_subscribe(hass, "test/state", None, qos=1),
+        mqtt.async_subscribe(hass, "test/other", None),
+    )
+    await hass.async_block_till_done()
+
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("test/state", 1), ("test/other", 0)])
+    ]
+
+    mqtt_mock._mqtt_on_disconnect(None, None, 0)
+    mqtt_mock._mqtt_on_connect(None, None, None, 0)
+    await hass.async_block_till_done()
+
+    assert mqtt_client_mock.subscribe.call_count == 2
+    assert mqtt_client_mock.subscribe.mock_calls[1] == call(
+        [("test/state", 1), ("test/other", 0)]
+    )
+
+
+async def test_batch_subscriptions_split(hass, mqtt_client_mock, mqtt_mock):
+    """Test large batches are sent to the broker in several packets."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    with patch("homeassistant.components.mqtt.MAX_SUBSCRIPTIONS_PER_CALL", 2):
+        unsubs = await asyncio.gather(
+            *(mqtt.async_subscribe(hass, f"test/{index}", None) for index in range(5))
+        )
+        await hass.async_block_till_done()
+
+        assert mqtt_client_mock.subscribe.mock_calls == [
+            call([("test/0", 0), ("test/1", 0)]),
+            call([("test/2", 0), ("test/3", 0)]),
+            call([("test/4", 0)]),
+        ]
+
+        for unsub in unsubs:
+            unsub()
+        await hass.async_block_till_done()
+
+    assert mqtt_client_mock.unsubscribe.call_count == 3
+    assert sorted(
+        topic
+        for unsubscribe in mqtt_client_mock.unsubscribe.mock_calls
+        for topic in unsubscribe[1][0]
+    ) == [f"test/{index}" for index in range(5)]
+
+
+async def test_batch_unsubscribes(hass, mqtt_client_mock, mqtt_mock):
+    """Test unsubscribes are sent to the broker in one batch."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    unsub_state = await mqtt.async_subscribe(hass, "test/state", None)
+    unsub_other = await mqtt.async_subscribe(hass, "test/other", None)
+
+    unsub_state()
+    unsub_other()
+    await hass.async_block_till_done()
+
+    assert mqtt_client_mock.unsubscribe.call_count == 1
+    assert sorted(mqtt_client_mock.unsubscribe.call_args[0][0]) == [
+        "test/other",
+        "test/state",
+    ]
+
+
 async def test_setup_logs_error_if_no_connect_broker(hass, caplog):
     """Test for setup failure if connection to broker is missing."""
     entry = MockConfigEntry(domain=mqtt.DOMAIN, data={mqtt.CONF_BROKER: "test-broker"})
@@ -1073,6 +1181,30 @@ async def test_mqtt_ws_get_device_debug_info(
     assert response["result"] == expected_result
 
 
+async def test_inbound_messages_handled_in_batches(
+    hass, hass_ws_client, mqtt_mock, calls, record_calls
+):
+    """Test a burst of received messages is handled in one batch."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    for idx in range(3):
+        mqtt_mock._mqtt_on_message(
+            None, None, mqtt.Message("test-topic", str(idx).encode(), 0, False)
+        )
+    await hass.async_block_till_done()
+
+    assert [args[0].payload for args in calls] == ["0", "0", "1", "1", "2", "2"]
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/debug_info/inbound"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["messages"] == 3
+    assert response["result"]["queue_depth"] == 3
+    assert response["result"]["max_queue_depth"] == 3
+
+
 async def test_debug_info_multiple_devices(hass, mqtt_mock):
     """Test we get correct debug_info when multiple devices are present."""
     devices = [
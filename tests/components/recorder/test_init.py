@@ -14,10 +14,15 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
-from homeassistant.core import Context, callback
+from homeassistant.core import callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
@@ -58,10 +63,10 @@ class TestRecorder(unittest.TestCase):
         with session_scope(hass=self.hass) as session:
             db_states = list(session.query(States))
             assert len(db_states) == 1
-            assert db_states[0].event_id > 0
+            assert db_states[0].event_id is None
             state = db_states[0].to_native()
 
-        assert state == _state_empty_context(self.hass, entity_id)
+        assert state == self.hass.states.get(entity_id)
 
     def test_saving_event(self):
         """Test saving and restoring an event."""
@@ -131,6 +136,9 @@ def _add_entities(hass, entity_ids):
 
 
 def _add_events(hass, events):
+    # Make sure the events fired during startup are written
+    # before clearing the table
+    wait_recording_done(hass)
     with session_scope(hass=hass) as session:
         session.query(Events).delete(synchronize_session=False)
     for event_type in events:
@@ -141,21 +149,13 @@ def _add_events(hass, events):
         return [ev.to_native() for ev in session.query(Events)]
 
 
-def _state_empty_context(hass, entity_id):
-    # We don't restore context unless we need it by joining the
-    # events table on the event_id for state_changed events
-    state = hass.states.get(entity_id)
-    state.context = Context(id=None)
-    return state
-
-
 # pylint: disable=redefined-outer-name,invalid-name
 def test_saving_state_include_domains(hass_recorder):
     """Test saving and restoring a state."""
     hass = hass_recorder({"include": {"domains": "test2"}})
     states = _add_entities(hass, ["test.recorder", "test2.recorder"])
     assert len(states) == 1
-    assert _state_empty_context(hass, "test2.recorder") == states[0]
+    assert hass.states.get("test2.recorder") == states[0]
 
 
 def test_saving_state_include_domains_globs(hass_recorder):
@@ -167,8 +167,8 @@ def test_saving_state_include_domains_globs(hass_recorder):
         hass, ["test.recorder", "test2.recorder", "test3.included_entity"]
     )
     assert len(states) == 2
-    assert _state_empty_context(hass, "test2.recorder") == states[0]
-    assert _state_empty_context(hass, "test3.included_entity") == states[1]
+    assert hass.states.get("test2.recorder") == states[0]
+    assert hass.states.get("test3.included_entity") == states[1]
 
 
 def test_saving_state_incl_entities(hass_recorder):
@@ -176,7 +176,7 @@ def test_saving_state_incl_entities(hass_recorder):
     hass = hass_recorder({"include": {"entities": "test2.recorder"}})
     states = _add_entities(hass, ["test.recorder", "test2.recorder"])
     assert len(states) == 1
-    assert _state_empty_context(hass, "test2.recorder") == states[0]
+    assert hass.states.get("test2.recorder") == states[0]
 
 
 def test_saving_event_exclude_event_type(hass_recorder):
@@ -192,7 +192,7 @@ def test_saving_state_exclude_domains(hass_recorder):
     hass = hass_recorder({"exclude": {"domains": "test"}})
     states = _add_entities(hass, ["test.recorder", "test2.recorder"])
     assert len(states) == 1
-    assert _state_empty_context(hass, "test2.recorder") == states[0]
+    assert hass.states.get("test2.recorder") == states[0]
 
 
 def test_saving_state_exclude_domains_globs(hass_recorder):
@@ -204,7 +204,7 @@ def test_saving_state_exclude_domains_globs(hass_recorder):
         hass, ["test.recorder", "test2.recorder", "test2.excluded_entity"]
     )
     assert len(states) == 1
-    assert _state_empty_context(hass, "test2.recorder") == states[0]
+    assert hass.states.get("test2.recorder") == states[0]
 
 
 def test_saving_state_exclude_entities(hass_recorder):
@@ -212,7 +212,7 @@ def test_saving_state_exclude_entities(hass_recorder):
     hass = hass_recorder({"exclude": {"entities": "test.recorder"}})
     states = _add_entities(hass, ["test.recorder", "test2.recorder"])
     assert len(states) == 1
-    assert _state_empty_context(hass, "test2.recorder") == states[0]
+    assert hass.states.get("test2.recorder") == states[0]
 
 
 def test_saving_state_exclude_domain_include_entity(hass_recorder):
@@ -245,8 +245,8 @@ def test_saving_state_include_domain_exclude_entity(hass_recorder):
     )
     states = _add_entities(hass, ["test.recorder", "test2.recorder", "test.ok"])
     assert len(states) == 1
-    assert _state_empty_context(hass, "test.ok") == states[0]
-    assert _state_empty_context(hass, "test.ok").state == "state2"
+    assert hass.states.get("test.ok") == states[0]
+    assert hass.states.get("test.ok").state == "state2"
 
 
 def test_saving_state_include_domain_glob_exclude_entity(hass_recorder):
@@ -261,8 +261,8 @@ def test_saving_state_include_domain_glob_exclude_entity(hass_recorder):
         hass, ["test.recorder", "test2.recorder", "test.ok", "test2.included_entity"]
     )
     assert len(states) == 1
-    assert _state_empty_context(hass, "test.ok") == states[0]
-    assert _state_empty_context(hass, "test.ok").state == "state2"
+    assert hass.states.get("test.ok") == states[0]
+    assert hass.states.get("test.ok").state == "state2"
 
 
 def test_saving_state_and_removing_entity(hass, hass_recorder):
@@ -299,6 +299,9 @@ def test_recorder_setup_failure():
             auto_purge=True,
             keep_days=7,
             commit_interval=1,
+            max_batch_size=1000,
+            short_term_statistics=False,
+            statistics_keep_days=365,
             uri="sqlite://",
             db_max_retries=10,
             db_retry_wait=3,
@@ -382,6 +385,67 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_sets_old_state_in_same_batch(hass_recorder):
+    """Test old state is linked when both states are committed together."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.one", "off", {})
+    hass.states.set("test.one", "on", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 3
+
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id == states[1].state_id
+
+
+def test_saving_shares_attributes(hass_recorder):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"color": "red"})
+    hass.states.set("test.one", "off", {"color": "red"})
+    hass.states.set("test.two", "on", {"color": "red"})
+    wait_recording_done(hass)
+    hass.states.set("test.two", "off", {"color": "red"})
+    hass.states.set("test.two", "on", {"color": "blue"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+        assert len({state.attributes_id for state in states[:4]}) == 1
+        assert states[4].attributes_id != states[0].attributes_id
+        assert all(state.attributes is None for state in states)
+        assert states[4].to_native().attributes == {"color": "blue"}
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_commit_when_batch_full(hass_recorder):
+    """Test the recorder commits when max_batch_size is reached."""
+    hass = hass_recorder({"commit_interval": 3600, "max_batch_size": 2})
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(
+        instance,
+        "_commit_event_session_or_retry",
+        wraps=instance._commit_event_session_or_retry,
+    ) as commit:
+        hass.states.set("test.one", "on", {})
+        hass.states.set("test.two", "on", {})
+        hass.block_till_done()
+        instance.block_till_done()
+        instance.queue.put(None)
+        instance.join()
+
+    # At least one commit for a full batch and one when closing the run
+    assert len(commit.mock_calls) >= 2
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
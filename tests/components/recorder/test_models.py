@@ -11,6 +11,7 @@ from homeassistant.components.recorder.models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -68,9 +69,6 @@ class TestStates(unittest.TestCase):
             {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
             context=state.context,
         )
-        # We don't restore context unless we need it by joining the
-        # events table on the event_id for state_changed events
-        state.context = ha.Context(id=None)
         assert state == States.from_event(event).to_native()
 
     def test_from_event_to_delete_state(self):
@@ -92,6 +90,54 @@ class TestStates(unittest.TestCase):
         assert db_state.last_updated == event.time_fired
 
 
+class TestStateAttributes(unittest.TestCase):
+    """Test StateAttributes model."""
+
+    # pylint: disable=no-self-use
+
+    def test_from_event(self):
+        """Test converting event to db state attributes."""
+        attrs = {"unit_of_measurement": "W"}
+        state = ha.State("sensor.power", "18", attrs)
+        event = ha.Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.power", "old_state": None, "new_state": state},
+        )
+        dbstate_attributes = StateAttributes.from_event(event)
+
+        assert dbstate_attributes.to_native() == attrs
+        assert dbstate_attributes.hash == StateAttributes.hash_shared_attrs(
+            dbstate_attributes.shared_attrs
+        )
+
+    def test_from_event_to_delete_state(self):
+        """Test converting deleting state event to db state attributes."""
+        event = ha.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "sensor.power",
+                "old_state": ha.State("sensor.power", "18"),
+                "new_state": None,
+            },
+        )
+
+        assert StateAttributes.from_event(event).to_native() == {}
+
+    def test_state_to_native_with_shared_attributes(self):
+        """Test converting a state with shared attributes to native."""
+        attrs = {"unit_of_measurement": "W"}
+        state = ha.State("sensor.power", "18", attrs)
+        event = ha.Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.power", "old_state": None, "new_state": state},
+        )
+        dbstate = States.from_event(event)
+        dbstate.state_attributes = StateAttributes.from_event(event)
+
+        assert dbstate.attributes is None
+        assert dbstate.to_native().attributes == attrs
+
+
 class TestRecorderRuns(unittest.TestCase):
     """Test recorder run model."""
 
@@ -5,7 +5,13 @@ import unittest
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    Statistics,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
@@ -137,7 +143,25 @@ class TestRecorderPurge(unittest.TestCase):
             # run purge_old_data()
             finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
             assert not finished
-            assert states.count() == 4
+            assert states.count() == 2
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert finished
+            assert states.count() == 2
+
+    def test_purge_old_states_in_batches(self):
+        """Test deleting old states one bounded batch at a time."""
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session, patch(
+            "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 3
+        ):
+            states = session.query(States)
+            assert states.count() == 6
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert not finished
+            assert states.count() == 3
 
             finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
             assert not finished
@@ -147,6 +171,161 @@ class TestRecorderPurge(unittest.TestCase):
             assert finished
             assert states.count() == 2
 
+    def test_purge_unused_state_attributes(self):
+        """Test deleting shared attributes no state references anymore."""
+        self.hass.states.set("test.recorder", "on", {"color": "red"})
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            session.add(StateAttributes(hash=1, shared_attrs='{"unused": true}'))
+
+        with session_scope(hass=self.hass) as session:
+            state_attributes = session.query(StateAttributes)
+            assert state_attributes.count() == 2
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert not finished
+            assert state_attributes.count() == 1
+            assert state_attributes.first().to_native() == {"color": "red"}
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert finished
+            assert state_attributes.count() == 1
+
+    def test_purge_unused_state_attributes_after_cached(self):
+        """Test unused attributes behind a batch of cached ones are deleted."""
+        with session_scope(hass=self.hass) as session:
+            for index in range(3):
+                session.add(
+                    StateAttributes(hash=index, shared_attrs=f'{{"index": {index}}}')
+                )
+
+        with session_scope(hass=self.hass) as session:
+            state_attributes = session.query(StateAttributes).order_by(
+                StateAttributes.attributes_id
+            )
+            attributes_ids = [row.attributes_id for row in state_attributes]
+            assert len(attributes_ids) == 3
+
+            instance = self.hass.data[DATA_INSTANCE]
+            with patch(
+                "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2
+            ), patch.object(
+                instance, "cached_attributes_ids", return_value=set(attributes_ids[:2]),
+            ):
+                finished = purge_old_data(instance, 4, repack=False)
+                assert not finished
+                assert [
+                    row.attributes_id for row in state_attributes
+                ] == attributes_ids[:2]
+
+                finished = purge_old_data(instance, 4, repack=False)
+                assert finished
+                assert state_attributes.count() == 2
+
+    def test_purge_state_attributes_with_states(self):
+        """Test shared attributes are deleted with the last state using them."""
+        eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+        now = dt_util.utcnow()
+        red_attributes = StateAttributes(hash=1, shared_attrs='{"color": "red"}')
+        blue_attributes = StateAttributes(hash=2, shared_attrs='{"color": "blue"}')
+
+        with session_scope(hass=self.hass) as session:
+            for timestamp, state_attributes in (
+                (eleven_days_ago, red_attributes),
+                (eleven_days_ago, blue_attributes),
+                (now, red_attributes),
+            ):
+                session.add(
+                    States(
+                        entity_id="test.recorder2",
+                        domain="test",
+                        state="on",
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        created=timestamp,
+                        state_attributes=state_attributes,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            state_attributes = session.query(StateAttributes).filter(
+                StateAttributes.hash.in_((1, 2))
+            )
+            assert state_attributes.count() == 2
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert not finished
+            assert state_attributes.count() == 1
+            assert state_attributes.first().to_native() == {"color": "red"}
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert finished
+            assert state_attributes.count() == 1
+
+    def test_purge_keeps_attributes_of_last_state(self):
+        """Test the attributes of a purged last state can still be linked."""
+        self.hass.states.set("test.recorder", "on", {"color": "red"})
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+            session.query(States).update(
+                {States.last_updated: eleven_days_ago}, synchronize_session=False
+            )
+
+        self.hass.services.call("recorder", "purge", service_data={"keep_days": 4})
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(States).count() == 0
+
+        # The attributes did not change so the new state
+        # is linked to the attributes of the purged state
+        self.hass.states.set("test.recorder", "off", {"color": "red"})
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            state = session.query(States).one()
+            state_attributes = (
+                session.query(StateAttributes)
+                .filter(StateAttributes.attributes_id == state.attributes_id)
+                .one()
+            )
+            assert state_attributes.to_native() == {"color": "red"}
+
+    def test_purge_statistics_after_statistics_keep_days(self):
+        """Test statistics are kept longer than the states."""
+        now = dt_util.utcnow()
+        with session_scope(hass=self.hass) as session:
+            for days in (11, 400):
+                session.add(
+                    Statistics(
+                        entity_id="sensor.power",
+                        period=3600,
+                        start=now - timedelta(days=days),
+                        mean=1.0,
+                        min=1.0,
+                        max=1.0,
+                        sum=1.0,
+                        count=1,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            statistics = session.query(Statistics)
+            assert statistics.count() == 2
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert not finished
+            assert statistics.count() == 1
+
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert finished
+            assert statistics.count() == 1
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -156,10 +335,6 @@ class TestRecorderPurge(unittest.TestCase):
             assert events.count() == 6
 
             # run purge_old_data()
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert not finished
-            assert events.count() == 4
-
             finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
             assert not finished
             assert events.count() == 2
@@ -233,6 +408,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 wait_recording_done(self.hass)
                 assert (
-                    mock_logger.debug.mock_calls[5][1][0]
+                    mock_logger.debug.mock_calls[6][1][0]
                     == "Vacuuming SQL DB to free space"
                 )
@@ -0,0 +1,178 @@
+"""The tests for the recorder statistics."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.statistics import (
+    STATISTICS_PERIOD_HOURLY,
+    STATISTICS_PERIOD_SHORT_TERM,
+    StatisticsCompiler,
+    period_start,
+    state_to_statistic_value,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import get_test_home_assistant, init_recorder_component
+
+POWER_ATTRIBUTES = {"unit_of_measurement": "W"}
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _power_state(value, last_updated):
+    """Return a power sensor state."""
+    return State("sensor.power", value, POWER_ATTRIBUTES, last_updated, last_updated)
+
+
+def test_state_to_statistic_value():
+    """Test only numeric sensors with a unit have statistics."""
+    now = dt_util.utcnow()
+    assert state_to_statistic_value(_power_state("1.5", now)) == 1.5
+    assert state_to_statistic_value(_power_state("unavailable", now)) is None
+    assert state_to_statistic_value(_power_state("nan", now)) is None
+    assert state_to_statistic_value(State("sensor.count", "1")) is None
+    assert (
+        state_to_statistic_value(State("light.kitchen", "1", POWER_ATTRIBUTES)) is None
+    )
+    assert state_to_statistic_value(None) is None
+
+
+def test_period_start():
+    """Test the start of a period."""
+    timestamp = datetime(2020, 9, 1, 10, 37, 12, 5, tzinfo=dt_util.UTC)
+    assert period_start(timestamp, STATISTICS_PERIOD_HOURLY) == datetime(
+        2020, 9, 1, 10, tzinfo=dt_util.UTC
+    )
+    assert period_start(timestamp, STATISTICS_PERIOD_SHORT_TERM) == datetime(
+        2020, 9, 1, 10, 35, tzinfo=dt_util.UTC
+    )
+
+
+def test_compile_statistics(hass_recorder):
+    """Test statistics are written once their period ended."""
+    hass = hass_recorder()
+    start = datetime(2020, 9, 1, 10, tzinfo=dt_util.UTC)
+    compiler = StatisticsCompiler(
+        [STATISTICS_PERIOD_HOURLY, STATISTICS_PERIOD_SHORT_TERM], start
+    )
+
+    with session_scope(hass=hass) as session:
+        compiler.add_state(session, _power_state("10", start))
+        compiler.add_state(session, _power_state("30", start + timedelta(minutes=1)))
+        compiler.add_state(session, _power_state("20", start + timedelta(minutes=6)))
+        compiler.compile_finished(session, start + timedelta(minutes=59))
+
+    with session_scope(hass=hass) as session:
+        statistics = [
+            stat.to_native()
+            for stat in session.query(Statistics).order_by(Statistics.start)
+        ]
+    assert statistics == [
+        {
+            "entity_id": "sensor.power",
+            "start": start,
+            "mean": 20.0,
+            "min": 10.0,
+            "max": 30.0,
+            "sum": 40.0,
+        },
+        {
+            "entity_id": "sensor.power",
+            "start": start + timedelta(minutes=5),
+            "mean": 20.0,
+            "min": 20.0,
+            "max": 20.0,
+            "sum": 20.0,
+        },
+    ]
+
+    with session_scope(hass=hass) as session:
+        compiler.compile_finished(session, start + timedelta(hours=1))
+
+    with session_scope(hass=hass) as session:
+        hourly = session.query(Statistics).filter(
+            Statistics.period == STATISTICS_PERIOD_HOURLY
+        )
+        assert hourly.one().to_native() == {
+            "entity_id": "sensor.power",
+            "start": start,
+            "mean": 20.0,
+            "min": 10.0,
+            "max": 30.0,
+            "sum": 60.0,
+        }
+
+
+def test_continue_statistics_after_restart(hass_recorder):
+    """Test statistics of an unfinished period are continued after a restart."""
+    hass = hass_recorder()
+    start = datetime(2020, 9, 1, 10, tzinfo=dt_util.UTC)
+
+    compiler = StatisticsCompiler([STATISTICS_PERIOD_HOURLY], start)
+    with session_scope(hass=hass) as session:
+        compiler.add_state(session, _power_state("10", start))
+        compiler.compile_all(session)
+
+    compiler = StatisticsCompiler(
+        [STATISTICS_PERIOD_HOURLY], start + timedelta(minutes=30)
+    )
+    with session_scope(hass=hass) as session:
+        compiler.add_state(session, _power_state("30", start + timedelta(minutes=31)))
+        compiler.compile_finished(session, start + timedelta(hours=1))
+
+    with session_scope(hass=hass) as session:
+        assert session.query(Statistics).one().to_native() == {
+            "entity_id": "sensor.power",
+            "start": start,
+            "mean": 20.0,
+            "min": 10.0,
+            "max": 30.0,
+            "sum": 40.0,
+        }
+
+
+def test_recorder_compiles_statistics(hass_recorder):
+    """Test the recorder compiles statistics of recorded states."""
+    hass = hass_recorder()
+    hass.states.set("sensor.power", "10", POWER_ATTRIBUTES)
+    hass.states.set("sensor.power", "20", POWER_ATTRIBUTES)
+    hass.states.set("sensor.text", "10")
+    wait_recording_done(hass)
+
+    # Statistics are only written once the period ended
+    with session_scope(hass=hass) as session:
+        assert session.query(Statistics).count() == 0
+
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=dt_util.utcnow() + timedelta(hours=1),
+    ):
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        statistics = session.query(Statistics).one()
+        assert statistics.entity_id == "sensor.power"
+        assert statistics.period == STATISTICS_PERIOD_HOURLY
+        assert statistics.mean == 15.0
@@ -187,6 +187,31 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_shared_by_subscriptions(hass, websocket_client):
+    """Test an event is sent to every subscription with its own id."""
+    for iden in (5, 6):
+        await websocket_client.send_json(
+            {"id": iden, "type": "subscribe_events", "event_type": "test_event"}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == iden
+        assert msg["success"]
+
+    hass.bus.async_fire("test_event", {"hello": "world"})
+
+    events = {}
+    for _ in range(2):
+        with timeout(3):
+            msg = await websocket_client.receive_json()
+        assert msg["type"] == "event"
+        events[msg["id"]] = msg["event"]
+
+    assert events.keys() == {5, 6}
+    assert events[5] == events[6]
+    assert events[5]["event_type"] == "test_event"
+    assert events[5]["data"] == {"hello": "world"}
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
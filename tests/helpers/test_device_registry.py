@@ -321,6 +321,36 @@ async def test_deleted_device_removing_config_entries(hass, registry, update_eve
     assert entry.id != entry2.id
 
 
+async def test_entries_for_area(registry):
+    """Test looking up devices by area."""
+    entry1 = registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "0123")}
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "4567")}
+    )
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+
+    entry1 = registry.async_update_device(entry1.id, area_id="kitchen")
+    entry2 = registry.async_update_device(entry2.id, area_id="kitchen")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [
+        entry1,
+        entry2,
+    ]
+
+    entry1 = registry.async_update_device(entry1.id, name_by_user="Renamed")
+    entry2 = registry.async_update_device(entry2.id, area_id="hallway")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [entry1]
+    assert device_registry.async_entries_for_area(registry, "hallway") == [entry2]
+
+    registry.async_remove_device(entry2.id)
+    assert device_registry.async_entries_for_area(registry, "hallway") == []
+
+    registry.async_clear_area_id("kitchen")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+    assert registry.async_get(entry1.id).area_id is None
+
+
 async def test_removing_area_id(registry):
     """Make sure we can clear area id."""
     entry = registry.async_get_or_create(
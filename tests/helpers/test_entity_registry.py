@@ -421,6 +421,69 @@ async def test_loading_race_condition(hass):
         assert results[0] == results[1]
 
 
+async def test_entries_for_device_and_config_entry(registry):
+    """Test looking up entries by device and config entry."""
+    config_entry = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    entry1 = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=config_entry, device_id="device-1"
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=config_entry, device_id="device-1"
+    )
+    entry3 = registry.async_get_or_create("light", "hue", "9012", device_id="device-2")
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+    ]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [entry3]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1,
+        entry2,
+    ]
+    assert entity_registry.async_entries_for_device(registry, "unknown") == []
+
+    # Updates that do not change the device keep the order
+    entry1 = registry.async_update_entity(entry1.entity_id, name="Renamed")
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+    ]
+
+    entry2 = registry.async_update_entity(
+        entry2.entity_id, new_entity_id="light.new_id"
+    )
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1,
+        entry2,
+    ]
+
+    entry3 = registry.async_get_or_create(
+        "light", "hue", "9012", config_entry=config_entry, device_id="device-1"
+    )
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+        entry3,
+    ]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == []
+
+    registry.async_remove(entry2.entity_id)
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry3,
+    ]
+
+    registry.async_clear_config_entry("mock-id-1")
+    assert entity_registry.async_entries_for_device(registry, "device-1") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == []
+    assert not registry.entities
+
+
 async def test_update_entity_unique_id(registry):
     """Test entity's unique_id is updated."""
     mock_config = MockConfigEntry(domain="light", entry_id="mock-id-1")
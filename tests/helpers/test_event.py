@@ -14,6 +14,7 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    ALL_STATES_RATE_LIMIT,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -1016,6 +1017,104 @@ async def test_track_template_result_refresh_cancel(hass):
     assert refresh_runs == ["duck", "dog"]
 
 
+async def test_track_template_result_all_states_not_rate_limited(hass):
+    """Test templates listening to all states render every state change."""
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, template, last_result, result):
+        refresh_runs.append(result)
+
+    info = async_track_template_result(
+        hass, Template("{{ states | count }}", hass), refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "on")
+    hass.states.async_set("sensor.two", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1", "2"]
+    assert info.coalesced_count == 0
+
+    info.async_remove()
+
+
+async def test_track_template_result_all_states_rate_limited(hass):
+    """Test templates listening to all states coalesce state changes."""
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, template, last_result, result):
+        refresh_runs.append(result)
+
+    info = async_track_template_result(
+        hass,
+        Template("{{ states | count }}", hass),
+        refresh_listener,
+        all_states_rate_limit=ALL_STATES_RATE_LIMIT,
+    )
+    await hass.async_block_till_done()
+    assert info.render_count == 1
+
+    hass.states.async_set("sensor.one", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1"]
+
+    hass.states.async_set("sensor.two", "on")
+    hass.states.async_set("sensor.three", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1"]
+    assert info.render_count == 2
+    assert info.coalesced_count == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1", "3"]
+    assert info.render_count == 3
+
+    info.async_remove()
+
+
+async def test_track_template_result_rate_limit(hass):
+    """Test a rate limit passed for a template with specific entities."""
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, template, last_result, result):
+        refresh_runs.append(result)
+
+    info = async_track_template_result(
+        hass,
+        Template("{{ states('sensor.one') }}", hass),
+        refresh_listener,
+        rate_limit=timedelta(seconds=5),
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "1")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1"]
+
+    hass.states.async_set("sensor.one", "2")
+    hass.states.async_set("sensor.one", "3")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1", "3"]
+
+    hass.states.async_set("sensor.one", "4")
+    await hass.async_block_till_done()
+    info.async_refresh()
+    assert refresh_runs == ["1", "3", "4"]
+
+    info.async_remove()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=12))
+    await hass.async_block_till_done()
+    assert refresh_runs == ["1", "3", "4"]
+
+
 async def test_track_same_state_simple_no_trigger(hass):
     """Test track_same_change with no trigger."""
     callback_runs = []
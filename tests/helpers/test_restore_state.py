@@ -1,5 +1,6 @@
 """The tests for the Restore component."""
 from datetime import datetime
+import json
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START
 from homeassistant.core import CoreState, State
@@ -10,6 +11,7 @@ from homeassistant.helpers.restore_state import (
     STORAGE_KEY,
     RestoreEntity,
     RestoreStateData,
+    RestoreStateStore,
     StoredState,
 )
 from homeassistant.util import dt as dt_util
@@ -148,12 +150,12 @@ async def test_dump_data(hass):
     # b4 should not be written, since it is now expired
     # b5 should be written, since current state is restored by entity registry
     assert len(written_states) == 3
-    assert written_states[0]["state"]["entity_id"] == "input_boolean.b1"
-    assert written_states[0]["state"]["state"] == "on"
-    assert written_states[1]["state"]["entity_id"] == "input_boolean.b3"
-    assert written_states[1]["state"]["state"] == "off"
-    assert written_states[2]["state"]["entity_id"] == "input_boolean.b5"
-    assert written_states[2]["state"]["state"] == "off"
+    assert written_states[0].state.entity_id == "input_boolean.b1"
+    assert written_states[0].state.state == "on"
+    assert written_states[1].state.entity_id == "input_boolean.b3"
+    assert written_states[1].state.state == "off"
+    assert written_states[2].state.entity_id == "input_boolean.b5"
+    assert written_states[2].state.state == "off"
 
     # Test that removed entities are not persisted
     await entity.async_remove()
@@ -167,10 +169,39 @@ async def test_dump_data(hass):
     args = mock_write_data.mock_calls[0][1]
     written_states = args[0]
     assert len(written_states) == 2
-    assert written_states[0]["state"]["entity_id"] == "input_boolean.b3"
-    assert written_states[0]["state"]["state"] == "off"
-    assert written_states[1]["state"]["entity_id"] == "input_boolean.b5"
-    assert written_states[1]["state"]["state"] == "off"
+    assert written_states[0].state.entity_id == "input_boolean.b3"
+    assert written_states[0].state.state == "off"
+    assert written_states[1].state.entity_id == "input_boolean.b5"
+    assert written_states[1].state.state == "off"
+
+
+async def test_dump_reuses_unchanged_states(hass, tmp_path):
+    """Test only states that changed since the last dump are encoded."""
+    store = RestoreStateStore(hass)
+    path = str(tmp_path / STORAGE_KEY)
+    now = dt_util.utcnow()
+    stored_states = [
+        StoredState(State("input_boolean.b0", "on", {"icon": "mdi:test"}), now),
+        StoredState(State("input_boolean.b1", "off"), now),
+    ]
+
+    store._write_json(path, {"version": 1, "key": STORAGE_KEY, "data": stored_states})
+    assert store.dump_stats["states"] == 2
+    assert store.dump_stats["encoded"] == 2
+
+    stored_states[1] = StoredState(State("input_boolean.b1", "on"), now)
+    store._write_json(path, {"version": 1, "key": STORAGE_KEY, "data": stored_states})
+    assert store.dump_stats["states"] == 2
+    assert store.dump_stats["encoded"] == 1
+
+    with open(path) as fil:
+        written = json.load(fil)
+    assert written["version"] == 1
+    assert written["key"] == STORAGE_KEY
+    assert [StoredState.from_dict(item).state for item in written["data"]] == [
+        stored_state.state for stored_state in stored_states
+    ]
+    assert StoredState.from_dict(written["data"][0]).last_seen == now
 
 
 async def test_dump_error(hass):
@@ -741,6 +741,70 @@ def test_render_with_possible_json_value_non_string_value(hass):
     assert tpl.async_render_with_possible_json_value(value) == expected
 
 
+@pytest.mark.parametrize(
+    "template_string,variables",
+    [
+        ("{{ states('sensor.fast') }}", {}),
+        ("{{ states('sensor.missing') }}", {}),
+        ("{{ is_state('sensor.fast', '12') }}", {}),
+        ('{{ is_state("sensor.fast", "off") }}', {}),
+        ("{{ state_attr('sensor.fast', 'unit') }}", {}),
+        ("{{ state_attr('sensor.fast', 'missing') }}", {}),
+        ("{{ value }}", {"value": " 42 "}),
+        ("{{ value_json.temp.inside }}", {"value_json": {"temp": {"inside": 21.5}}}),
+        ("{{ value_json.temp }}", {"value_json": {"temp": {"inside": 21.5}}}),
+    ],
+)
+def test_fast_path_renders_like_jinja(hass, template_string, variables):
+    """Test simple templates skip Jinja with the same result."""
+    hass.states.async_set("sensor.fast", "12", {"unit": "W"})
+    tpl = template.Template(template_string, hass)
+
+    result = tpl.async_render(variables)
+
+    assert tpl._fast_render is not None  # pylint: disable=protected-access
+    # pylint: disable=protected-access
+    assert result == tpl._compiled.render(variables).strip()
+
+
+@pytest.mark.parametrize(
+    "template_string",
+    [
+        "{{ states('sensor.fast') | float }}",
+        "{{ value_json.items }}",
+        "{{ states.sensor.fast.state }}",
+        "{% if is_state('sensor.fast', '12') %}yes{% endif %}",
+    ],
+)
+def test_fast_path_not_used(hass, template_string):
+    """Test templates outside the simple shapes are rendered by Jinja."""
+    tpl = template.Template(template_string, hass)
+    tpl.async_render({"value_json": {}})
+    assert tpl._fast_render is None  # pylint: disable=protected-access
+
+
+def test_fast_path_falls_back_to_jinja(hass):
+    """Test the fast path defers to Jinja when it cannot match Jinja."""
+    tpl = template.Template("{{ value_json.hello }}", hass)
+    assert tpl.async_render_with_possible_json_value('{"hello": "world"}') == "world"
+    assert tpl.async_render_with_possible_json_value('{"bye": "world"}') == ""
+    assert tpl.async_render_with_possible_json_value("[1, 2]") == ""
+
+    tpl = template.Template("{{ states('sensor.fast') }}", hass)
+    assert tpl.async_render(states=lambda entity_id: "shadowed") == "shadowed"
+
+
+def test_fast_path_render_info(hass):
+    """Test the fast path collects the entities it reads."""
+    hass.states.async_set("sensor.fast", "12")
+
+    info = render_to_info(hass, "{{ states('sensor.fast') }}")
+    assert_result_info(info, "12", ["sensor.fast"])
+
+    info = render_to_info(hass, "{{ is_state('sensor.missing', 'on') }}")
+    assert_result_info(info, "False", ["sensor.missing"])
+
+
 def test_if_state_exists(hass):
     """Test if state exists works."""
     hass.states.async_set("test.object", "available")
@@ -2229,28 +2293,45 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_cache_garbage_collection(hass):
+    """Test templates with the same source share a collectable template."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template((template_string),)
-    tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    tpl = template.Template((template_string), hass)
+    tpl.async_render()
+    env = tpl._env  # pylint: disable=protected-access
+    assert env.template_cache.get(template_string)
 
-    tpl2 = template.Template((template_string),)
-    tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    tpl2 = template.Template((template_string), hass)
+    tpl2.async_render()
+    assert tpl._compiled is tpl2._compiled  # pylint: disable=protected-access
 
     del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert env.template_cache.get(template_string)
     del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert not env.template_cache.get(template_string)
+
+
+def test_compiled_code_cache():
+    """Test compiled code is shared and evicted least recently used first."""
+    cache = template._COMPILED_CODE_CACHE  # pylint: disable=protected-access
+    cache.clear()
+
+    template.Template("{{ 1 + 1 }}").ensure_valid()
+    template.Template("{{ 1 + 1 }}").ensure_valid()
+    assert template.compiled_code_cache_info() == {
+        "hits": 1,
+        "misses": 1,
+        "size": 1,
+        "maxsize": template.COMPILED_CODE_CACHE_SIZE,
+    }
+
+    with patch.object(cache, "maxsize", 2):
+        template.Template("{{ 2 + 2 }}").ensure_valid()
+        template.Template("{{ 1 + 1 }}").ensure_valid()
+        template.Template("{{ 3 + 3 }}").ensure_valid()
+        assert cache.get((False, "{{ 1 + 1 }}")) is not None
+        assert cache.get((False, "{{ 2 + 2 }}")) is None
+
+    cache.clear()
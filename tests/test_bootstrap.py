@@ -7,7 +7,7 @@ from unittest.mock import Mock
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, loader, runner
 import homeassistant.config as config_util
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
@@ -313,6 +313,27 @@ async def test_setup_after_deps_not_present(hass):
     assert order == ["root", "second_dep"]
 
 
+async def test_preload_skips_missing_requirements(hass):
+    """Test integrations are not imported before installing requirements."""
+    hass.config.skip_pip = False
+    mock_integration(
+        hass, MockModule("needs_reqs", requirements=["not-installed==1.0"])
+    )
+    mock_integration(hass, MockModule("needs_dep", dependencies=["needs_reqs"]))
+    mock_integration(hass, MockModule("no_reqs"))
+    integration_cache = {
+        domain: await loader.async_get_integration(hass, domain)
+        for domain in ("needs_reqs", "needs_dep", "no_reqs")
+    }
+
+    with patch("homeassistant.bootstrap.is_installed", return_value=False), patch(
+        "homeassistant.loader.async_preload_integrations"
+    ) as mock_preload:
+        await bootstrap._async_preload_integrations(hass, {}, integration_cache)
+
+    assert [itg.domain for itg in mock_preload.call_args[0][1]] == ["no_reqs"]
+
+
 @pytest.fixture
 def mock_is_virtual_env():
     """Mock enable logging."""
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access
 from collections import OrderedDict
 import copy
+from datetime import timedelta
 import os
 from unittest import mock
 
@@ -35,7 +36,11 @@ from homeassistant.util import dt as dt_util
 from homeassistant.util.yaml import SECRET_YAML
 
 from tests.async_mock import AsyncMock, Mock, patch
-from tests.common import get_test_config_dir, patch_yaml_files
+from tests.common import (
+    async_fire_time_changed,
+    get_test_config_dir,
+    patch_yaml_files,
+)
 
 CONFIG_DIR = get_test_config_dir()
 YAML_PATH = os.path.join(CONFIG_DIR, config_util.YAML_CONFIG_FILE)
@@ -561,6 +566,33 @@ async def test_async_hass_config_yaml_merge(merge_log_err, hass):
     assert len(conf["light"]) == 1
 
 
+async def test_async_hass_config_yaml_cache(hass, hass_storage, tmp_path):
+    """Test parsed YAML files are cached in storage."""
+    hass.config.config_dir = str(tmp_path)
+    config_path = tmp_path / config_util.YAML_CONFIG_FILE
+    config_path.write_text("light: !include light.yaml\n")
+    (tmp_path / "light.yaml").write_text("- platform: test\n")
+
+    conf = await config_util.async_hass_config_yaml(hass)
+    assert conf["light"] == [{"platform": "test"}]
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=config_util.YAML_CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    entries = hass_storage[config_util.YAML_CACHE_STORAGE_KEY]["data"]["entries"]
+    assert set(entries) == {str(config_path), str(tmp_path / "light.yaml")}
+
+    # A new instance loads the files from the stored cache
+    hass.data.pop(config_util.DATA_YAML_CACHE)
+    with patch("homeassistant.util.yaml.loader._load_yaml") as mock_load:
+        conf = await config_util.async_hass_config_yaml(hass)
+    assert not mock_load.called
+    assert conf["light"] == [{"platform": "test"}]
+    assert conf["light"].__config_file__ == str(config_path)
+    assert conf["light"][0].__config_file__ == str(tmp_path / "light.yaml")
+
+
 # pylint: disable=redefined-outer-name
 @pytest.fixture
 def merge_log_err(hass):
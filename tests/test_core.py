@@ -33,7 +33,11 @@ from homeassistant.const import (
     __version__,
 )
 import homeassistant.core as ha
-from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    InvalidEntityFormatError,
+    InvalidStateError,
+)
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -48,43 +52,43 @@ def test_split_entity_id():
     assert ha.split_entity_id("domain.object_id") == ["domain", "object_id"]
 
 
-def test_async_add_job_schedule_callback():
+def test_async_add_hass_job_schedule_callback():
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock()
     job = MagicMock()
 
-    ha.HomeAssistant.async_add_job(hass, ha.callback(job))
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
     assert len(hass.loop.call_soon.mock_calls) == 1
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_schedule_partial_callback():
+def test_async_add_hass_job_schedule_partial_callback():
     """Test that we schedule partial coros and add jobs to the job pool."""
     hass = MagicMock()
     job = MagicMock()
     partial = functools.partial(ha.callback(job))
 
-    ha.HomeAssistant.async_add_job(hass, partial)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
     assert len(hass.loop.call_soon.mock_calls) == 1
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_schedule_coroutinefunction(loop):
+def test_async_add_hass_job_schedule_coroutinefunction(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
 
     async def job():
         pass
 
-    ha.HomeAssistant.async_add_job(hass, job)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 1
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_schedule_partial_coroutinefunction(loop):
+def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
 
@@ -93,20 +97,20 @@ def test_async_add_job_schedule_partial_coroutinefunction(loop):
 
     partial = functools.partial(job)
 
-    ha.HomeAssistant.async_add_job(hass, partial)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 1
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_add_job_add_threaded_job_to_pool():
+def test_async_add_hass_job_add_threaded_job_to_pool():
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock()
 
     def job():
         pass
 
-    ha.HomeAssistant.async_add_job(hass, job)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.loop.run_in_executor.mock_calls) == 1
@@ -125,7 +129,7 @@ def test_async_create_task_schedule_coroutine(loop):
     assert len(hass.add_job.mock_calls) == 0
 
 
-def test_async_run_job_calls_callback():
+def test_async_run_hass_job_calls_callback():
     """Test that the callback annotation is respected."""
     hass = MagicMock()
     calls = []
@@ -133,12 +137,12 @@ def test_async_run_job_calls_callback():
     def job():
         calls.append(1)
 
-    ha.HomeAssistant.async_run_job(hass, ha.callback(job))
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(ha.callback(job)))
     assert len(calls) == 1
-    assert len(hass.async_add_job.mock_calls) == 0
+    assert len(hass.async_add_hass_job.mock_calls) == 0
 
 
-def test_async_run_job_delegates_non_async():
+def test_async_run_hass_job_delegates_non_async():
     """Test that the callback annotation is respected."""
     hass = MagicMock()
     calls = []
@@ -146,9 +150,58 @@ def test_async_run_job_delegates_non_async():
     def job():
         calls.append(1)
 
-    ha.HomeAssistant.async_run_job(hass, job)
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(job))
     assert len(calls) == 0
-    assert len(hass.async_add_job.mock_calls) == 1
+    assert len(hass.async_add_hass_job.mock_calls) == 1
+
+
+def test_hassjob_forbid_coroutine():
+    """Test hassjob forbids coroutines."""
+
+    async def bla():
+        pass
+
+    coro = bla()
+
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+
+    # To avoid warning about unawaited coro
+    coro.close()
+
+
+def test_hassjob_determines_job_type_once():
+    """Test the job type of a partial is determined when the job is created."""
+
+    async def coro_job():
+        pass
+
+    def executor_job():
+        pass
+
+    assert (
+        ha.HassJob(functools.partial(coro_job)).job_type
+        == ha.HassJobType.Coroutinefunction
+    )
+    assert (
+        ha.HassJob(functools.partial(ha.callback(executor_job))).job_type
+        == ha.HassJobType.Callback
+    )
+    assert ha.HassJob(executor_job).job_type == ha.HassJobType.Executor
+
+
+async def test_async_add_job_runs_partial_callback(hass):
+    """Test async_add_job still accepts plain callables."""
+    calls = []
+
+    @ha.callback
+    def job(value):
+        calls.append(value)
+
+    hass.async_add_job(functools.partial(job, 1))
+    hass.async_run_job(job, 2)
+    await hass.async_block_till_done()
+    assert sorted(calls) == [1, 2]
 
 
 def test_stage_shutdown():
@@ -480,6 +533,60 @@ class TestEventBus(unittest.TestCase):
         assert len(coroutine_calls) == 1
 
 
+async def test_eventbus_filtered_listener(hass):
+    """Test a listener only runs for events accepted by its filter."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(event)
+
+    @ha.callback
+    def event_filter(event):
+        return event.data.get("wanted", False)
+
+    hass.bus.async_listen("test", listener, event_filter=event_filter)
+
+    hass.bus.async_fire("test", {"wanted": False})
+    hass.bus.async_fire("test", {"wanted": True})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data == {"wanted": True}
+
+
+async def test_eventbus_filter_must_be_callback(hass):
+    """Test an event filter that is not a callback is rejected."""
+
+    def event_filter(event):
+        return True
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen("test", lambda event: None, event_filter=event_filter)
+
+
+async def test_eventbus_filter_raising_skips_listener(hass, caplog):
+    """Test a filter raising an exception skips its listener."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(event)
+
+    @ha.callback
+    def event_filter(event):
+        raise ValueError("bad filter")
+
+    hass.bus.async_listen("test", listener, event_filter=event_filter)
+    hass.bus.async_listen("test", listener)
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert "Error in event filter" in caplog.text
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -596,6 +703,35 @@ class TestStateMachine(unittest.TestCase):
         states = sorted(state.entity_id for state in self.states.all())
         assert ["light.bowl", "switch.ac"] == states
 
+    def test_all_with_domain_filter(self):
+        """Test the domain filter of all and the entity id count."""
+        self.states.set("light.Kitchen", "off")
+
+        states = sorted(state.entity_id for state in self.states.all("light"))
+        assert ["light.bowl", "light.kitchen"] == states
+        states = sorted(
+            state.entity_id for state in self.states.all({"light", "switch"})
+        )
+        assert ["light.bowl", "light.kitchen", "switch.ac"] == states
+        assert self.states.all("sensor") == []
+
+        # Repeated domains are only listed once, grouped by domain
+        assert self.states.entity_ids(["switch", "Light", "switch"]) == [
+            "switch.ac",
+            "light.bowl",
+            "light.kitchen",
+        ]
+        assert len(self.states.all(["light", "light"])) == 2
+        assert self.states.async_entity_ids_count(("light", "LIGHT")) == 2
+
+        assert self.states.async_entity_ids_count() == 3
+        assert self.states.async_entity_ids_count("light") == 2
+        assert self.states.async_entity_ids_count(["switch", "sensor"]) == 1
+
+        self.states.remove("switch.ac")
+        assert self.states.entity_ids("switch") == []
+        assert self.states.async_entity_ids_count("switch") == 0
+
     def test_remove(self):
         """Test remove method."""
         events = []
@@ -1,6 +1,7 @@
 """Test to verify that we can load components."""
 import pytest
 
+from homeassistant import components
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
 import homeassistant.loader as loader
@@ -335,3 +336,100 @@ async def test_get_custom_components_safe_mode(hass):
     """Test that we get empty custom components in safe mode."""
     hass.config.safe_mode = True
     assert await loader.async_get_custom_components(hass) == {}
+
+
+async def test_preload_integrations(hass):
+    """Test integrations are imported dependencies first and timed."""
+    integrations = [
+        await loader.async_get_integration(hass, domain)
+        for domain in ("api", "http", "hue")
+    ]
+    for integration in integrations:
+        await integration.resolve_dependencies()
+
+    imported = []
+    original_preload = loader.Integration.preload
+
+    def mock_preload(integration, platform_names=()):
+        original_preload(integration, platform_names)
+        imported.append((integration.domain, list(platform_names)))
+
+    with patch.object(loader.Integration, "preload", mock_preload):
+        await loader.async_preload_integrations(hass, integrations, {"hue": {"light"}})
+
+    assert sorted(imported) == [("api", []), ("http", []), ("hue", ["light"])]
+    assert imported[-1] == ("api", [])
+    cache = hass.data[loader.DATA_COMPONENTS]
+    assert cache["http"] is http
+    assert cache["hue"] is hue
+    assert cache["hue.light"] is hue_light
+    assert set(loader.async_get_import_timings(hass)) == {"api", "http", "hue"}
+
+
+async def test_preload_integration_import_error(hass):
+    """Test an integration failing to import is left for setup to report."""
+    integration = await loader.async_get_integration(hass, "hue")
+
+    with patch("homeassistant.loader.importlib.import_module", side_effect=ImportError):
+        integration.preload(["light"])
+
+    assert "hue" not in hass.data.get(loader.DATA_COMPONENTS, {})
+    assert "hue" in loader.async_get_import_timings(hass)
+
+
+async def test_manifest_index(hass, hass_storage):
+    """Test manifests are indexed and reused while current."""
+    integration = await loader.async_get_integration(hass, "hue")
+    manifest_path = integration.file_path / "manifest.json"
+    manifest_index = await loader.async_get_manifest_index(hass)
+
+    cached = manifest_index.get(manifest_path, True)
+    assert cached == {
+        key: value
+        for key, value in integration.manifest.items()
+        if key != "is_built_in"
+    }
+
+    # pylint: disable=protected-access
+    manifest_index._manifests[str(manifest_path)]["manifest"]["name"] = "Indexed"
+    with patch("pathlib.Path.read_text") as mock_read:
+        resolved = loader.Integration.resolve_from_root(
+            hass, components, "hue", manifest_index
+        )
+    assert not mock_read.called
+    assert resolved.name == "Indexed"
+
+    # Built-in manifests are trusted on release versions
+    manifest_index._manifests[str(manifest_path)]["mtime"] -= 1
+    with patch.object(manifest_index, "_trust_built_in", True), patch(
+        "pathlib.Path.read_text"
+    ) as mock_read:
+        resolved = loader.Integration.resolve_from_root(
+            hass, components, "hue", manifest_index
+        )
+    assert not mock_read.called
+    assert resolved.name == "Indexed"
+
+    # and read again when changed on development versions
+    with patch.object(manifest_index, "_trust_built_in", False):
+        resolved = loader.Integration.resolve_from_root(
+            hass, components, "hue", manifest_index
+        )
+    assert resolved.name == integration.name
+
+
+async def test_manifest_index_version_change(hass, hass_storage):
+    """Test the stored index is dropped when the version changes."""
+    hass_storage[loader.MANIFEST_INDEX_STORAGE_KEY] = {
+        "version": loader.MANIFEST_INDEX_STORAGE_VERSION,
+        "key": loader.MANIFEST_INDEX_STORAGE_KEY,
+        "data": {
+            "ha_version": "0.1.0",
+            "manifests": {"/stale/manifest.json": {"mtime": 0, "manifest": {}}},
+        },
+    }
+
+    manifest_index = await loader.async_get_manifest_index(hass)
+
+    # pylint: disable=protected-access
+    assert manifest_index._manifests == {}
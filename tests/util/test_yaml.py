@@ -1,5 +1,7 @@
 """Test Home Assistant yaml loader."""
+from concurrent.futures import ThreadPoolExecutor
 import io
+import json
 import logging
 import os
 import unittest
@@ -461,3 +463,163 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert "contains duplicate key" in caplog.text
+
+
+def test_cache_reuses_unchanged_files(tmp_path):
+    """Test unchanged files are taken from the cache with their references."""
+    config_path = str(tmp_path / YAML_CONFIG_FILE)
+    (tmp_path / YAML_CONFIG_FILE).write_text(
+        "light: !include light.yaml\nsensor: !include_dir_merge_list sensors\n"
+        "date: 2020-01-01\n"
+    )
+    (tmp_path / "light.yaml").write_text("- platform: test\n  name: !secret name\n")
+    (tmp_path / yaml.SECRET_YAML).write_text("name: Kitchen\n")
+    (tmp_path / "sensors").mkdir()
+    (tmp_path / "sensors" / "one.yaml").write_text("- platform: one\n")
+
+    yaml.clear_secret_cache()
+    cache = yaml_loader.YamlCache()
+    with yaml_loader.use_cache(cache):
+        parsed = yaml.load_yaml(config_path)
+    assert cache.misses == 3
+    assert cache.dirty
+
+    yaml.clear_secret_cache()
+    cache = yaml_loader.YamlCache(cache.entries)
+    with patch.object(
+        yaml_loader, "_load_yaml", wraps=yaml_loader._load_yaml
+    ) as mock_load, yaml_loader.use_cache(cache):
+        cached = yaml.load_yaml(config_path)
+    # Only the secrets are loaded again
+    mock_load.assert_called_once_with(str(tmp_path / yaml.SECRET_YAML))
+    assert cache.hits == 1
+    assert not cache.dirty
+
+    assert cached == parsed
+    assert cached is not parsed
+    assert cached["light"].__config_file__ == config_path
+    assert cached["light"].__line__ == 0
+    assert cached["light"][0]["name"] == "Kitchen"
+    assert cached["light"][0].__config_file__ == str(tmp_path / "light.yaml")
+    assert cached["sensor"][0].__line__ == 0
+    assert cached["sensor"][0].__config_file__ == str(tmp_path / "sensors/one.yaml")
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda path: (path / "light.yaml").write_text("- platform: other\n"),
+        lambda path: (path / yaml.SECRET_YAML).write_text("name: Other\n"),
+        lambda path: (path / "sensors" / "two.yaml").write_text("- platform: two\n"),
+        lambda path: os.environ.__setitem__("YAML_CACHE_TEST", "changed"),
+    ],
+)
+def test_cache_invalidated_by_dependencies(tmp_path, change):
+    """Test a file is parsed again when anything it was built from changes."""
+    config_path = str(tmp_path / YAML_CONFIG_FILE)
+    (tmp_path / YAML_CONFIG_FILE).write_text(
+        "light: !include light.yaml\nsensor: !include_dir_merge_list sensors\n"
+        "name: !secret name\nvalue: !env_var YAML_CACHE_TEST default\n"
+    )
+    (tmp_path / "light.yaml").write_text("- platform: test\n  extra: value\n")
+    (tmp_path / yaml.SECRET_YAML).write_text("name: Kitchen\n")
+    (tmp_path / "sensors").mkdir()
+    (tmp_path / "sensors" / "one.yaml").write_text("- platform: one\n")
+
+    os.environ.pop("YAML_CACHE_TEST", None)
+    cache = yaml_loader.YamlCache()
+    with yaml_loader.use_cache(cache):
+        parsed = yaml.load_yaml(config_path)
+
+    change(tmp_path)
+    yaml.clear_secret_cache()
+    try:
+        with yaml_loader.use_cache(cache):
+            reloaded = yaml.load_yaml(config_path)
+        expected = yaml_loader._load_yaml(config_path)
+    finally:
+        os.environ.pop("YAML_CACHE_TEST", None)
+
+    assert reloaded != parsed
+    assert reloaded == expected
+
+
+def test_cache_does_not_store_secrets(tmp_path):
+    """Test secrets are resolved after loading and never stored in the cache."""
+    config_path = str(tmp_path / YAML_CONFIG_FILE)
+    (tmp_path / YAML_CONFIG_FILE).write_text(
+        "light: !include light.yaml\npassword: !secret password\n"
+    )
+    (tmp_path / "light.yaml").write_text("- platform: test\n  token: !secret token\n")
+    (tmp_path / yaml.SECRET_YAML).write_text("token: from secrets\n")
+
+    yaml.clear_secret_cache()
+    cache = yaml_loader.YamlCache()
+    with patch.object(yaml_loader, "keyring") as mock_keyring, yaml_loader.use_cache(
+        cache
+    ):
+        mock_keyring.get_password.return_value = "from keyring"
+        loaded = yaml.load_yaml(config_path)
+    assert loaded["password"] == "from keyring"
+    assert loaded["light"][0]["token"] == "from secrets"
+
+    assert list(cache.entries) == [str(tmp_path / "light.yaml"), config_path]
+    stored = json.dumps(cache.entries)
+    assert "from keyring" not in stored
+    assert "from secrets" not in stored
+
+    yaml.clear_secret_cache()
+    with patch.object(yaml_loader, "keyring") as mock_keyring, yaml_loader.use_cache(
+        cache
+    ):
+        mock_keyring.get_password.return_value = "changed"
+        loaded = yaml.load_yaml(config_path)
+    assert cache.hits == 1
+    assert loaded["password"] == "changed"
+    assert loaded["light"][0]["token"] == "from secrets"
+
+
+def test_cache_prunes_unused_files(tmp_path):
+    """Test entries of files that are no longer included are removed."""
+    config_path = str(tmp_path / YAML_CONFIG_FILE)
+    (tmp_path / YAML_CONFIG_FILE).write_text("light: !include light.yaml\n")
+    (tmp_path / "light.yaml").write_text("- platform: test\n")
+
+    cache = yaml_loader.YamlCache()
+    with yaml_loader.use_cache(cache) as loaded_files:
+        yaml.load_yaml(config_path)
+    cache.prune(loaded_files)
+    assert str(tmp_path / "light.yaml") in cache.entries
+
+    (tmp_path / YAML_CONFIG_FILE).write_text("light:\n")
+    with yaml_loader.use_cache(cache) as loaded_files:
+        yaml.load_yaml(config_path)
+    assert str(tmp_path / "light.yaml") in cache.entries
+    cache.prune(loaded_files)
+    assert list(cache.entries) == [config_path]
+
+
+def test_cache_shared_between_threads(tmp_path):
+    """Test a cache can be used by several threads at the same time."""
+    config_paths = []
+    for index in range(10):
+        config_path = tmp_path / f"config{index}.yaml"
+        config_path.write_text(f"light: !include light{index}.yaml\n")
+        (tmp_path / f"light{index}.yaml").write_text(f"- platform: test{index}\n")
+        config_paths.append(str(config_path))
+
+    cache = yaml_loader.YamlCache()
+
+    def load(config_path):
+        with yaml_loader.use_cache(cache):
+            return yaml.load_yaml(config_path)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        loaded = list(executor.map(load, config_paths))
+
+    assert [conf["light"][0]["platform"] for conf in loaded] == [
+        f"test{index}" for index in range(10)
+    ]
+    assert cache.pop_stats() == (0, 20, True)
+    assert cache.pop_stats() == (0, 0, False)
+    assert len(cache.entries) == 20